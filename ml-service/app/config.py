@@ -0,0 +1,136 @@
+"""
+Service configuration.
+Every setting is read from the environment (or a .env file) once at import.
+"""
+
+import os
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# ── Inference executors ───────────────────────────────────────────────────────
+# Model inference (predict / anomaly / hotspots) and Prophet fits run on
+# separate bounded thread pools so a slow fit never starves scoring, and
+# neither blocks the event loop.
+INFERENCE_WORKERS = _int("INFERENCE_WORKERS", 4)
+INFERENCE_QUEUE_LIMIT = _int("INFERENCE_QUEUE_LIMIT", 64)
+FORECAST_WORKERS = _int("FORECAST_WORKERS", 2)
+FORECAST_QUEUE_LIMIT = _int("FORECAST_QUEUE_LIMIT", 16)
+EXECUTOR_RETRY_AFTER_S = _int("EXECUTOR_RETRY_AFTER_S", 1)
+
+# ── Forecast model store ──────────────────────────────────────────────────────
+# Fitted Prophet models per ward, LRU-bounded and expired after a TTL. Each
+# entry keeps the responses for its FORECAST_CACHE_MAX_HORIZONS most recently
+# requested horizons.
+FORECAST_CACHE_MAX_WARDS = _int("FORECAST_CACHE_MAX_WARDS", 1000)
+FORECAST_CACHE_TTL_S = _int("FORECAST_CACHE_TTL_S", 3600)
+FORECAST_CACHE_MAX_HORIZONS = _int("FORECAST_CACHE_MAX_HORIZONS", 8)
+
+# ── Admission history store ───────────────────────────────────────────────────
+# Hourly admission counts per ward for forecasting. HISTORY_DIR persists them
+# as append-only, memory-mapped float32 files; leave empty to keep them in
+# memory only.
+HISTORY_DIR = os.getenv("HISTORY_DIR", "")
+HISTORY_RETENTION_HOURS = _int("HISTORY_RETENTION_HOURS", 90 * 24)
+HISTORY_MIN_HOURS = _int("HISTORY_MIN_HOURS", 48)
+
+# ── Multi-ward forecasting ────────────────────────────────────────────────────
+# Prophet fits for /forecast/batch run on a process pool; wards with fewer
+# observations than FORECAST_SEASONAL_MAX_HOURS use the vectorized seasonal
+# model instead.
+FORECAST_PROCESSES = _int("FORECAST_PROCESSES", os.cpu_count() or 1)
+FORECAST_SEASONAL_MAX_HOURS = _int("FORECAST_SEASONAL_MAX_HOURS", 14 * 24)
+
+# ── Synthetic forecast fallback ───────────────────────────────────────────────
+# Deterministic mode seeds the synthetic forecast by ward and hour, so repeat
+# calls within the hour return (and cache) the same forecast.
+FORECAST_SYNTHETIC_DETERMINISTIC = _bool("FORECAST_SYNTHETIC_DETERMINISTIC", False)
+FORECAST_MAX_HORIZON = _int("FORECAST_MAX_HORIZON", 30 * 24)
+
+# ── Model inference backend ───────────────────────────────────────────────────
+# "sklearn" runs the unpickled estimators as-is; "compiled" swaps in raw XGBoost
+# Boosters and a numba IsolationForest evaluator, verified at load time.
+# Applies to the pickles only: artifact bundles (MODEL_FORMAT) always load as
+# compiled models, checked against the outputs recorded when they were saved.
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "sklearn").strip().lower()
+
+# ── /predict micro-batching ───────────────────────────────────────────────────
+# Concurrent single-ward /predict calls are collected for up to
+# PREDICT_BATCH_MAX_WAIT_MS (or PREDICT_BATCH_MAX_SIZE items) and scored in one
+# vectorized pass. Set the wait to 0 to score every request on its own.
+PREDICT_BATCH_MAX_SIZE = _int("PREDICT_BATCH_MAX_SIZE", 64)
+PREDICT_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", 2))
+
+# ── Prediction cache ──────────────────────────────────────────────────────────
+# Model outputs per feature vector, keyed by the vector and the model version.
+# Each entry is ~0.5 KB; set PREDICT_CACHE_MAX_ENTRIES to 0 to disable.
+PREDICT_CACHE_MAX_ENTRIES = _int("PREDICT_CACHE_MAX_ENTRIES", 10000)
+PREDICT_CACHE_TTL_S = _int("PREDICT_CACHE_TTL_S", 3600)
+
+# ── Startup ───────────────────────────────────────────────────────────────────
+# Load models and warm the inference path in a background thread at startup;
+# /health/ready returns 503 until it finishes. When disabled, models load on
+# the first request and readiness is reported immediately.
+WARMUP_ON_STARTUP = _bool("WARMUP_ON_STARTUP", True)
+
+# ── Model artifacts ───────────────────────────────────────────────────────────
+# "auto" serves the CURRENT artifact bundle (memory-mapped, compiled backend)
+# when one exists and the joblib pickles otherwise; "bundle" / "pickle" force
+# one format (a missing bundle still falls back to the pickles).
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "auto").strip().lower()
+MODEL_VERIFY_CHECKSUMS = _bool("MODEL_VERIFY_CHECKSUMS", True)
+
+# ── Model registry ────────────────────────────────────────────────────────────
+# The saved directory is polled every MODEL_WATCH_INTERVAL_S seconds (0 turns
+# the watcher off) and new artifacts are loaded in the background. A failed or
+# missing load is retried after an exponential backoff.
+MODEL_WATCH_INTERVAL_S = _int("MODEL_WATCH_INTERVAL_S", 10)
+MODEL_RETRY_BASE_S = _int("MODEL_RETRY_BASE_S", 5)
+MODEL_RETRY_MAX_S = _int("MODEL_RETRY_MAX_S", 300)
+
+# ── Explanations ──────────────────────────────────────────────────────────────
+# "xgboost" computes SHAP values with the booster's pred_contribs (no shap
+# import); "shap" uses shap.TreeExplainer.
+EXPLAINER_BACKEND = os.getenv("EXPLAINER_BACKEND", "xgboost").strip().lower()
+
+# ── Streaming anomaly detection ───────────────────────────────────────────────
+# Per-ward exponentially weighted baselines for POST /anomaly/stream: ALPHA is
+# the weight of each new observation, THRESHOLD the robust z-score that flags
+# an anomaly, WARMUP the observations a ward needs before it is scored.
+# At most MAX_WARDS baselines are kept (~0.4 KB each); beyond that the least
+# recently observed ward is evicted.
+ANOMALY_STREAM_ALPHA = float(os.getenv("ANOMALY_STREAM_ALPHA", 0.05))
+ANOMALY_STREAM_THRESHOLD = float(os.getenv("ANOMALY_STREAM_THRESHOLD", 4.0))
+ANOMALY_STREAM_WARMUP = _int("ANOMALY_STREAM_WARMUP", 24)
+ANOMALY_STREAM_MAX_WARDS = _int("ANOMALY_STREAM_MAX_WARDS", 10000)
+
+# ── Request profiling ─────────────────────────────────────────────────────────
+# Off by default; when off nothing is installed. When on, requests with an
+# X-Kavach-Profile header (whose value must equal PROFILE_HEADER_TOKEN, if
+# set) and a PROFILE_SAMPLE_RATE fraction of all requests are profiled. The
+# newest PROFILE_MAX_FILES profiles are kept in PROFILE_DIR. The
+# /admin/profiles routes are mounted only when PROFILE_HEADER_TOKEN is set and
+# require it as a bearer token.
+PROFILING_ENABLED = _bool("PROFILING_ENABLED", False)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_HEADER_TOKEN = os.getenv("PROFILE_HEADER_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/kavach-profiles")
+PROFILE_MAX_FILES = _int("PROFILE_MAX_FILES", 50)
+
+# ── Rule-based risk score ─────────────────────────────────────────────────────
+# Weights and caps of the rule-based risk score that labels the training data
+# and scores wards while no models are loaded. Empty uses the defaults in
+# app/features/risk_weights.json; models must be retrained after a change.
+RISK_WEIGHTS_PATH = os.getenv("RISK_WEIGHTS_PATH", "")
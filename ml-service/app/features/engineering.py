@@ -5,7 +5,8 @@ model-ready numpy arrays.
 """
 
 import numpy as np
-from typing import Dict, Any
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Sequence, Tuple
 
 
 # Ordered feature names — must match training order
@@ -66,6 +67,27 @@ SYNDROME_KEYS = [
     "RESPIRATORY_DISTRESS", "SKIN_RASH", "JAUNDICE",
 ]
 
+# (feature, default) for the columns before the syndrome proportions, in
+# FEATURE_NAMES order — the defaults match FeatureVector's. Both
+# features_to_array and features_matrix read their columns from here
+SCALAR_FEATURES = [
+    ("totalAdmissions7d", 0),
+    ("totalAdmissions48h", 0),
+    ("dailyAvg7d", 0),
+    ("syndromeSpike48h", 0),
+    ("chlorineDropRatio", 0),
+    ("currentChlorine", 0.5),
+    ("currentTurbidity", 2.0),
+    ("phDeviation", 0),
+    ("lagRainfall1d", 0),
+    ("avgRainfall7d", 0),
+    ("rainfallSpike", False),
+    ("avgTemp7d", 28),
+    ("avgHumidity7d", 70),
+    ("citizenClusterCount", 0),
+    ("citizenSeverityScore", 1),
+]
+
 SYNDROME_TO_CATEGORY = {
     "DIARRHEA":             "WATERBORNE",
     "VOMITING":             "FOODBORNE",
@@ -84,28 +106,67 @@ def features_to_array(features: Dict[str, Any]) -> np.ndarray:
     syndrome_breakdown = features.get("syndromeBreakdown", {})
     total_syndrome = sum(syndrome_breakdown.values()) or 1
 
-    row = [
-        features.get("totalAdmissions7d", 0),
-        features.get("totalAdmissions48h", 0),
-        features.get("dailyAvg7d", 0),
-        features.get("syndromeSpike48h", 0),
-        features.get("chlorineDropRatio", 0),
-        features.get("currentChlorine", 0.5),
-        features.get("currentTurbidity", 2.0),
-        features.get("phDeviation", 0),
-        features.get("lagRainfall1d", 0),
-        features.get("avgRainfall7d", 0),
-        float(features.get("rainfallSpike", False)),
-        features.get("avgTemp7d", 28),
-        features.get("avgHumidity7d", 70),
-        features.get("citizenClusterCount", 0),
-        features.get("citizenSeverityScore", 1),
-        # Syndrome proportions (one-hot-ish)
-        *[syndrome_breakdown.get(s, 0) / total_syndrome for s in SYNDROME_KEYS],
-    ]
+    row = [features.get(name, default) for name, default in SCALAR_FEATURES]
+    # Syndrome proportions (one-hot-ish)
+    row += [syndrome_breakdown.get(s, 0) / total_syndrome for s in SYNDROME_KEYS]
     return np.array(row, dtype=np.float32).reshape(1, -1)
 
 
+def features_matrix(records: Sequence[Any], dtype=np.float32) -> np.ndarray:
+    """
+    Batch version of features_to_array: an (N, 22) float32 matrix for a
+    sequence of records, either all feature dicts or all FeatureVector models
+    (read by attribute, so no model_dump). Row i equals
+    features_to_array(records[i])[0] exactly.
+
+    The scalar columns are filled one feature at a time from SCALAR_FEATURES
+    into a preallocated float64 matrix (the same float64 pass-through as
+    np.array(row, float32)), and the syndrome counts are normalized in one
+    vectorized division. With dtype=np.float64 that matrix is returned as-is,
+    holding the records' values exactly (used by the rule-based fallback).
+    """
+    n = len(records)
+    if n == 0:
+        return np.empty((0, len(FEATURE_NAMES)), dtype=dtype)
+
+    M = np.empty((n, len(FEATURE_NAMES)), dtype=np.float64)
+    scalar = len(SCALAR_FEATURES)
+    columns_matrix(records, SCALAR_FEATURES, out=M[:, :scalar])
+
+    if isinstance(records[0], Mapping):
+        breakdowns = [r.get("syndromeBreakdown", {}) for r in records]
+    else:
+        breakdowns = [getattr(r, "syndromeBreakdown", {}) for r in records]
+    for j, key in enumerate(SYNDROME_KEYS, start=scalar):
+        M[:, j] = [b.get(key, 0) for b in breakdowns]
+
+    # Totals use Python's sum, so rounding matches the per-row path
+    totals = np.array([sum(b.values()) or 1 for b in breakdowns], dtype=np.float64)
+    M[:, scalar:] /= totals[:, None]
+    return M.astype(dtype, copy=False)
+
+
+def columns_matrix(
+    records: Sequence[Any], columns: Sequence[Tuple[str, Any]], out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    (N, len(columns)) float64 matrix of the (feature, default) `columns` for
+    feature dicts or FeatureVector models, filled one column at a time.
+    Written into `out` when given.
+    """
+    if out is None:
+        out = np.empty((len(records), len(columns)), dtype=np.float64)
+    if not len(records):
+        return out
+    if isinstance(records[0], Mapping):
+        for j, (name, default) in enumerate(columns):
+            out[:, j] = [r.get(name, default) for r in records]
+    else:
+        for j, (name, default) in enumerate(columns):
+            out[:, j] = [getattr(r, name, default) for r in records]
+    return out
+
+
 def get_dominant_syndrome(syndrome_breakdown: Dict[str, float]) -> str:
     """Returns the syndrome type with the highest count."""
     if not syndrome_breakdown:
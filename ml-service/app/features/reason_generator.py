@@ -3,100 +3,288 @@ Outbreak Reason Generator
 
 Converts raw feature values into human-readable AI insight strings.
 These power the "AI Insight Box" on the frontend dashboard.
+
+The rules live in one table of plain data, REASON_RULES. For a batch of
+records every rule is evaluated at once as a boolean mask over an
+(N, inputs) matrix, and a reason's text is only rendered for the rows where
+its rule fires. generate_outbreak_reasons is the one-record wrapper.
+tests/test_reason_generator.py checks the table against a frozen copy of the
+hand-written if/elif chain it replaced.
 """
 
-from typing import Dict, Any, List
+from collections.abc import Mapping
+from operator import attrgetter, itemgetter
+from string import Formatter
+from typing import Dict, Any, Callable, List, Optional, Sequence
 
+import numpy as np
 
-def generate_outbreak_reasons(features: Dict[str, Any]) -> List[str]:
-    """
-    Rule-based reason generator.
-    Returns a list of human-readable strings explaining why a ward is high risk.
-    """
-    reasons = []
+from app.features.engineering import columns_matrix
 
+
+# ── Rule table ────────────────────────────────────────────────────────────────
+# Inputs the rules read: (feature, default when the record lacks it). These
+# are the reason generator's own defaults, not FeatureVector's.
+REASON_INPUTS = [
+    ("chlorineDropRatio", 0),
+    ("currentTurbidity", 0),
+    ("currentPh", 7.0),
+    ("syndromeSpike48h", 0),
+    ("totalAdmissions48h", 0),
+    ("lagRainfall1d", 0),
+    ("p90Rainfall", 20),
+    ("avgHumidity7d", 0),
+    ("avgTemp7d", 0),
+    ("citizenClusterCount", 0),
+    ("citizenSeverityScore", 1),
+    ("syndromeBreakdown", {}),      # only read through hasDominant and dominantLabel
+]
+
+# Template fields computed from a record's inputs, only for the reasons that use them
+DERIVED_FIELDS: Dict[str, Callable[[dict], Any]] = {
+    "chlorineDropPct": lambda f: round(f["chlorineDropRatio"] * 100),
+    "dominantLabel":   lambda f: _dominant(f["syndromeBreakdown"]).replace("_", " ").title(),
+    "admissions48h":   lambda f: int(f["totalAdmissions48h"]),
+    "rainfallRatio":   lambda f: f["lagRainfall1d"] / max(f["p90Rainfall"], 1),
+}
+
+# (group, conditions, template), in output order. A rule fires when all of
+# its (feature, op, threshold) conditions hold; within a group only the first
+# rule that fires applies (if/elif). A threshold is a number or
+# (feature, factor) for another input scaled by factor. Besides the inputs,
+# conditions can read hasDominant (1 when the syndrome breakdown has a
+# dominant syndrome). Template fields are inputs or DERIVED_FIELDS.
+REASON_RULES = [
     # ── Water Quality Signals ─────────────────────────────────────────────────
-    chlorine_drop = features.get("chlorineDropRatio", 0)
-    if chlorine_drop >= 0.5:
-        reasons.append(f"🔵 Chlorine dropped {round(chlorine_drop * 100)}% vs 7-day average (critical)")
-    elif chlorine_drop >= 0.3:
-        reasons.append(f"🔵 Chlorine dropped {round(chlorine_drop * 100)}% vs 7-day average")
-
-    turbidity = features.get("currentTurbidity", 0)
-    if turbidity > 10:
-        reasons.append(f"⚠️ Turbidity critically high ({turbidity:.1f} NTU — safe limit: 5)")
-    elif turbidity > 5:
-        reasons.append(f"⚠️ Turbidity above safe threshold ({turbidity:.1f} NTU)")
-
-    ph = features.get("currentPh", 7.0)
-    if ph < 6.0 or ph > 9.0:
-        reasons.append(f"🧪 pH level unsafe ({ph:.1f} — safe range: 6.5–8.5)")
-    elif ph < 6.5 or ph > 8.5:
-        reasons.append(f"🧪 pH level borderline ({ph:.1f})")
+    ("chlorine", [("chlorineDropRatio", ">=", 0.5)],
+     "🔵 Chlorine dropped {chlorineDropPct}% vs 7-day average (critical)"),
+    ("chlorine", [("chlorineDropRatio", ">=", 0.3)],
+     "🔵 Chlorine dropped {chlorineDropPct}% vs 7-day average"),
 
-    # ── Syndrome / Admission Signals ──────────────────────────────────────────
-    spike = features.get("syndromeSpike48h", 0)
-    syndrome_breakdown = features.get("syndromeBreakdown", {})
-    dominant = max(syndrome_breakdown, key=syndrome_breakdown.get) if syndrome_breakdown else None
+    ("turbidity", [("currentTurbidity", ">", 10)],
+     "⚠️ Turbidity critically high ({currentTurbidity:.1f} NTU — safe limit: 5)"),
+    ("turbidity", [("currentTurbidity", ">", 5)],
+     "⚠️ Turbidity above safe threshold ({currentTurbidity:.1f} NTU)"),
+
+    ("ph", [("currentPh", "<", 6.0)],
+     "🧪 pH level unsafe ({currentPh:.1f} — safe range: 6.5–8.5)"),
+    ("ph", [("currentPh", ">", 9.0)],
+     "🧪 pH level unsafe ({currentPh:.1f} — safe range: 6.5–8.5)"),
+    ("ph", [("currentPh", "<", 6.5)],
+     "🧪 pH level borderline ({currentPh:.1f})"),
+    ("ph", [("currentPh", ">", 8.5)],
+     "🧪 pH level borderline ({currentPh:.1f})"),
 
-    if spike >= 3.0 and dominant:
-        reasons.append(f"🔴 {dominant.replace('_', ' ').title()} cases ↑ {spike:.1f}× in last 48h (severe spike)")
-    elif spike >= 2.0 and dominant:
-        reasons.append(f"🔴 {dominant.replace('_', ' ').title()} cases ↑ {spike:.1f}× vs baseline")
-    elif spike >= 1.5 and dominant:
-        reasons.append(f"🟠 {dominant.replace('_', ' ').title()} cases elevated ({spike:.1f}× baseline)")
+    # ── Syndrome / Admission Signals ──────────────────────────────────────────
+    ("syndrome", [("syndromeSpike48h", ">=", 3.0), ("hasDominant", "==", 1)],
+     "🔴 {dominantLabel} cases ↑ {syndromeSpike48h:.1f}× in last 48h (severe spike)"),
+    ("syndrome", [("syndromeSpike48h", ">=", 2.0), ("hasDominant", "==", 1)],
+     "🔴 {dominantLabel} cases ↑ {syndromeSpike48h:.1f}× vs baseline"),
+    ("syndrome", [("syndromeSpike48h", ">=", 1.5), ("hasDominant", "==", 1)],
+     "🟠 {dominantLabel} cases elevated ({syndromeSpike48h:.1f}× baseline)"),
 
-    admissions_48h = features.get("totalAdmissions48h", 0)
-    if admissions_48h > 50:
-        reasons.append(f"🏥 {int(admissions_48h)} hospital admissions in last 48h")
+    ("admissions", [("totalAdmissions48h", ">", 50)],
+     "🏥 {admissions48h} hospital admissions in last 48h"),
 
     # ── Weather / Environmental Signals ──────────────────────────────────────
-    lag_rainfall = features.get("lagRainfall1d", 0)
-    p90 = features.get("p90Rainfall", 20)
-    if lag_rainfall > p90 * 1.5:
-        reasons.append(f"🌧️ Extreme rainfall yesterday ({lag_rainfall:.0f}mm — {lag_rainfall/max(p90,1):.1f}× 90th percentile)")
-    elif lag_rainfall > p90:
-        reasons.append(f"🌧️ Rainfall spike yesterday ({lag_rainfall:.0f}mm above 90th percentile)")
-
-    humidity = features.get("avgHumidity7d", 0)
-    temp = features.get("avgTemp7d", 0)
-    if humidity > 85 and temp > 30:
-        reasons.append(f"🌡️ High heat-humidity index (temp {temp:.0f}°C, humidity {humidity:.0f}%) — vector breeding conditions")
+    ("rainfall", [("lagRainfall1d", ">", ("p90Rainfall", 1.5))],
+     "🌧️ Extreme rainfall yesterday ({lagRainfall1d:.0f}mm — {rainfallRatio:.1f}× 90th percentile)"),
+    ("rainfall", [("lagRainfall1d", ">", ("p90Rainfall", 1))],
+     "🌧️ Rainfall spike yesterday ({lagRainfall1d:.0f}mm above 90th percentile)"),
+
+    ("heat", [("avgHumidity7d", ">", 85), ("avgTemp7d", ">", 30)],
+     "🌡️ High heat-humidity index (temp {avgTemp7d:.0f}°C, humidity {avgHumidity7d:.0f}%) — vector breeding conditions"),
 
     # ── Citizen Report Signals ────────────────────────────────────────────────
-    cluster_count = features.get("citizenClusterCount", 0)
-    severity_score = features.get("citizenSeverityScore", 1)
+    ("cluster", [("citizenClusterCount", ">=", 20)],
+     "📍 {citizenClusterCount} citizen complaints clustered in last 24h (high density)"),
+    ("cluster", [("citizenClusterCount", ">=", 10)],
+     "📍 {citizenClusterCount} citizen complaints in last 24h"),
+    ("cluster", [("citizenClusterCount", ">=", 5)],
+     "📍 {citizenClusterCount} citizen reports in last 24h"),
+
+    ("severity", [("citizenSeverityScore", ">=", 4.0)],
+     "🚨 Citizen-reported severity critical (avg {citizenSeverityScore:.1f}/5)"),
+    ("severity", [("citizenSeverityScore", ">=", 3.0)],
+     "🟠 Citizen-reported severity high (avg {citizenSeverityScore:.1f}/5)"),
+]
+
+FALLBACK_REASON = "ℹ️ Elevated risk based on combined environmental and epidemiological signals"
+
+
+# ── Compiled table ────────────────────────────────────────────────────────────
+
+_OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal, "==": np.equal}
+
+_NAMES = [name for name, _ in REASON_INPUTS]
+_BREAKDOWN = _NAMES.index("syndromeBreakdown")
+_NUMERIC = [(name, default) for name, default in REASON_INPUTS if name != "syndromeBreakdown"]
+# Matrix columns: the numeric inputs, then hasDominant
+_COLUMNS = [name for name, _ in _NUMERIC] + ["hasDominant"]
+_read_dict = itemgetter(*_NAMES)
+_read_model = attrgetter(*_NAMES)
+
+
+def _read(record: Any) -> tuple:
+    """A feature dict or FeatureVector's inputs, in REASON_INPUTS order (defaults for missing ones)."""
+    try:
+        return _read_dict(record) if type(record) is dict else _read_model(record)
+    except (KeyError, AttributeError):
+        pass
+    if isinstance(record, Mapping):
+        return tuple(record.get(name, default) for name, default in REASON_INPUTS)
+    return tuple(getattr(record, name, default) for name, default in REASON_INPUTS)
+
+
+def _dominant(breakdown: Dict[str, float]) -> Optional[str]:
+    return max(breakdown, key=breakdown.get) if breakdown else None
+
 
-    if cluster_count >= 20:
-        reasons.append(f"📍 {cluster_count} citizen complaints clustered in last 24h (high density)")
-    elif cluster_count >= 10:
-        reasons.append(f"📍 {cluster_count} citizen complaints in last 24h")
-    elif cluster_count >= 5:
-        reasons.append(f"📍 {cluster_count} citizen reports in last 24h")
+def _has_dominant(breakdown: Dict[str, float]) -> bool:
+    """bool(dominant syndrome); the max is only needed when some key is falsy."""
+    return bool(breakdown) and (all(breakdown) or bool(_dominant(breakdown)))
 
-    if severity_score >= 4.0:
-        reasons.append(f"🚨 Citizen-reported severity critical (avg {severity_score:.1f}/5)")
-    elif severity_score >= 3.0:
-        reasons.append(f"🟠 Citizen-reported severity high (avg {severity_score:.1f}/5)")
 
-    # ── Fallback ──────────────────────────────────────────────────────────────
-    if not reasons:
-        reasons.append("ℹ️ Elevated risk based on combined environmental and epidemiological signals")
+class _CompiledRules:
+    """
+    REASON_RULES as flat arrays, so a batch is scored with a fixed number of
+    NumPy calls however many rules there are: every condition is one column
+    of a clause matrix (grouped by operator), each rule ANDs its clauses, and
+    an exclusive running count within each group keeps only the first rule
+    that fires (if/elif).
+    """
+
+    def __init__(self, rules: list):
+        clauses = []        # (column, op, threshold, threshold column or -1)
+        self.rule_clauses: List[List[int]] = []
+        group_start, self.group_first = {}, []
+        self.templates, self.derived = [], []
+        for k, (group, conditions, template) in enumerate(rules):
+            if not conditions:
+                raise ValueError(f"REASON_RULES[{k}] has no conditions")
+            if group in group_start and self.group_first[-1] != group_start[group]:
+                raise ValueError(f"REASON_RULES[{k}]: rules of group {group!r} must be contiguous")
+            group_start.setdefault(group, k)
+            self.group_first.append(group_start[group])
+
+            ids = []
+            for feature, op, threshold in conditions:
+                if feature not in _COLUMNS or op not in _OPS:
+                    raise ValueError(f"REASON_RULES[{k}]: bad condition {(feature, op, threshold)!r}")
+                if isinstance(threshold, tuple):
+                    column, factor = threshold
+                    if column not in _COLUMNS:
+                        raise ValueError(f"REASON_RULES[{k}]: unknown threshold feature {column!r}")
+                    clauses.append((_COLUMNS.index(feature), op, float(factor), _COLUMNS.index(column)))
+                else:
+                    clauses.append((_COLUMNS.index(feature), op, float(threshold), -1))
+                ids.append(len(clauses) - 1)
+            self.rule_clauses.append(ids)
+
+            fields = [name for _, name, _, _ in Formatter().parse(template) if name is not None]
+            unknown = [name for name in fields if name not in DERIVED_FIELDS and name not in _NAMES]
+            if unknown:
+                raise ValueError(f"REASON_RULES[{k}]: unknown template field(s) {unknown}")
+            self.templates.append(template)
+            self.derived.append([(name, DERIVED_FIELDS[name]) for name in fields if name in DERIVED_FIELDS])
+
+        self.column = np.array([c[0] for c in clauses], dtype=np.intp)
+        self.threshold = np.array([c[2] for c in clauses])
+        self.threshold_column = np.array([c[3] for c in clauses], dtype=np.intp)
+        self.by_op = {
+            op: np.array([i for i, c in enumerate(clauses) if c[1] == op], dtype=np.intp)
+            for op in _OPS if any(c[1] == op for c in clauses)
+        }
+        # Rules padded to the same clause count with their own first clause
+        width = max(len(ids) for ids in self.rule_clauses)
+        self.padded = np.array([ids + ids[:1] * (width - len(ids)) for ids in self.rule_clauses], dtype=np.intp)
+        self.group_first = np.array(self.group_first, dtype=np.intp)
+
+    def fire(self, M: np.ndarray) -> np.ndarray:
+        """(N, rules) bool: which rules apply to each row of the input matrix."""
+        scaled = self.threshold_column >= 0
+        thresholds = np.broadcast_to(self.threshold, (len(M), len(self.threshold))).copy()
+        thresholds[:, scaled] = M[:, self.threshold_column[scaled]] * self.threshold[scaled]
+
+        clause = np.empty((len(M), len(self.column)), dtype=bool)
+        for op, ids in self.by_op.items():
+            clause[:, ids] = _OPS[op](M[:, self.column[ids]], thresholds[:, ids])
+        hit = clause[:, self.padded].all(axis=2)
+
+        # Rules that fired earlier in the same group
+        counts = np.cumsum(hit, axis=1)
+        before = counts - hit - np.where(self.group_first > 0, counts[:, self.group_first - 1], 0)
+        return hit & (before == 0)
+
+    def render(self, k: int, inputs: dict) -> str:
+        derived = self.derived[k]
+        if not derived:
+            return self.templates[k].format_map(inputs)
+        return self.templates[k].format_map({**inputs, **{name: fn(inputs) for name, fn in derived}})
+
+
+_rules = _CompiledRules(REASON_RULES)
 
+
+# ── Reason generation ─────────────────────────────────────────────────────────
+
+def outbreak_reasons_batch(records: Sequence[Any]) -> List[List[str]]:
+    """
+    Rule-based reasons for many wards: one list of human-readable strings per
+    record, explaining why it is high risk. Records are all feature dicts or
+    all FeatureVector models (read by attribute, so no model_dump).
+    """
+    n = len(records)
+    if n == 0:
+        return []
+    M = np.empty((n, len(_COLUMNS)), dtype=np.float64)
+    columns_matrix(records, _NUMERIC, out=M[:, :-1])
+    if isinstance(records[0], Mapping):
+        M[:, -1] = [_has_dominant(r.get("syndromeBreakdown", {})) for r in records]
+    else:
+        M[:, -1] = [_has_dominant(getattr(r, "syndromeBreakdown", {})) for r in records]
+
+    reasons: List[List[str]] = [[] for _ in range(n)]
+    inputs: Dict[int, dict] = {}
+    # nonzero walks row by row, rules in table order
+    rows, rules = np.nonzero(_rules.fire(M))
+    for i, k in zip(rows.tolist(), rules.tolist()):
+        if i not in inputs:
+            inputs[i] = dict(zip(_NAMES, _read(records[i])))
+        reasons[i].append(_rules.render(k, inputs[i]))
+    for r in reasons:
+        if not r:
+            r.append(FALLBACK_REASON)
     return reasons
 
 
-def shap_to_reasons(shap_values: list, feature_names: list, feature_labels: dict) -> List[str]:
+def generate_outbreak_reasons(features: Any) -> List[str]:
+    """
+    Rule-based reason generator.
+    Returns a list of human-readable strings explaining why a ward is high risk.
+    `features` is a feature dict or a FeatureVector.
+    """
+    return outbreak_reasons_batch([features])[0]
+
+
+def shap_to_reasons(
+    shap_values: list, feature_names: list, feature_labels: dict, top: Optional[list] = None
+) -> List[str]:
     """
     Converts SHAP values into human-readable impact strings.
-    Returns top 3 most impactful features.
+    Returns top 3 most impactful features. `top` is an already-ranked list of
+    feature indices (see inference.top_k_indices); without it the values are
+    sorted here.
     """
-    if not shap_values or not feature_names:
+    if not len(shap_values) or not feature_names:
         return []
 
-    paired = list(zip(feature_names, shap_values))
-    # Sort by absolute SHAP impact descending
-    paired.sort(key=lambda x: abs(x[1]), reverse=True)
+    if top is not None:
+        paired = [(feature_names[i], shap_values[i]) for i in top[:3]]
+    else:
+        paired = list(zip(feature_names, shap_values))
+        # Sort by absolute SHAP impact descending
+        paired.sort(key=lambda x: abs(x[1]), reverse=True)
 
     reasons = []
     for feature, impact in paired[:3]:
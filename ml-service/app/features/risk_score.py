@@ -0,0 +1,71 @@
+"""
+Rule-based risk score, shared by training and the no-model fallback.
+
+    score = Σ weight · min(feature / cap, 1)      (no cap: weight · feature)
+
+The terms are read once from risk_weights.json next to this file, or from
+RISK_WEIGHTS_PATH. train.py labels its synthetic wards with this score and
+services/fallback.py serves it while no models are loaded, so changing a
+term means retraining.
+"""
+
+import json
+import os
+from typing import Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app import config
+from app.features.engineering import FEATURE_NAMES
+
+DEFAULT_WEIGHTS_PATH = os.path.join(os.path.dirname(__file__), "risk_weights.json")
+
+
+def load_weights(path: str) -> dict:
+    """Parse and check a weights file; every term must name a model feature."""
+    with open(path) as f:
+        spec = json.load(f)
+    terms = []
+    for term in spec["terms"]:
+        if term["feature"] not in FEATURE_NAMES:
+            raise ValueError(f"{path}: unknown feature {term['feature']!r} in risk terms")
+        cap = term.get("cap")
+        if cap is not None and cap <= 0:
+            raise ValueError(f"{path}: cap of {term['feature']} must be positive")
+        terms.append((term["feature"], term["weight"], cap))
+    return {
+        "terms": terms,
+        "anomalyThreshold": spec["anomalyThreshold"],
+        "fallbackConfidence": spec["fallbackConfidence"],
+    }
+
+
+_weights = load_weights(config.RISK_WEIGHTS_PATH or DEFAULT_WEIGHTS_PATH)
+
+# (feature, weight, cap or None), summed in this order
+RISK_TERMS: List[Tuple[str, float, Optional[float]]] = _weights["terms"]
+ANOMALY_THRESHOLD: float = _weights["anomalyThreshold"]
+FALLBACK_CONFIDENCE: float = _weights["fallbackConfidence"]
+
+_INDEX = {name: FEATURE_NAMES.index(name) for name, _, _ in RISK_TERMS}
+
+
+def weighted_risk(columns: Mapping[str, Any]) -> Any:
+    """
+    The raw weighted sum (not clipped) for feature → value, where values are
+    Python scalars or equal-length arrays. Evaluated in float64 in RISK_TERMS
+    order, so it is bit-identical to the hand-written formula it replaced.
+    """
+    total = None
+    for name, weight, cap in RISK_TERMS:
+        x = columns[name]
+        if cap is not None:
+            x = np.minimum(x / cap, 1) if isinstance(x, np.ndarray) else min(x / cap, 1)
+        term = x * weight
+        total = term if total is None else total + term
+    return total
+
+
+def weighted_risk_matrix(X: np.ndarray) -> np.ndarray:
+    """weighted_risk over the rows of an (N, 22) matrix in FEATURE_NAMES order."""
+    return weighted_risk({name: X[:, i] for name, i in _INDEX.items()})
@@ -0,0 +1,184 @@
+"""
+Versioned model artifact bundles.
+
+A bundle is a directory under saved/bundles/<version>/:
+
+    manifest.json       feature order, IsolationForest constants, sha256 per file
+    classifier.ubj      XGBoost native UBJSON boosters
+    regressor.ubj
+    iso_<array>.npy     flattened IsolationForest node arrays (see compiled.py)
+    scaler_mean.npy     StandardScaler statistics
+    scaler_scale.npy
+    parity_<name>.npy   a probe matrix and the trained models' outputs for it
+
+saved/bundles/CURRENT names the bundle to serve. The .npy files are loaded
+with mmap_mode="r", so every uvicorn worker maps the same page-cache pages
+instead of unpickling its own copy. Loading yields the compiled model
+classes, which have the same duck-typed API as the sklearn estimators, and
+re-scores the stored probe: a bundle whose outputs differ from the ones
+recorded at save time is rejected. Bundles are always served by the compiled
+backend; MODEL_BACKEND only applies to the pickles.
+
+Usage (convert the existing pickles into a bundle):
+    python -m app.models.artifacts
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.features.engineering import FEATURE_NAMES
+from app.models.compiled import (
+    BoosterClassifier, BoosterRegressor, CompiledIsolationForest, CompiledScaler,
+    compare_outputs, model_outputs, parity_probe,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+BUNDLES_DIR = os.path.join(os.path.dirname(__file__), "saved", "bundles")
+CURRENT_FILE = "CURRENT"
+
+
+def save_bundle(models: dict, root: str = BUNDLES_DIR, version: Optional[str] = None) -> str:
+    """
+    Write {classifier, regressor, iso_forest, scaler} (sklearn estimators) as a
+    new bundle and point CURRENT at it. Returns the bundle directory.
+    """
+    if version is None:
+        # Microseconds keep back-to-back saves (e.g. in one training run) apart
+        now = time.time()
+        version = time.strftime("%Y%m%d-%H%M%S", time.gmtime(now)) + f"-{int(now % 1 * 1e6):06d}"
+    final_dir = os.path.join(root, version)
+    if os.path.exists(final_dir):
+        raise FileExistsError(f"bundle {version} already exists")
+    tmp_dir = os.path.join(root, f".{version}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    models["classifier"].get_booster().save_model(os.path.join(tmp_dir, "classifier.ubj"))
+    models["regressor"].get_booster().save_model(os.path.join(tmp_dir, "regressor.ubj"))
+
+    iso = CompiledIsolationForest.from_sklearn(models["iso_forest"])
+    for name in CompiledIsolationForest.ARRAYS:
+        np.save(os.path.join(tmp_dir, f"iso_{name}.npy"), iso.arrays[name])
+    np.save(os.path.join(tmp_dir, "scaler_mean.npy"), np.asarray(models["scaler"].mean_))
+    np.save(os.path.join(tmp_dir, "scaler_scale.npy"), np.asarray(models["scaler"].scale_))
+
+    # Reference outputs of the trained models, re-checked on every load
+    probe = parity_probe(models["scaler"])
+    np.save(os.path.join(tmp_dir, "parity_probe.npy"), probe)
+    for name, output in model_outputs(models, probe).items():
+        np.save(os.path.join(tmp_dir, f"parity_{name}.npy"), output)
+
+    manifest = {
+        "formatVersion": FORMAT_VERSION,
+        "version": version,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "features": list(FEATURE_NAMES),
+        "isoForest": {"offset": iso.offset_, "denominator": iso.denominator},
+        "files": {name: _sha256(os.path.join(tmp_dir, name)) for name in sorted(os.listdir(tmp_dir))},
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp_dir, final_dir)
+    set_current(version, root)
+    return final_dir
+
+
+def load_bundle(path: Optional[str] = None, verify: bool = True) -> Dict[str, object]:
+    """
+    Load a bundle (default: the CURRENT one) as compiled models.
+    Raises FileNotFoundError when there is no bundle and ValueError when the
+    manifest does not match this code, a checksum fails or the loaded models
+    do not reproduce the outputs recorded at save time.
+    """
+    path = path or current_bundle_path()
+    if path is None:
+        raise FileNotFoundError(f"no model bundle in {BUNDLES_DIR}")
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    if manifest.get("formatVersion") != FORMAT_VERSION:
+        raise ValueError(f"unsupported bundle format {manifest.get('formatVersion')}")
+    if manifest["features"] != list(FEATURE_NAMES):
+        raise ValueError("bundle feature order does not match FEATURE_NAMES")
+    if verify:
+        for name, digest in manifest["files"].items():
+            if _sha256(os.path.join(path, name)) != digest:
+                raise ValueError(f"checksum mismatch for {name}")
+
+    import xgboost as xgb
+
+    def booster(name: str):
+        b = xgb.Booster()
+        b.load_model(os.path.join(path, name))
+        return b
+
+    def array(name: str) -> np.ndarray:
+        return np.load(os.path.join(path, name), mmap_mode="r")
+
+    iso_arrays = {name: array(f"iso_{name}.npy") for name in CompiledIsolationForest.ARRAYS}
+    models = {
+        "classifier": BoosterClassifier(booster("classifier.ubj")),
+        "regressor":  BoosterRegressor(booster("regressor.ubj")),
+        "iso_forest": CompiledIsolationForest(
+            iso_arrays, manifest["isoForest"]["offset"], manifest["isoForest"]["denominator"]
+        ),
+        "scaler":     CompiledScaler(array("scaler_mean.npy"), array("scaler_scale.npy")),
+    }
+
+    expected = {name: array(f"parity_{name}.npy") for name in ("scaler", "regressor", "classifier", "iso_forest")}
+    mismatch = compare_outputs(expected, model_outputs(models, array("parity_probe.npy")))
+    if mismatch:
+        raise ValueError(f"{mismatch} output differs from the trained model")
+    return models
+
+
+def current_bundle_path(root: str = BUNDLES_DIR) -> Optional[str]:
+    """Directory named by CURRENT, or None when there is no bundle."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, version)
+    return path if version and os.path.isdir(path) else None
+
+
+def set_current(version: str, root: str = BUNDLES_DIR):
+    """Atomically point CURRENT at an existing bundle."""
+    if not os.path.isdir(os.path.join(root, version)):
+        raise FileNotFoundError(f"bundle {version} not found in {root}")
+    tmp = os.path.join(root, f".{CURRENT_FILE}.tmp")
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(tmp, os.path.join(root, CURRENT_FILE))
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+if __name__ == "__main__":
+    import joblib
+    from app.models.loader import SAVED_DIR
+
+    pickled = {
+        "classifier": joblib.load(os.path.join(SAVED_DIR, "xgb_classifier.pkl")),
+        "regressor":  joblib.load(os.path.join(SAVED_DIR, "xgb_regressor.pkl")),
+        "iso_forest": joblib.load(os.path.join(SAVED_DIR, "isolation_forest.pkl")),
+        "scaler":     joblib.load(os.path.join(SAVED_DIR, "scaler.pkl")),
+    }
+    print(f"✅ Bundle written to {save_bundle(pickled)}")
@@ -0,0 +1,255 @@
+"""
+Compiled inference backend.
+
+Replaces the sklearn-wrapper hot path with lean equivalents that keep the
+same duck-typed API the routes already use:
+
+- XGBoost classifier / regressor → `inplace_predict` on the raw Booster,
+  skipping the sklearn wrapper's per-call validation.
+- StandardScaler → plain NumPy with sklearn's float32 arithmetic.
+- IsolationForest → every tree flattened into shared node arrays and walked
+  by a numba-compiled evaluator (NumPy fallback when numba is missing).
+
+`compile_models()` checks the compiled outputs against the reference models
+on a probe matrix and refuses to swap them in if they disagree. Artifact
+bundles store the reference outputs for the same probe and are checked the
+same way when loaded (see artifacts.py).
+"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PARITY_ATOL = 1e-6
+
+
+class BoosterRegressor:
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.inplace_predict(X)
+
+    def get_booster(self):
+        return self.booster
+
+
+class BoosterClassifier:
+    """Binary classifier on a raw Booster with a `binary:logistic` objective."""
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = self.booster.inplace_predict(X)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return (self.booster.inplace_predict(X) > 0.5).astype(np.int64)
+
+    def get_booster(self):
+        return self.booster
+
+
+class CompiledScaler:
+    """StandardScaler.transform without sklearn's input validation."""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+        # sklearn casts the statistics to the input dtype before subtracting
+        self._mean32 = np.asarray(mean, dtype=np.float32)
+        self._scale32 = np.asarray(scale, dtype=np.float32)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        # Same in-place float32 arithmetic as sklearn, so results are identical
+        out = np.array(X, dtype=np.float32)
+        out -= self._mean32
+        out /= self._scale32
+        return out
+
+
+class CompiledIsolationForest:
+    """
+    IsolationForest scoring over flattened trees.
+    Node arrays hold all trees back to back; `roots` is each tree's first
+    node, `left == -1` marks a leaf and `value` is the leaf's path length
+    term (depth + average path length of its samples - 1).
+    """
+
+    ARRAYS = ("roots", "left", "right", "feature", "threshold", "value")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], offset: float, denominator: float):
+        self.arrays = arrays
+        self.offset_ = offset
+        self.denominator = denominator
+        self._depths = _iforest_depths_numba() or _iforest_depths_numpy
+
+    @classmethod
+    def from_sklearn(cls, iso) -> "CompiledIsolationForest":
+        n_features = iso.n_features_in_
+        roots, left, right, feature, threshold, value = [], [], [], [], [], []
+        base = 0
+        for tree, features in zip(iso.estimators_, iso.estimators_features_):
+            t = tree.tree_
+            is_leaf = t.children_left == -1
+            depths = t.compute_node_depths()
+            avg_path = _average_path_length(t.n_node_samples)
+            feat = np.where(is_leaf, 0, t.feature)
+            if len(features) != n_features:
+                # The tree saw a column subset; map its feature ids back to
+                # columns of the full matrix
+                feat = np.asarray(features)[feat]
+
+            roots.append(base)
+            left.append(np.where(is_leaf, -1, t.children_left + base))
+            right.append(np.where(is_leaf, -1, t.children_right + base))
+            feature.append(feat)
+            threshold.append(t.threshold)
+            value.append(depths + avg_path - 1.0)
+            base += t.node_count
+
+        arrays = {
+            "roots": np.array(roots, dtype=np.int64),
+            "left": np.concatenate(left).astype(np.int64),
+            "right": np.concatenate(right).astype(np.int64),
+            "feature": np.concatenate(feature).astype(np.int64),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "value": np.concatenate(value).astype(np.float64),
+        }
+        denominator = len(iso.estimators_) * float(_average_path_length(np.array([iso.max_samples_]))[0])
+        return cls(arrays, float(iso.offset_), denominator)
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        # Trees compare float32 features, like sklearn's tree.apply
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        depths = self._depths(X, a["roots"], a["left"], a["right"], a["feature"], a["threshold"], a["value"])
+        if self.denominator == 0:
+            return -np.ones_like(depths)
+        return -(2 ** (-depths / self.denominator))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+
+def compile_models(models: dict, probe: Optional[np.ndarray] = None) -> dict:
+    """
+    Compiled counterparts of {classifier, regressor, iso_forest, scaler}.
+    Returns the reference models unchanged if any compiled output differs
+    from the reference on the probe matrix.
+    """
+    compiled = {
+        "classifier": BoosterClassifier(models["classifier"].get_booster()),
+        "regressor":  BoosterRegressor(models["regressor"].get_booster()),
+        "iso_forest": CompiledIsolationForest.from_sklearn(models["iso_forest"]),
+        "scaler":     CompiledScaler(
+            np.asarray(models["scaler"].mean_), np.asarray(models["scaler"].scale_)
+        ),
+    }
+
+    mismatch = check_parity(models, compiled, probe)
+    if mismatch:
+        logger.error(f"❌ Compiled backend disagrees with reference models ({mismatch}); using sklearn backend")
+        return models
+    logger.info("⚡ Compiled inference backend verified against reference models")
+    return compiled
+
+
+def check_parity(reference: dict, compiled: dict, probe: Optional[np.ndarray] = None) -> Optional[str]:
+    """Name of the first output that differs between the two model sets, or None."""
+    if probe is None:
+        probe = parity_probe(reference["scaler"])
+    # End to end: each model set scores its own scaled matrix
+    return compare_outputs(model_outputs(reference, probe), model_outputs(compiled, probe))
+
+
+def parity_probe(scaler) -> np.ndarray:
+    """Deterministic float32 probe matrix spread around the scaler's statistics."""
+    rng = np.random.default_rng(0)
+    probe = rng.normal(size=(256, len(scaler.mean_))) * scaler.scale_ * 3 + scaler.mean_
+    return np.abs(probe).astype(np.float32)
+
+
+def model_outputs(models: dict, probe: np.ndarray) -> Dict[str, np.ndarray]:
+    """Every output the routes read, for the probe matrix."""
+    X = models["scaler"].transform(probe)
+    return {
+        "scaler": np.asarray(X),
+        "regressor": np.asarray(models["regressor"].predict(X)),
+        "classifier": np.asarray(models["classifier"].predict_proba(X)),
+        "iso_forest": np.asarray(models["iso_forest"].decision_function(X)),
+    }
+
+
+def compare_outputs(expected: Dict[str, np.ndarray], actual: Dict[str, np.ndarray]) -> Optional[str]:
+    """Name of the first of model_outputs() that differs, or None."""
+    # The scaler must match bit for bit — a one-ulp difference can flip a tree split
+    if not np.array_equal(expected["scaler"], actual["scaler"]):
+        return "scaler"
+    for name in ("regressor", "classifier", "iso_forest"):
+        if expected[name].shape != actual[name].shape or \
+                not np.allclose(expected[name], actual[name], rtol=0, atol=PARITY_ATOL):
+            return name
+    return None
+
+
+def _average_path_length(n: np.ndarray) -> np.ndarray:
+    """sklearn's average unsuccessful-BST-search path length for n samples."""
+    n = np.asarray(n, dtype=np.float64)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+
+def _iforest_depths_numpy(X, roots, left, right, feature, threshold, value):
+    """Level-wise traversal of every (row, tree) pair at once."""
+    rows = np.arange(len(X))[:, None]
+    node = np.broadcast_to(roots, (len(X), len(roots))).copy()
+    active = left[node] != -1
+    while active.any():
+        go_left = X[rows, feature[node]] <= threshold[node]
+        node = np.where(active, np.where(go_left, left[node], right[node]), node)
+        active = left[node] != -1
+    return value[node].sum(axis=1)
+
+
+_numba_kernel = None
+
+
+def _iforest_depths_numba():
+    """numba-compiled tree walk (compiled once, cached on disk), or None."""
+    global _numba_kernel
+    if _numba_kernel is not None:
+        return _numba_kernel
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True, nogil=True)
+    def kernel(X, roots, left, right, feature, threshold, value):
+        out = np.zeros(X.shape[0])
+        for i in range(X.shape[0]):
+            acc = 0.0
+            for t in range(roots.shape[0]):
+                node = roots[t]
+                while left[node] != -1:
+                    if X[i, feature[node]] <= threshold[node]:
+                        node = left[node]
+                    else:
+                        node = right[node]
+                acc += value[node]
+            out[i] = acc
+        return out
+
+    _numba_kernel = kernel
+    return kernel
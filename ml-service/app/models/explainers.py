@@ -0,0 +1,38 @@
+"""
+Explanation backends.
+
+- "xgboost": the booster's own `pred_contribs=True` — exact TreeSHAP computed
+  inside XGBoost on the whole batch, with no shap (numba/llvmlite/matplotlib)
+  import on the serving path.
+- "shap": shap.TreeExplainer, kept selectable as the reference.
+
+Both expose `shap_values(X)` → (N, n_features), so score_matrix does not care which one it holds. For XGBoost models the two
+agree bit for bit; tests/test_explainers.py checks that and
+benchmarks/bench_explainer_backends.py times both.
+"""
+
+import numpy as np
+
+BACKENDS = ("xgboost", "shap")
+
+
+class XGBoostExplainer:
+    def __init__(self, booster):
+        self.booster = booster
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        import xgboost as xgb
+        contribs = self.booster.predict(xgb.DMatrix(X), pred_contribs=True)
+        # Last column is the bias term
+        return contribs[:, :-1]
+
+
+def build_explainer(classifier, backend: str):
+    """Explainer for an XGBoost classifier (sklearn wrapper or raw-Booster wrapper)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown explainer backend {backend!r} (expected one of {BACKENDS})")
+    booster = classifier.get_booster()
+    if backend == "xgboost":
+        return XGBoostExplainer(booster)
+    import shap
+    return shap.TreeExplainer(booster)
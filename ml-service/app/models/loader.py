@@ -1,40 +1,311 @@
 """
 Model loader — loads trained models from disk at startup.
-Uses a singleton pattern so models are only loaded once.
+A ModelRegistry singleton holds the current model set: it backs off after
+failed loads and hot-reloads new artifacts in the background.
+The explainer (see explainers.py) is built here too, so its setup happens
+once per load instead of once per request. With MODEL_BACKEND=compiled the loaded
+models are swapped for their compiled equivalents (see compiled.py).
+When a versioned artifact bundle exists (see artifacts.py) it is loaded
+instead of the pickles; MODEL_FORMAT picks between the two. Bundles always
+load as compiled models, checked against the outputs recorded at save time,
+so MODEL_BACKEND only applies to the pickles.
+Every successful load bumps the model version, which keys the prediction cache.
+
+warm_up() runs in the background at startup: it loads the models, imports the
+heavy libraries (xgboost, and shap → numba/llvmlite if selected) and runs one inference so the
+first real request pays none of that. Readiness flips once it finishes.
 """
 
 import os
+import threading
+import time
 import joblib
 import logging
+from typing import Optional
+
+from app import config
 
 logger = logging.getLogger(__name__)
 
 SAVED_DIR = os.path.join(os.path.dirname(__file__), "saved")
+PICKLES = ("xgb_classifier.pkl", "xgb_regressor.pkl", "isolation_forest.pkl", "scaler.pkl")
+
+
+class ModelSnapshot:
+    """One consistent model set. Replaced as a whole, never mutated."""
+
+    __slots__ = ("models", "explainer", "version", "source", "fingerprint", "loaded_at")
+
+    def __init__(self, models: dict, explainer, version: int, source: Optional[str], fingerprint=None):
+        self.models = models
+        self.explainer = explainer
+        self.version = version
+        self.source = source            # "bundle:<version>" | "pickle" | None
+        self.fingerprint = fingerprint  # on-disk state this set was loaded from
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """
+    Holds the current ModelSnapshot and swaps in new ones.
+
+    - Loads are serialized; readers never block on them and always see
+      either the old snapshot or the new one (a single reference swap).
+    - A failed or missing load is not retried until an exponential backoff
+      expires, so requests without models fall straight through to the
+      rule-based path instead of hitting the filesystem each time.
+    - A watcher thread polls the bundle CURRENT pointer and pickle mtimes and
+      reloads in the background when they change. A failed reload keeps the
+      previous snapshot serving.
+    """
+
+    def __init__(self, retry_base_s: float, retry_max_s: float):
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self._snapshot = ModelSnapshot({}, None, 0, None)
+        self._lock = threading.Lock()
+        self.state = "empty"            # empty | loading | loaded | missing | failed
+        self.last_error: Optional[str] = None
+        self.failures = 0
+        self.loads = 0
+        self.load_seconds: Optional[float] = None   # duration of the last successful load
+        self._failed_fingerprint = None
+        self._next_retry_at = 0.0
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def snapshot(self) -> ModelSnapshot:
+        """Current snapshot, without triggering a load."""
+        return self._snapshot
+
+    def get(self) -> ModelSnapshot:
+        """Current snapshot; loads first if there are no models and no backoff pending."""
+        snap = self._snapshot
+        if snap.models or time.monotonic() < self._next_retry_at:
+            return snap
+        with self._lock:
+            # Another thread (warm-up, the watcher) may have loaded meanwhile
+            if not self._snapshot.models and time.monotonic() >= self._next_retry_at:
+                self._load()
+        return self._snapshot
+
+    def reload(self) -> ModelSnapshot:
+        """Load from disk now and swap in the result (on success)."""
+        with self._lock:
+            self._load()
+        return self._snapshot
+
+    def _load(self):
+        fingerprint = _source_fingerprint()
+        previous = self.state
+        self.state = "loading"
+        start = time.perf_counter()
+        try:
+            models, explainer, source = _read_models()
+        except FileNotFoundError:
+            logger.warning(
+                "⚠️  Trained models not found. Run 'python -m app.models.train' first. "
+                "Falling back to rule-based scoring."
+            )
+            self._failed(previous, "missing", fingerprint, "trained models not found")
+            return
+        except Exception as err:
+            logger.exception("❌ Model load failed")
+            self._failed(previous, "failed", fingerprint, str(err))
+            return
+
+        self._snapshot = ModelSnapshot(models, explainer, self._snapshot.version + 1, source, fingerprint)
+        self.state = "loaded"
+        self.loads += 1
+        self.load_seconds = round(time.perf_counter() - start, 4)
+        self.failures = 0
+        self.last_error = None
+        self._failed_fingerprint = None
+        self._next_retry_at = 0.0
+        from app.services.prediction_cache import prediction_cache
+        prediction_cache.clear()
+
+    def _failed(self, previous: str, state: str, fingerprint, error: str):
+        self.failures += 1
+        self.last_error = error
+        self._failed_fingerprint = fingerprint
+        backoff = min(self.retry_base_s * 2 ** (self.failures - 1), self.retry_max_s)
+        self._next_retry_at = time.monotonic() + backoff
+        # With a model set already serving, a failed reload changes nothing
+        self.state = previous if self._snapshot.models else state
+
+    # ── Background reload ─────────────────────────────────────────────────────
+
+    def start_watching(self, interval_s: float):
+        if interval_s <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval_s,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        self._watcher = None
+
+    def _watch(self, interval_s: float):
+        while not self._stop.wait(interval_s):
+            try:
+                self._reload_if_changed()
+            except Exception:
+                logger.exception("❌ Model watcher error")
+
+    def _reload_if_changed(self):
+        fingerprint = _source_fingerprint()
+        if fingerprint == self._snapshot.fingerprint:
+            return
+        if fingerprint == self._failed_fingerprint and time.monotonic() < self._next_retry_at:
+            return
+        with self._lock:
+            if fingerprint == self._snapshot.fingerprint:
+                return
+            logger.info("🔄 Model artifacts changed on disk; reloading in the background")
+            self._load()
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "state": self.state,
+            "version": snap.version,
+            "source": snap.source,
+            "loadedAt": snap.loaded_at if snap.models else None,
+            "loads": self.loads,
+            "loadSeconds": self.load_seconds,
+            "failures": self.failures,
+            "lastError": self.last_error,
+            "retryInSeconds": round(max(0.0, self._next_retry_at - time.monotonic()), 1),
+            "watching": self._watcher is not None,
+        }
+
+
+def _read_models():
+    """(models, explainer, source) from disk; FileNotFoundError when there are none."""
+    from app.models.artifacts import current_bundle_path
+    bundle, bundle_path = None, None
+    if config.MODEL_FORMAT != "pickle":
+        bundle_path = current_bundle_path()
+        bundle = _load_bundle(bundle_path)
+    if bundle is not None:
+        return bundle, build_explainer(bundle), f"bundle:{os.path.basename(bundle_path)}"
 
-_models = {}
+    models = {
+        "classifier": joblib.load(os.path.join(SAVED_DIR, "xgb_classifier.pkl")),
+        "regressor":  joblib.load(os.path.join(SAVED_DIR, "xgb_regressor.pkl")),
+        "iso_forest": joblib.load(os.path.join(SAVED_DIR, "isolation_forest.pkl")),
+        "scaler":     joblib.load(os.path.join(SAVED_DIR, "scaler.pkl")),
+    }
+    logger.info("✅ ML models loaded successfully")
+    # Explainer reads the sklearn classifier, so build it before compiling
+    explainer = build_explainer(models)
+    if config.MODEL_BACKEND == "compiled":
+        from app.models.compiled import compile_models
+        models = compile_models(models)
+    return models, explainer, "pickle"
+
+
+def _source_fingerprint() -> tuple:
+    """Cheap summary of the on-disk model state: CURRENT pointer + pickle stats."""
+    from app.models.artifacts import BUNDLES_DIR, CURRENT_FILE
+    try:
+        with open(os.path.join(BUNDLES_DIR, CURRENT_FILE)) as f:
+            current = f.read().strip()
+    except FileNotFoundError:
+        current = None
+    pickles = []
+    for name in PICKLES:
+        try:
+            st = os.stat(os.path.join(SAVED_DIR, name))
+            pickles.append((name, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            pickles.append((name, None, None))
+    return (config.MODEL_FORMAT, current, tuple(pickles))
+
+
+model_registry = ModelRegistry(config.MODEL_RETRY_BASE_S, config.MODEL_RETRY_MAX_S)
+_warm = {"state": "cold", "seconds": None, "error": None}   # cold | warming | ready | failed
 
 
 def load_models():
-    """Load all models from disk. Called once at FastAPI startup."""
-    global _models
+    """Load all models from disk now and swap them in. Returns the current models."""
+    return model_registry.reload().models
+
+
+def build_explainer(models: dict):
+    """Build the EXPLAINER_BACKEND explainer for the classifier (None without models)."""
+    if not models:
+        return None
+    from app.models import explainers
+    return explainers.build_explainer(models["classifier"], config.EXPLAINER_BACKEND)
+
+
+def _load_bundle(path: Optional[str]):
+    """Models from an artifact bundle, or None to fall back to pickles."""
+    from app.models.artifacts import load_bundle
     try:
-        _models = {
-            "classifier": joblib.load(os.path.join(SAVED_DIR, "xgb_classifier.pkl")),
-            "regressor":  joblib.load(os.path.join(SAVED_DIR, "xgb_regressor.pkl")),
-            "iso_forest": joblib.load(os.path.join(SAVED_DIR, "isolation_forest.pkl")),
-            "scaler":     joblib.load(os.path.join(SAVED_DIR, "scaler.pkl")),
-        }
-        logger.info("✅ ML models loaded successfully")
+        models = load_bundle(path, verify=config.MODEL_VERIFY_CHECKSUMS)
     except FileNotFoundError:
-        logger.warning(
-            "⚠️  Trained models not found. Run 'python -m app.models.train' first. "
-            "Falling back to rule-based scoring."
-        )
-        _models = {}
-    return _models
+        if config.MODEL_FORMAT == "bundle":
+            logger.warning("⚠️  MODEL_FORMAT=bundle but no model bundle found")
+        return None
+    except ValueError as err:
+        logger.error(f"❌ Model bundle rejected ({err}); falling back to pickles")
+        return None
+    logger.info("✅ ML models loaded from artifact bundle (compiled backend, parity verified)")
+    if config.MODEL_BACKEND != "compiled":
+        logger.info(f"ℹ️  MODEL_BACKEND={config.MODEL_BACKEND} applies to pickles only; bundles are always compiled")
+    return models
 
 
 def get_models():
-    if not _models:
-        load_models()
-    return _models
+    return model_registry.get().models
+
+
+def get_explainer():
+    """SHAP explainer matching the currently loaded classifier."""
+    return model_registry.get().explainer
+
+
+def get_snapshot() -> ModelSnapshot:
+    """Models, explainer and version that belong together — use one per request."""
+    return model_registry.get()
+
+
+def loaded_models() -> dict:
+    """Currently loaded models, without triggering a load."""
+    return model_registry.snapshot.models
+
+
+def warm_up():
+    """Load models and run one inference so imports and JIT happen off the request path."""
+    _warm["state"] = "warming"
+    start = time.perf_counter()
+    try:
+        models = get_models()
+        if models:
+            import numpy as np
+            from app.features.engineering import FEATURE_NAMES
+            from app.services.inference import score_matrix
+            score_matrix(models, np.zeros((1, len(FEATURE_NAMES)), dtype=np.float32))
+        _warm["state"] = "ready"
+        logger.info(f"🔥 Warm-up finished in {time.perf_counter() - start:.2f}s")
+    except Exception as err:
+        _warm["state"] = "failed"
+        _warm["error"] = str(err)
+        logger.exception("❌ Warm-up failed")
+    _warm["seconds"] = round(time.perf_counter() - start, 3)
+
+
+def warm_status() -> dict:
+    return dict(_warm)
+
+
+def get_model_version() -> int:
+    """Increments on every successful load; 0 until models have been loaded."""
+    return model_registry.snapshot.version
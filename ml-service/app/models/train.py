@@ -3,174 +3,265 @@ Model Training Script
 Run once to train and save XGBoost + IsolationForest models.
 
 Usage:
-    python -m app.models.train
+    python -m app.models.train [--rows 5000] [--chunk-rows 100000] [--seed 42]
+                               [--external-memory] [--output-dir DIR]
 
 Generates synthetic training data based on epidemiological rules,
-then trains and saves models to app/models/saved/
+then trains and saves models to app/models/saved/ — as joblib pickles and
+as a versioned artifact bundle (see artifacts.py) that the service loads.
+
+Data is generated in vectorized chunks and never held in full: each training
+pass regenerates the same chunks from per-chunk seeds and streams them into
+XGBoost through a DataIter, so memory stays flat from thousands to tens of
+millions of rows. --external-memory keeps the quantized matrix on disk too.
 """
 
+import argparse
 import os
+import resource
+import shutil
+import tempfile
+import time
+from typing import Iterator, Tuple
+
 import numpy as np
 import pandas as pd
 import joblib
 from sklearn.ensemble import IsolationForest
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report
 import xgboost as xgb
 
-from app.features.engineering import FEATURE_NAMES
+from app.features.engineering import FEATURE_NAMES, SYNDROME_KEYS
+from app.features.risk_score import weighted_risk
+from app.models.artifacts import save_bundle
 
 SAVED_DIR = os.path.join(os.path.dirname(__file__), "saved")
-os.makedirs(SAVED_DIR, exist_ok=True)
 
 N_SAMPLES = 5000
-np.random.seed(42)
+CHUNK_ROWS = 100_000
+TEST_FRACTION = 0.2
+ISO_MAX_ROWS = 100_000      # IsolationForest subsamples 256 rows per tree anyway
+SEED = 42
 
+CLASSIFIER_PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "logloss",
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "tree_method": "hist",
+    "seed": SEED,
+}
+REGRESSOR_PARAMS = {
+    "objective": "reg:squarederror",
+    "max_depth": 5,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "tree_method": "hist",
+    "seed": SEED,
+}
+N_ESTIMATORS = 200
 
-def generate_synthetic_data(n=N_SAMPLES):
+
+def generate_chunk(n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Generate synthetic training data based on epidemiological rules.
+    One chunk of synthetic wards based on epidemiological rules.
     High risk = chlorine drop + syndrome spike + rainfall + citizen cluster.
+    Returns (X float32 in FEATURE_NAMES order, risk score, binary label).
     """
-    data = []
-    labels = []
-
-    for _ in range(n):
-        # Base features
-        chlorine_drop = np.random.beta(2, 5)          # mostly low, sometimes high
-        syndrome_spike = np.random.exponential(0.8)    # mostly <1, occasionally >3
-        lag_rainfall = np.random.exponential(10)
-        citizen_cluster = np.random.poisson(3)
-        turbidity = np.random.exponential(2)
-        ph_dev = np.random.exponential(0.3)
-        humidity = np.random.uniform(50, 95)
-        temp = np.random.uniform(20, 38)
-        admissions_7d = np.random.poisson(50)
-        admissions_48h = np.random.poisson(15)
-        daily_avg = admissions_7d / 7
-
-        # Syndrome one-hot (proportions)
-        syndrome_probs = np.random.dirichlet([3, 2, 2, 1, 1, 1, 1])
-
-        row = [
-            admissions_7d,
-            admissions_48h,
-            daily_avg,
-            syndrome_spike,
-            chlorine_drop,
-            max(0, 0.8 - chlorine_drop * 0.8),   # current chlorine
-            turbidity,
-            ph_dev,
-            lag_rainfall,
-            lag_rainfall * 0.6,                    # avg rainfall 7d
-            float(lag_rainfall > 30),              # rainfall spike
-            temp,
-            humidity,
-            citizen_cluster,
-            np.random.uniform(1, 5),               # severity score
-            *syndrome_probs,
-        ]
-
-        # Risk score: weighted combination
-        risk = (
-            chlorine_drop * 0.35 +
-            min(syndrome_spike / 5, 1) * 0.30 +
-            min(lag_rainfall / 50, 1) * 0.15 +
-            min(citizen_cluster / 20, 1) * 0.10 +
-            min(turbidity / 10, 1) * 0.10
-        )
-
-        # Add noise
-        risk = np.clip(risk + np.random.normal(0, 0.05), 0, 1)
-
-        # Binary label: high risk if score > 0.6
-        label = int(risk > 0.6)
-
-        data.append(row)
-        labels.append(label)
-
-    df = pd.DataFrame(data, columns=FEATURE_NAMES)
-    df["risk_score"] = [
-        np.clip(
-            row[3] * 0.30 + row[4] * 0.35 + min(row[8] / 50, 1) * 0.15 +
-            min(row[13] / 20, 1) * 0.10 + min(row[6] / 10, 1) * 0.10 +
-            np.random.normal(0, 0.05), 0, 1
-        )
-        for row in data
-    ]
-    df["label"] = labels
+    chlorine_drop = rng.beta(2, 5, n)              # mostly low, sometimes high
+    syndrome_spike = rng.exponential(0.8, n)       # mostly <1, occasionally >3
+    lag_rainfall = rng.exponential(10, n)
+    citizen_cluster = rng.poisson(3, n)
+    turbidity = rng.exponential(2, n)
+    ph_dev = rng.exponential(0.3, n)
+    humidity = rng.uniform(50, 95, n)
+    temp = rng.uniform(20, 38, n)
+    admissions_7d = rng.poisson(50, n)
+    admissions_48h = rng.poisson(15, n)
+
+    # Syndrome one-hot (proportions)
+    syndrome_probs = rng.dirichlet([3, 2, 2, 1, 1, 1, 1], n)
+
+    # Full-precision columns; X is their float32 copy
+    columns = {
+        "totalAdmissions7d": admissions_7d,
+        "totalAdmissions48h": admissions_48h,
+        "dailyAvg7d": admissions_7d / 7,
+        "syndromeSpike48h": syndrome_spike,
+        "chlorineDropRatio": chlorine_drop,
+        "currentChlorine": np.maximum(0, 0.8 - chlorine_drop * 0.8),
+        "currentTurbidity": turbidity,
+        "phDeviation": ph_dev,
+        "lagRainfall1d": lag_rainfall,
+        "avgRainfall7d": lag_rainfall * 0.6,
+        "rainfallSpike": lag_rainfall > 30,
+        "avgTemp7d": temp,
+        "avgHumidity7d": humidity,
+        "citizenClusterCount": citizen_cluster,
+        "citizenSeverityScore": rng.uniform(1, 5, n),
+        **{f"syndrome_{s}": syndrome_probs[:, i] for i, s in enumerate(SYNDROME_KEYS)},
+    }
+    X = np.empty((n, len(FEATURE_NAMES)), dtype=np.float32)
+    for i, name in enumerate(FEATURE_NAMES):
+        X[:, i] = columns[name]
+
+    # Risk score: the rule-based weighted combination (risk_score.py, also
+    # served by the fallback) + noise. The regressor target and the
+    # classifier label both come from this one score.
+    risk = np.clip(weighted_risk(columns) + rng.normal(0, 0.05, n), 0, 1)
+
+    # Binary label: high risk if score > 0.6
+    label = (risk > 0.6).astype(np.int32)
+    return X, risk, label
+
+
+def iter_chunks(rows: int, chunk_rows: int, seed: int, first_chunk: int = 0) -> Iterator[tuple]:
+    """Chunks covering `rows` rows; chunk i is always generated from seed (seed, i)."""
+    for i, start in enumerate(range(0, rows, chunk_rows), start=first_chunk):
+        rng = np.random.default_rng([seed, i])
+        yield generate_chunk(min(chunk_rows, rows - start), rng)
+
+
+def generate_synthetic_data(n=N_SAMPLES, seed=SEED, chunk_rows=CHUNK_ROWS) -> pd.DataFrame:
+    """All of `n` synthetic rows as one DataFrame (features + risk_score + label)."""
+    chunks = list(iter_chunks(n, chunk_rows, seed))
+    df = pd.DataFrame(np.vstack([c[0] for c in chunks]), columns=FEATURE_NAMES)
+    df["risk_score"] = np.concatenate([c[1] for c in chunks])
+    df["label"] = np.concatenate([c[2] for c in chunks])
     return df
 
 
-def train():
-    print("🔧 Generating synthetic training data...")
-    df = generate_synthetic_data()
+class SyntheticChunks(xgb.DataIter):
+    """
+    Streams scaled synthetic chunks into XGBoost. Every pass regenerates the
+    same chunks from their seeds, so no chunk outlives its `next()` call.
+    """
+
+    def __init__(self, rows: int, chunk_rows: int, seed: int, scaler: StandardScaler,
+                 target: str, cache_prefix=None):
+        self.rows = rows
+        self.chunk_rows = chunk_rows
+        self.seed = seed
+        self.scaler = scaler
+        self.target = target        # "label" | "risk"
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._chunks is None:
+            self._chunks = iter_chunks(self.rows, self.chunk_rows, self.seed)
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        X, risk, label = chunk
+        input_data(data=self.scaler.transform(X), label=label if self.target == "label" else risk)
+        return True
+
+    def reset(self):
+        self._chunks = None
 
-    X = df[FEATURE_NAMES].values
-    y_class = df["label"].values
-    y_score = df["risk_score"].values
 
-    X_train, X_test, y_train, y_test = train_test_split(X, y_class, test_size=0.2, random_state=42)
+def _train_booster(params: dict, chunks: SyntheticChunks, external_memory: bool) -> xgb.Booster:
+    if external_memory:
+        dtrain = xgb.ExtMemQuantileDMatrix(chunks)
+    else:
+        dtrain = xgb.QuantileDMatrix(chunks)
+    return xgb.train(params, dtrain, num_boost_round=N_ESTIMATORS)
 
-    # ── Scaler ────────────────────────────────────────────────────────────────
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _report(stage: str, rows: int, seconds: float):
+    print(f"   {stage}: {rows / seconds:,.0f} rows/s, peak RSS {_peak_rss_mb():,.0f} MB")
+
+
+def train(rows=N_SAMPLES, chunk_rows=CHUNK_ROWS, seed=SEED, external_memory=False, output_dir=SAVED_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    test_rows = max(1, min(int(rows * TEST_FRACTION), chunk_rows))
+    train_rows = rows - test_rows
+    n_train_chunks = -(-train_rows // chunk_rows)
+    print(f"🔧 Streaming {train_rows:,} synthetic training rows in chunks of {chunk_rows:,}...")
+
+    # ── Scaler (one streaming pass) ───────────────────────────────────────────
+    start = time.perf_counter()
     scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
+    for X, _, _ in iter_chunks(train_rows, chunk_rows, seed):
+        scaler.partial_fit(X)
+    _report("scaler pass", train_rows, time.perf_counter() - start)
+
+    # Held-out chunk from seeds the training chunks never use
+    X_test, _, y_test = next(iter_chunks(test_rows, chunk_rows, seed, first_chunk=n_train_chunks))
     X_test_scaled = scaler.transform(X_test)
 
-    # ── XGBoost Classifier ────────────────────────────────────────────────────
-    print("🤖 Training XGBoost classifier...")
-    clf = xgb.XGBClassifier(
-        n_estimators=200,
-        max_depth=6,
-        learning_rate=0.05,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        use_label_encoder=False,
-        eval_metric="logloss",
-        random_state=42,
-    )
-    clf.fit(X_train_scaled, y_train)
-    y_pred = clf.predict(X_test_scaled)
-    print(classification_report(y_test, y_pred))
-
-    # ── XGBoost Regressor (risk score) ────────────────────────────────────────
-    print("📈 Training XGBoost risk score regressor...")
-    X_score_train, X_score_test, y_score_train, y_score_test = train_test_split(
-        X, y_score, test_size=0.2, random_state=42
-    )
-    X_score_train_s = scaler.transform(X_score_train)
+    cache_dir = tempfile.mkdtemp(prefix="kavach-xgb-") if external_memory else None
 
-    reg = xgb.XGBRegressor(
-        n_estimators=200,
-        max_depth=5,
-        learning_rate=0.05,
-        subsample=0.8,
-        random_state=42,
-    )
-    reg.fit(X_score_train_s, y_score_train)
+    def chunks(target: str) -> SyntheticChunks:
+        prefix = os.path.join(cache_dir, target) if cache_dir else None
+        return SyntheticChunks(train_rows, chunk_rows, seed, scaler, target, cache_prefix=prefix)
+
+    try:
+        # ── XGBoost Classifier ────────────────────────────────────────────────
+        print("🤖 Training XGBoost classifier...")
+        start = time.perf_counter()
+        clf = xgb.XGBClassifier()
+        clf.load_model(bytearray(_train_booster(CLASSIFIER_PARAMS, chunks("label"), external_memory).save_raw("ubj")))
+        _report("classifier", train_rows, time.perf_counter() - start)
+        y_pred = clf.predict(X_test_scaled)
+        print(classification_report(y_test, y_pred))
+
+        # ── XGBoost Regressor (risk score) ────────────────────────────────────
+        print("📈 Training XGBoost risk score regressor...")
+        start = time.perf_counter()
+        reg = xgb.XGBRegressor()
+        reg.load_model(bytearray(_train_booster(REGRESSOR_PARAMS, chunks("risk"), external_memory).save_raw("ubj")))
+        _report("regressor", train_rows, time.perf_counter() - start)
+    finally:
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
 
     # ── Isolation Forest (anomaly detection) ──────────────────────────────────
+    # Trees subsample 256 rows each, so a bounded sample fits the same model
     print("🔍 Training Isolation Forest...")
+    iso_rows = min(train_rows, ISO_MAX_ROWS)
+    X_iso = np.vstack([X for X, _, _ in iter_chunks(iso_rows, chunk_rows, seed)])
     iso = IsolationForest(
         n_estimators=200,
         contamination=0.1,
-        random_state=42,
+        random_state=seed,
     )
-    iso.fit(X_train_scaled)
+    iso.fit(scaler.transform(X_iso))
 
     # ── Save Models ───────────────────────────────────────────────────────────
-    joblib.dump(clf, os.path.join(SAVED_DIR, "xgb_classifier.pkl"))
-    joblib.dump(reg, os.path.join(SAVED_DIR, "xgb_regressor.pkl"))
-    joblib.dump(iso, os.path.join(SAVED_DIR, "isolation_forest.pkl"))
-    joblib.dump(scaler, os.path.join(SAVED_DIR, "scaler.pkl"))
+    joblib.dump(clf, os.path.join(output_dir, "xgb_classifier.pkl"))
+    joblib.dump(reg, os.path.join(output_dir, "xgb_regressor.pkl"))
+    joblib.dump(iso, os.path.join(output_dir, "isolation_forest.pkl"))
+    joblib.dump(scaler, os.path.join(output_dir, "scaler.pkl"))
+    bundle_dir = save_bundle(
+        {"classifier": clf, "regressor": reg, "iso_forest": iso, "scaler": scaler},
+        root=os.path.join(output_dir, "bundles"),
+    )
 
-    print(f"\n✅ Models saved to {SAVED_DIR}")
+    print(f"\n✅ Models saved to {output_dir}")
     print("   xgb_classifier.pkl")
     print("   xgb_regressor.pkl")
     print("   isolation_forest.pkl")
     print("   scaler.pkl")
+    print(f"   bundles/{os.path.basename(bundle_dir)}/ (artifact bundle, now CURRENT)")
+    print(f"   peak RSS {_peak_rss_mb():,.0f} MB")
 
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the Kavach outbreak models on synthetic data")
+    parser.add_argument("--rows", type=int, default=N_SAMPLES)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--external-memory", action="store_true",
+                        help="keep XGBoost's quantized training matrix on disk")
+    parser.add_argument("--output-dir", default=SAVED_DIR)
+    args = parser.parse_args()
+    train(args.rows, args.chunk_rows, args.seed, args.external_memory, args.output_dir)
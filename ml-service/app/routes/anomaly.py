@@ -1,22 +1,49 @@
 """
 POST /anomaly
 Isolation Forest anomaly detection endpoint
+
+POST /anomaly/stream
+Online detection: bulk per-ward observations scored against each ward's own
+exponentially weighted baseline, which they then update (see online_anomaly.py).
+Also speaks MessagePack and Arrow IPC (Content-Type / Accept, see wire.py).
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+from typing import List
 import numpy as np
 
 from app.schemas.schemas import AnomalyRequest, AnomalyResponse
 from app.features.engineering import features_to_array, FEATURE_NAMES
 from app.models.loader import get_models
+from app.services.executor import inference_executor
+from app.services.online_anomaly import online_detector
+from app.services.metrics import StageTimer
+from app.services.wire import WireRoute, respond
+
+router = APIRouter(route_class=WireRoute)
+
+
+class AnomalyObservations(BaseModel):
+    wardIds: List[str]
+    values: List[List[float]]   # one row per observation, in FEATURE_NAMES order
 
-router = APIRouter()
+
+class AnomalyStreamResponse(BaseModel):
+    results: List[AnomalyResponse]
 
 
 @router.post("", response_model=AnomalyResponse)
 async def detect_anomaly(request: AnomalyRequest):
+    return await inference_executor.run(_detect_anomaly, request)
+
+
+def _detect_anomaly(request: AnomalyRequest) -> AnomalyResponse:
+    timer = StageTimer("anomaly")
     features_dict = request.features.model_dump()
+    timer.lap("model_dump")
     X = features_to_array(features_dict)
+    timer.lap("features")
 
     models = get_models()
 
@@ -30,11 +57,13 @@ async def detect_anomaly(request: AnomalyRequest):
 
     scaler = models["scaler"]
     X_scaled = scaler.transform(X)
+    timer.lap("scaler")
 
     iso = models["iso_forest"]
     prediction = iso.predict(X_scaled)[0]       # 1 = normal, -1 = anomaly
     score = float(iso.decision_function(X_scaled)[0])  # lower = more anomalous
     is_anomaly = prediction == -1
+    timer.lap("iso_forest")
 
     # Identify which features are most anomalous (simple z-score approach)
     anomaly_features = []
@@ -45,10 +74,62 @@ async def detect_anomaly(request: AnomalyRequest):
         z_scores = np.abs((feature_values - scaler.mean_) / (scaler.scale_ + 1e-8))
         top_indices = np.argsort(z_scores)[::-1][:3]
         anomaly_features = [FEATURE_NAMES[i] for i in top_indices]
+    timer.lap("zscores")
 
-    return AnomalyResponse(
+    response = AnomalyResponse(
         wardId=request.wardId,
         isAnomaly=is_anomaly,
         anomalyScore=round(score, 4),
         anomalyFeatures=anomaly_features,
     )
+    timer.lap("response")
+    timer.finish()
+    return response
+
+
+@router.post("/stream", response_model=AnomalyStreamResponse)
+async def detect_anomaly_stream(observations: AnomalyObservations, request: Request):
+    """
+    Input: { wardIds: [...], values: [[22 features], ...] } — observations of
+    the same ward are applied in order.
+    Output: one result per observation; wards still warming up score 0.
+    """
+    if len(observations.wardIds) != len(observations.values):
+        raise HTTPException(status_code=422, detail="wardIds and values must have equal lengths")
+    if any(len(row) != len(FEATURE_NAMES) for row in observations.values):
+        raise HTTPException(status_code=422, detail=f"Each observation needs {len(FEATURE_NAMES)} values")
+    if not observations.values:
+        return AnomalyStreamResponse(results=[])
+    wards = observations.wardIds
+    if len(wards) > online_detector.max_wards and len(set(wards)) > online_detector.max_wards:
+        raise HTTPException(
+            status_code=422, detail=f"At most {online_detector.max_wards} distinct wards per request"
+        )
+    X = np.asarray(observations.values, dtype=np.float64)
+    if not np.isfinite(X).all():
+        raise HTTPException(status_code=422, detail="Observations contain NaN or infinite values")
+    result = await inference_executor.run(_detect_anomaly_stream, observations.wardIds, X)
+    return respond(request, result, lambda data: data["results"])
+
+
+def _detect_anomaly_stream(ward_ids: List[str], X: np.ndarray) -> AnomalyStreamResponse:
+    timer = StageTimer("anomaly_stream")
+    score, is_anomaly, z = online_detector.update(ward_ids, X)
+    timer.lap("update")
+
+    # Top-3 deviating features, only for the flagged observations
+    features = [[] for _ in ward_ids]
+    flagged = np.flatnonzero(is_anomaly)
+    if len(flagged):
+        top = np.argsort(-np.abs(z[flagged]), axis=1)[:, :3]
+        for i, idx in zip(flagged.tolist(), top.tolist()):
+            features[i] = [FEATURE_NAMES[j] for j in idx]
+
+    results = [
+        AnomalyResponse(wardId=w, isAnomaly=a, anomalyScore=round(s, 4), anomalyFeatures=f)
+        for w, a, s, f in zip(ward_ids, is_anomaly.tolist(), score.tolist(), features)
+    ]
+    response = AnomalyStreamResponse(results=results)
+    timer.lap("response")
+    timer.finish()
+    return response
@@ -1,17 +1,39 @@
 """
 GET /forecast/{ward_id}
 Prophet-based 48-hour admission forecast
+
+POST /forecast/batch
+Forecasts many wards in one call — Prophet fits run in parallel on a process
+pool; wards with short histories use the vectorized seasonal model
+
+POST /forecast/history
+Bulk ingestion of hourly admission counts per ward, used as forecast history
 """
 
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List
-import pandas as pd
+from fastapi import APIRouter, Query
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Optional, Tuple
+import zlib
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from concurrent.futures.process import BrokenProcessPool
+
+from app import config
+from app.services.executor import (
+    forecast_executor, forecast_process_pool, reset_forecast_process_pool
+)
+from app.services.forecast_engine import fit_prophet, predict_prophet, seasonal_forecast
+from app.services.forecast_store import forecast_store
+from app.services.history_store import history_store
+from app.services.metrics import StageTimer
 
 router = APIRouter()
 
+HISTORY_HOURS = 30 * 24
+
+# Minute of day → "HH:MM", so point labels are a lookup instead of strftime
+_HHMM = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)])
+
 
 class ForecastPoint(BaseModel):
     time: str
@@ -28,76 +50,263 @@ class ForecastResponse(BaseModel):
     source: str
 
 
+class BatchForecastRequest(BaseModel):
+    wardIds: List[str]
+    horizon: int = Field(48, ge=1, le=config.FORECAST_MAX_HORIZON)
+
+
+class BatchForecastResponse(BaseModel):
+    forecasts: List[ForecastResponse]   # same order as wardIds
+
+
+class WardHistory(BaseModel):
+    wardId: str
+    start: datetime         # hour of counts[0]; naive datetimes are taken as UTC
+    # hourly admission counts from `start` onwards (finite, non-negative)
+    counts: List[Annotated[float, Field(ge=0, allow_inf_nan=False)]]
+
+
+class HistoryIngestRequest(BaseModel):
+    series: List[WardHistory]
+
+
+class HistoryIngestResponse(BaseModel):
+    wards: int
+    accepted: int
+    dropped: int            # hours at or before a ward's stored tail (append-only)
+
+
+@router.post("/history", response_model=HistoryIngestResponse)
+async def ingest_history(request: HistoryIngestRequest):
+    """
+    Input: { series: [{ wardId, start, counts: [...] }] }
+    Appends each ward's hourly counts to the admission history store.
+    """
+    accepted, dropped = await forecast_executor.run(
+        history_store.append_many, [(s.wardId, _epoch_hour(s.start), s.counts) for s in request.series]
+    )
+    return HistoryIngestResponse(wards=len(request.series), accepted=accepted, dropped=dropped)
+
+
+@router.post("/batch", response_model=BatchForecastResponse)
+async def forecast_batch(request: BatchForecastRequest):
+    """
+    Input: { wardIds: [...], horizon }
+    Output: one forecast per ward id, in input order.
+    """
+    return await forecast_executor.run(_forecast_batch, request.wardIds, request.horizon)
+
+
 @router.get("/{ward_id}", response_model=ForecastResponse)
-async def forecast(ward_id: str, horizon: int = 48):
+async def forecast(ward_id: str, horizon: int = Query(48, ge=1, le=config.FORECAST_MAX_HORIZON)):
     """
     Returns a 48-hour forecast.
     Uses Prophet if available, otherwise generates a synthetic trend.
+    Fitted models are kept per ward and only refit when new observations arrive.
+    """
+    return await forecast_executor.run(_forecast, ward_id, horizon)
+
+
+def _forecast(ward_id: str, horizon: int) -> ForecastResponse:
+    return _forecast_wards([ward_id], horizon, parallel=False)[0]
+
+
+def _forecast_batch(ward_ids: List[str], horizon: int) -> BatchForecastResponse:
+    return BatchForecastResponse(forecasts=_forecast_wards(ward_ids, horizon, parallel=True))
+
+
+def _forecast_wards(ward_ids: List[str], horizon: int, parallel: bool) -> List[ForecastResponse]:
+    """
+    Forecast every ward in ward_ids, in input order.
+    Current forecasts come from the store; the rest are split between Prophet
+    (long histories) and the seasonal model (short ones). With `parallel`,
+    Prophet fits run on the process pool.
     """
+    timer = StageTimer("forecast")
+    responses: Dict[str, ForecastResponse] = {}
+    prophet_jobs, seasonal_jobs = [], []
+
+    for ward_id in dict.fromkeys(ward_ids):
+        hours, y = _load_history(ward_id)
+        # History only changes when a new hourly observation lands
+        fingerprint = (int(hours[-1]), len(hours))
+
+        entry, current = forecast_store.get(ward_id, fingerprint)
+        if current:
+            cached = forecast_store.response(entry, horizon)
+            if cached is not None:
+                responses[ward_id] = cached
+                continue
+            if entry["model"] is not None:
+                # Same fit, new horizon — predict without refitting
+                try:
+                    result = predict_prophet(entry["model"], int(hours[-1]), horizon)
+                    responses[ward_id] = forecast_store.keep_response(
+                        entry, horizon, _to_response(ward_id, horizon, result, "prophet"))
+                    continue
+                except Exception:
+                    pass
+
+        job = (ward_id, fingerprint, hours, y, entry)
+        if np.count_nonzero(~np.isnan(y)) < config.FORECAST_SEASONAL_MAX_HOURS:
+            seasonal_jobs.append(job)
+        else:
+            prophet_jobs.append(job)
+    timer.lap("history")
+
+    # ── Seasonal model: every short-history ward in one vectorized pass ─────
+    if seasonal_jobs:
+        result = seasonal_forecast([job[3] for job in seasonal_jobs], horizon)
+        steps = 1 + np.arange(horizon, dtype=np.int64)
+        for k, (ward_id, fingerprint, hours, _, _) in enumerate(seasonal_jobs):
+            response = _to_response(ward_id, horizon, {
+                "hours": hours[-1] + steps,
+                "yhat": result["yhat"][k],
+                "lower": result["lower"][k],
+                "upper": result["upper"][k],
+            }, "seasonal")
+            entry = forecast_store.put(ward_id, fingerprint, None, None)
+            responses[ward_id] = forecast_store.keep_response(entry, horizon, response)
+        timer.lap("seasonal")
+
+    # ── Prophet: one fit per ward, warm-started from its previous fit ───────
+    if prophet_jobs:
+        for job, result in zip(prophet_jobs, _run_prophet(prophet_jobs, horizon, parallel)):
+            ward_id, fingerprint = job[0], job[1]
+            if result is None:
+                # Prophet missing or the fit failed
+                response = _synthetic_forecast(ward_id, horizon)
+                if config.FORECAST_SYNTHETIC_DETERMINISTIC:
+                    # Same answer until the history changes — serve repeats from the store
+                    entry = forecast_store.put(ward_id, fingerprint, None, None)
+                    forecast_store.keep_response(entry, horizon, response)
+                responses[ward_id] = response
+                continue
+            response = _to_response(ward_id, horizon, result, "prophet")
+            entry = forecast_store.put(ward_id, fingerprint, result["model"], result["params"])
+            responses[ward_id] = forecast_store.keep_response(entry, horizon, response)
+        timer.lap("prophet")
+
+    timer.finish()
+    return [responses[ward_id] for ward_id in ward_ids]
+
+
+def _run_prophet(jobs: list, horizon: int, parallel: bool) -> List[Optional[dict]]:
+    """Prophet results per job, or None where Prophet is unavailable or the fit failed."""
     try:
-        from prophet import Prophet
-
-        # In production: load real historical data from DB via backend call
-        # For now: generate synthetic historical data to demo Prophet
-        now = datetime.utcnow()
-        dates = [now - timedelta(hours=i) for i in range(30 * 24, 0, -1)]
-        values = [
-            20 + 5 * np.sin(i * 2 * np.pi / 24) +  # daily cycle
-            2 * np.sin(i * 2 * np.pi / (24 * 7)) +  # weekly cycle
-            np.random.normal(0, 2)
-            for i in range(len(dates))
-        ]
-
-        df = pd.DataFrame({"ds": dates, "y": values})
-        model = Prophet(
-            daily_seasonality=True,
-            weekly_seasonality=True,
-            changepoint_prior_scale=0.05,
-        )
-        model.fit(df)
-
-        future = model.make_future_dataframe(periods=horizon, freq="H")
-        forecast_df = model.predict(future)
-        future_only = forecast_df.tail(horizon)
-
-        points = []
-        for _, row in future_only.iterrows():
-            admissions = max(0, row["yhat"])
-            # Risk score: normalize admissions to 0-100 scale
-            risk = min(100, max(0, (admissions / 40) * 100))
-            points.append(ForecastPoint(
-                time=row["ds"].strftime("%H:%M"),
-                riskScore=round(risk, 1),
-                admissions=round(admissions, 1),
-                lower=round(max(0, row["yhat_lower"]), 1),
-                upper=round(row["yhat_upper"], 1),
-            ))
-
-        return ForecastResponse(wardId=ward_id, horizon=horizon, points=points, source="prophet")
-
-    except ImportError:
-        # Prophet not installed — return synthetic trend
-        return _synthetic_forecast(ward_id, horizon)
+        import prophet  # noqa: F401
     except Exception:
-        return _synthetic_forecast(ward_id, horizon)
+        return [None] * len(jobs)
+
+    args = [
+        (hours, y, horizon, entry["params"] if entry is not None else None)
+        for _, _, hours, y, entry in jobs
+    ]
+
+    if parallel and len(jobs) > 1:
+        # Models stay in the workers; only forecasts and warm-start params come back
+        try:
+            futures = [forecast_process_pool().submit(fit_prophet, *a) for a in args]
+        except BrokenProcessPool:
+            reset_forecast_process_pool()
+            return [None] * len(jobs)
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                reset_forecast_process_pool()
+                results.append(None)
+            except Exception:
+                results.append(None)
+        return results
+
+    results = []
+    for a in args:
+        try:
+            results.append(fit_prophet(*a, keep_model=True))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def _to_response(ward_id: str, horizon: int, result: dict, source: str) -> ForecastResponse:
+    """Build a ForecastResponse from forecast arrays { hours, yhat, lower, upper }."""
+    admissions = np.maximum(result["yhat"], 0)
+    # Risk score: normalize admissions to 0-100 scale
+    risk = np.clip((admissions / 40) * 100, 0, 100)
+    minutes = (np.asarray(result["hours"]) % 24) * 60
+    points = _points(minutes, risk, admissions, np.maximum(result["lower"], 0), result["upper"])
+    return ForecastResponse(wardId=ward_id, horizon=horizon, points=points, source=source)
+
+
+def _points(minutes, risk, admissions, lower, upper) -> List[ForecastPoint]:
+    """ForecastPoints from per-hour arrays; `minutes` is minute of day (UTC)."""
+    return [
+        ForecastPoint.model_construct(time=t, riskScore=r, admissions=a, lower=lo, upper=up)
+        for t, r, a, lo, up in zip(
+            _HHMM[np.asarray(minutes) % (24 * 60)].tolist(),
+            np.round(risk, 1).tolist(),
+            np.round(admissions, 1).tolist(),
+            np.round(lower, 1).tolist(),
+            np.round(upper, 1).tolist(),
+        )
+    ]
+
+
+def _load_history(ward_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hourly admission history for a ward as (epoch hours, counts), oldest first.
+    Uses ingested history when the ward has enough of it; otherwise synthetic
+    history with daily + weekly cycles, anchored to the current hour and seeded
+    per ward and hour so it only changes when a new hour's observation "arrives".
+    """
+    stored = history_store.get(ward_id)
+    if stored is not None:
+        start, counts = stored
+        offset = max(0, len(counts) - HISTORY_HOURS)
+        counts = counts[offset:]
+        if np.count_nonzero(~np.isnan(counts)) >= config.HISTORY_MIN_HOURS:
+            hours = start + offset + np.arange(len(counts), dtype=np.int64)
+            return hours, counts.astype(np.float64)
+
+    end_hour = _epoch_hour(datetime.now(timezone.utc))
+    seed = zlib.crc32(f"{ward_id}:{end_hour}".encode())
+    i = np.arange(HISTORY_HOURS)
+    values = (
+        20 + 5 * np.sin(i * 2 * np.pi / 24) +   # daily cycle
+        2 * np.sin(i * 2 * np.pi / (24 * 7)) +  # weekly cycle
+        np.random.default_rng(seed).normal(0, 2, HISTORY_HOURS)
+    )
+    return end_hour - HISTORY_HOURS + i.astype(np.int64), values
+
+
+def _epoch_hour(t: datetime) -> int:
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return int(t.timestamp() // 3600)
 
 
 def _synthetic_forecast(ward_id: str, horizon: int) -> ForecastResponse:
-    """Synthetic fallback forecast when Prophet is unavailable."""
-    now = datetime.utcnow()
-    points = []
-    for i in range(horizon):
-        t = now + timedelta(hours=i)
-        admissions = 15 + 5 * np.sin(i * 2 * np.pi / 24) + np.random.normal(0, 1.5)
-        admissions = max(0, admissions)
-        # Simulate escalating risk in later hours
-        trend = 1 + (i / horizon) * 0.8
-        risk = min(100, (admissions / 40) * 100 * trend)
-        points.append(ForecastPoint(
-            time=t.strftime("%H:%M"),
-            riskScore=round(risk, 1),
-            admissions=round(admissions, 1),
-            lower=round(max(0, admissions - 3), 1),
-            upper=round(admissions + 3, 1),
-        ))
+    """
+    Synthetic fallback forecast when Prophet is unavailable.
+    The whole horizon is generated as arrays. In deterministic mode the noise
+    is seeded by ward and hour and the points start on the hour, so repeat
+    calls within the hour are identical.
+    """
+    now = datetime.now(timezone.utc)
+    if config.FORECAST_SYNTHETIC_DETERMINISTIC:
+        rng = np.random.default_rng(zlib.crc32(f"{ward_id}:{_epoch_hour(now)}:synthetic".encode()))
+        start_minute = now.hour * 60
+    else:
+        rng = np.random.default_rng()
+        start_minute = now.hour * 60 + now.minute
+
+    i = np.arange(horizon)
+    admissions = np.maximum(0, 15 + 5 * np.sin(i * 2 * np.pi / 24) + rng.normal(0, 1.5, horizon))
+    # Simulate escalating risk in later hours
+    trend = 1 + (i / horizon) * 0.8
+    risk = np.minimum(100, (admissions / 40) * 100 * trend)
+
+    points = _points(start_minute + i * 60, risk, admissions, np.maximum(0, admissions - 3), admissions + 3)
     return ForecastResponse(wardId=ward_id, horizon=horizon, points=points, source="synthetic")
@@ -1,5 +1,25 @@
+"""
+GET /health
+Service status — never triggers a model load, so it answers immediately.
+
+GET /health/live
+Liveness probe: the process is up and serving.
+
+GET /health/ready
+Readiness probe: 200 once models and explainers are warm, 503 before.
+"""
+
 from fastapi import APIRouter
-from app.models.loader import get_models
+from fastapi.responses import JSONResponse
+from app import config
+from app.models.loader import loaded_models, model_registry, warm_status
+from app.services.executor import inference_executor, forecast_executor
+from app.services.forecast_store import forecast_store
+from app.services.history_store import history_store
+from app.services.spatial_index import ward_index
+from app.services.prediction_cache import prediction_cache
+from app.services.online_anomaly import online_detector
+from app.routes.predict import predict_batcher
 import os
 
 router = APIRouter()
@@ -7,10 +27,40 @@ router = APIRouter()
 
 @router.get("/health")
 async def health():
-    models = get_models()
+    models = loaded_models()
     return {
         "status": "ok",
         "service": "kavach-ml",
+        "ready": _is_ready(),
+        "warmUp": warm_status(),
         "modelsLoaded": bool(models),
         "models": list(models.keys()) if models else [],
+        "modelRegistry": model_registry.stats(),
+        "executors": {
+            "inference": inference_executor.stats(),
+            "forecast": forecast_executor.stats(),
+        },
+        "forecastCache": forecast_store.stats(),
+        "history": history_store.stats(),
+        "hotspotIndex": ward_index.stats(),
+        "predictCache": prediction_cache.stats(),
+        "onlineAnomaly": online_detector.stats(),
+        "predictBatcher": predict_batcher.stats() if predict_batcher else None,
     }
+
+
+@router.get("/health/live")
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def ready():
+    status = warm_status()
+    if not _is_ready():
+        return JSONResponse(status_code=503, content={"status": "warming", "warmUp": status})
+    return {"status": "ready", "warmUp": status}
+
+
+def _is_ready() -> bool:
+    return warm_status()["state"] == "ready" or not config.WARMUP_ON_STARTUP
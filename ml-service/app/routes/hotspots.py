@@ -2,14 +2,46 @@
 GET /hotspots
 DBSCAN-based geo-clustering of high-risk wards.
 Returns GeoJSON FeatureCollection for Mapbox hotspot circles.
+
+PUT /hotspots/wards, POST /hotspots/scores, GET /hotspots
+Incremental mode: ward coordinates are registered once into a persistent
+spatial index; afterwards only wardId → riskScore updates are sent and the
+clusters are recomputed (or served from cache) from the index.
+
+POST /hotspots/stream
+National-scale mode: takes wards as parallel arrays and streams the
+FeatureCollection back in chunks instead of materializing it.
+
+Request bodies may also be MessagePack or Arrow IPC, and POST /hotspots
+answers in either when Accept asks for it (see wire.py).
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
+import json
 import numpy as np
 
-router = APIRouter()
+from app.services.executor import inference_executor
+from app.services.metrics import StageTimer
+from app.services.wire import WireRoute, read_payload, respond
+from app.services.spatial_index import (
+    ward_index, aggregate_clusters, summarize_clusters, iter_cluster_features, EPS_RAD, HIGH_RISK
+)
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+STREAM_CHUNK = 1000  # features serialized per streamed chunk
+
+router = APIRouter(route_class=WireRoute)
 
 
 class HotspotFeature(BaseModel):
@@ -24,14 +56,134 @@ class HotspotResponse(BaseModel):
     clusterCount: int
 
 
+class WardLocation(BaseModel):
+    wardId: str
+    name: Optional[str] = None
+    latitude: float
+    longitude: float
+
+
+class WardIndexResponse(BaseModel):
+    wards: int
+
+
+@router.put("/wards", response_model=WardIndexResponse)
+async def register_wards(wards: List[WardLocation]):
+    """
+    Input: list of { wardId, name, latitude, longitude }
+    Rebuilds the ward spatial index. Only needed when wards change.
+    """
+    records = [w.model_dump() for w in wards]
+    return WardIndexResponse(wards=await inference_executor.run(ward_index.register, records))
+
+
+@router.post("/scores", response_model=HotspotResponse)
+async def update_scores(scores: Dict[str, float]):
+    """
+    Input: { wardId: riskScore } for wards whose score changed
+    Output: current hotspots over the indexed wards
+    """
+    def run():
+        ward_index.update_scores(scores)
+        return ward_index.hotspots()
+
+    return _to_response(await inference_executor.run(run))
+
+
+@router.get("", response_model=HotspotResponse)
+async def current_hotspots():
+    """Current hotspots over the indexed wards (cached until a score changes)."""
+    return _to_response(await inference_executor.run(ward_index.hotspots))
+
+
+@router.post("/stream")
+async def stream_hotspots(request: Request, wardNames: bool = Query(True)):
+    """
+    Input: { wardIds: [...], latitude: [...], longitude: [...], riskScore: [...], names?: [...] }
+    Output: the same GeoJSON FeatureCollection as POST /hotspots, streamed.
+    Set wardNames=false to drop the per-cluster ward name lists.
+    """
+    try:
+        payload = await read_payload(request, _loads)
+    except ValueError as err:
+        raise HTTPException(status_code=422, detail=f"Invalid columnar ward payload: {err}")
+    columns = _parse_columns(payload)
+    summary, names = await inference_executor.run(_cluster_columns, columns)
+    return StreamingResponse(_stream_geojson(summary, names, wardNames), media_type="application/json")
+
+
+def _parse_columns(payload: dict) -> dict:
+    """Validate a columnar ward payload into NumPy arrays (422 on bad input)."""
+    try:
+        ids = payload["wardIds"]
+        columns = {
+            "wardIds": ids,
+            "names": payload.get("names") or ids,
+            "latitude": np.asarray(payload["latitude"], dtype=np.float64),
+            "longitude": np.asarray(payload["longitude"], dtype=np.float64),
+            "riskScore": np.asarray(payload["riskScore"], dtype=np.float64),
+        }
+    except (ValueError, TypeError, KeyError, AttributeError) as err:
+        raise HTTPException(status_code=422, detail=f"Invalid columnar ward payload: {err}")
+    if not all(len(columns[k]) == len(ids) for k in ("names", "latitude", "longitude", "riskScore")):
+        raise HTTPException(status_code=422, detail="Columnar ward arrays must have equal lengths")
+    return columns
+
+
+def _cluster_columns(columns: dict):
+    """DBSCAN over the high-risk wards of a columnar payload → (summary, names)."""
+    from sklearn.cluster import DBSCAN
+
+    risk = np.nan_to_num(columns["riskScore"])
+    idx = np.flatnonzero(risk >= HIGH_RISK)
+    lat, lon = columns["latitude"][idx], columns["longitude"][idx]
+    if len(idx):
+        coords = np.radians(np.column_stack([lat, lon]))
+        labels = DBSCAN(eps=EPS_RAD, min_samples=1, metric="haversine").fit(coords).labels_
+    else:
+        labels = np.empty(0, dtype=np.int64)
+    names = columns["names"]
+    return summarize_clusters(labels, lat, lon, risk[idx]), [names[i] for i in idx.tolist()]
+
+
+def _stream_geojson(summary: dict, names: list, ward_names: bool) -> Iterator[bytes]:
+    """Serialize the FeatureCollection STREAM_CHUNK features at a time."""
+    total = len(summary["count"])
+    yield b'{"type":"FeatureCollection","features":['
+    for start in range(0, total, STREAM_CHUNK):
+        chunk = b",".join(
+            _dumps(f) for f in iter_cluster_features(
+                summary, names, start, min(start + STREAM_CHUNK, total), ward_names
+            )
+        )
+        yield (b"," + chunk) if start else chunk
+    yield b'],"clusterCount":' + str(total).encode() + b"}"
+
+
+def _to_response(result: dict) -> HotspotResponse:
+    return HotspotResponse(
+        type="FeatureCollection",
+        features=[HotspotFeature(**f) for f in result["features"]],
+        clusterCount=result["clusterCount"],
+    )
+
+
 @router.post("", response_model=HotspotResponse)
-async def compute_hotspots(wards: List[dict]):
+async def compute_hotspots(wards: List[dict], request: Request):
     """
     Input: list of ward objects with { wardId, latitude, longitude, riskScore }
     Output: GeoJSON FeatureCollection with hotspot cluster circles
+    (as Arrow, one row per cluster feature)
     """
+    result = await inference_executor.run(_compute_hotspots, wards)
+    return respond(request, result, lambda data: data["features"])
+
+
+def _compute_hotspots(wards: List[dict]) -> HotspotResponse:
+    timer = StageTimer("hotspots")
     # Filter to high-risk wards only (riskScore >= 0.6)
-    high_risk = [w for w in wards if (w.get("riskScore") or 0) >= 0.6]
+    high_risk = [w for w in wards if (w.get("riskScore") or 0) >= HIGH_RISK]
+    timer.lap("filter")
 
     if not high_risk:
         return HotspotResponse(type="FeatureCollection", features=[], clusterCount=0)
@@ -39,47 +191,25 @@ async def compute_hotspots(wards: List[dict]):
     try:
         from sklearn.cluster import DBSCAN
 
-        coords = np.array([[w["latitude"], w["longitude"]] for w in high_risk])
-
-        # DBSCAN: eps in degrees (~1km = 0.009 degrees), min_samples=1
-        db = DBSCAN(eps=0.015, min_samples=1, metric="haversine").fit(np.radians(coords))
-        labels = db.labels_
-
-        # Group wards by cluster
-        clusters = {}
-        for i, label in enumerate(labels):
-            if label == -1:
-                continue  # noise
-            clusters.setdefault(label, []).append(high_risk[i])
+        lat = np.array([w["latitude"] for w in high_risk], dtype=np.float64)
+        lon = np.array([w["longitude"] for w in high_risk], dtype=np.float64)
 
-        features = []
-        for label, cluster_wards in clusters.items():
-            avg_lat = np.mean([w["latitude"] for w in cluster_wards])
-            avg_lon = np.mean([w["longitude"] for w in cluster_wards])
-            max_risk = max(w.get("riskScore", 0) for w in cluster_wards)
-            ward_names = [w.get("name", w["wardId"]) for w in cluster_wards]
-
-            features.append(HotspotFeature(
-                type="Feature",
-                geometry={
-                    "type": "Point",
-                    "coordinates": [avg_lon, avg_lat],
-                },
-                properties={
-                    "clusterId": int(label),
-                    "wardCount": len(cluster_wards),
-                    "maxRiskScore": round(max_risk, 3),
-                    "wardNames": ward_names,
-                    "radius": 800 + len(cluster_wards) * 200,  # meters for Mapbox circle
-                    "severity": "CRITICAL" if max_risk >= 0.8 else "HIGH",
-                },
-            ))
+        # DBSCAN: eps in radians (haversine), min_samples=1
+        coords = np.radians(np.column_stack([lat, lon]))
+        labels = DBSCAN(eps=EPS_RAD, min_samples=1, metric="haversine").fit(coords).labels_
+        timer.lap("dbscan")
 
-        return HotspotResponse(
-            type="FeatureCollection",
-            features=features,
-            clusterCount=len(clusters),
+        # min_samples=1 means every ward is a core point — no noise labels
+        features = aggregate_clusters(
+            labels, lat, lon,
+            np.array([w.get("riskScore", 0) for w in high_risk], dtype=np.float64),
+            [w.get("name", w["wardId"]) for w in high_risk],
         )
+        timer.lap("aggregate")
+        response = _to_response({"features": features, "clusterCount": len(features)})
+        timer.lap("response")
+        timer.finish()
+        return response
 
     except ImportError:
         # sklearn not available — return each high-risk ward as its own hotspot
@@ -0,0 +1,70 @@
+"""
+GET /metrics
+Prometheus text exposition: per-stage latency histograms for predict,
+anomaly, forecast and hotspots, HTTP request latency by route, model load
+state, cache statistics and executor queue depth.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.models.loader import model_registry
+from app.services.executor import inference_executor, forecast_executor
+from app.services.forecast_store import forecast_store
+from app.services.prediction_cache import prediction_cache
+from app.services.online_anomaly import online_detector
+from app.services.metrics import stage_seconds, request_seconds, metric_lines
+from app.routes.predict import predict_batcher
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    lines = stage_seconds.render() + request_seconds.render()
+
+    # ── Models ────────────────────────────────────────────────────────────────
+    registry = model_registry.stats()
+    lines += metric_lines("kavach_model_loaded", "gauge", "1 if trained models are serving",
+                          {(): float(bool(model_registry.snapshot.models))})
+    lines += metric_lines("kavach_model_version", "gauge", "Model set version (bumps on every load)",
+                          {(): registry["version"]})
+    lines += metric_lines("kavach_model_load_seconds", "gauge", "Duration of the last successful model load",
+                          {(): registry["loadSeconds"] or 0.0})
+    lines += metric_lines("kavach_model_load_failures", "gauge", "Consecutive failed model loads",
+                          {(): registry["failures"]})
+
+    # ── Caches ────────────────────────────────────────────────────────────────
+    caches = {"prediction": prediction_cache.stats(), "forecast": forecast_store.stats()}
+    for key, kind, help in (
+        ("hits", "counter", "Cache hits"),
+        ("misses", "counter", "Cache misses"),
+        ("evictions", "counter", "Cache evictions"),
+        ("size", "gauge", "Cache entries"),
+    ):
+        lines += metric_lines(f"kavach_cache_{key}" + ("_total" if kind == "counter" else ""), kind, help,
+                              {(name,): s[key] for name, s in caches.items()}, ("cache",))
+
+    # ── Executors ─────────────────────────────────────────────────────────────
+    executors = {"inference": inference_executor.stats(), "forecast": forecast_executor.stats()}
+    lines += metric_lines("kavach_executor_in_flight", "gauge", "Calls running or queued",
+                          {(n,): s["inFlight"] for n, s in executors.items()}, ("executor",))
+    lines += metric_lines("kavach_executor_queued", "gauge", "Calls waiting for a worker",
+                          {(n,): s["queued"] for n, s in executors.items()}, ("executor",))
+    lines += metric_lines("kavach_executor_rejected_total", "counter", "Calls rejected with 503",
+                          {(n,): s["rejected"] for n, s in executors.items()}, ("executor",))
+
+    if predict_batcher is not None:
+        batcher = predict_batcher.stats()
+        lines += metric_lines("kavach_predict_batches_total", "counter", "Micro-batches scored",
+                              {(): batcher["batches"]})
+        lines += metric_lines("kavach_predict_batched_items_total", "counter", "Requests scored in micro-batches",
+                              {(): batcher["items"]})
+
+    anomaly = online_detector.stats()
+    lines += metric_lines("kavach_anomaly_stream_wards", "gauge", "Wards tracked by the online detector",
+                          {(): anomaly["wards"]})
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
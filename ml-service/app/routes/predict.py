@@ -1,84 +1,279 @@
 """
 POST /predict
-Main prediction endpoint — runs XGBoost + SHAP + Outbreak Reason Generator
+Main prediction endpoint — runs XGBoost + SHAP + Outbreak Reason Generator.
+Concurrent calls are micro-batched into one vectorized pass (see batcher.py).
+
+POST /predict/batch
+Scores many wards in one call — every model runs once over the (N, 22) matrix.
+Also speaks MessagePack and Arrow IPC (Content-Type / Accept, see wire.py).
 """
 
-from fastapi import APIRouter
-import shap
+from fastapi import APIRouter, Request
+from typing import List, Optional, Union
 import numpy as np
 
-from app.schemas.schemas import PredictRequest, PredictResponse, ShapReason
+from app.schemas.schemas import (
+    PredictRequest, PredictResponse, ShapReason, BatchPredictResponse, BatchPredictError, FeatureVector
+)
 from app.features.engineering import (
-    features_to_array, FEATURE_NAMES, FEATURE_LABELS, get_outbreak_category
+    features_to_array, features_matrix, FEATURE_NAMES, FEATURE_LABELS, get_outbreak_category
 )
-from app.features.reason_generator import generate_outbreak_reasons, shap_to_reasons
-from app.models.loader import get_models
+from app.features.reason_generator import generate_outbreak_reasons, outbreak_reasons_batch, shap_to_reasons
+from app.models.loader import ModelSnapshot, get_snapshot
+from app.services.inference import score_matrix
+from app.services.prediction_cache import prediction_cache
+from app.services.executor import inference_executor
+from app.services.batcher import MicroBatcher
+from app.services.metrics import StageTimer
+from app.services.wire import WireRoute, respond
+from app import config
 
-router = APIRouter()
+router = APIRouter(route_class=WireRoute)
 
 
 @router.post("", response_model=PredictResponse)
 async def predict(request: PredictRequest):
+    if predict_batcher is not None:
+        return await predict_batcher.submit(request)
+    return await inference_executor.run(_predict, request)
+
+
+def _predict(request: PredictRequest) -> PredictResponse:
+    timer = StageTimer("predict")
     features_dict = request.features.model_dump()
+    timer.lap("model_dump")
     X = features_to_array(features_dict)
+    timer.lap("features")
 
-    models = get_models()
+    snapshot = get_snapshot()
 
     # ── ML Inference ──────────────────────────────────────────────────────────
-    if models:
-        scaler = models["scaler"]
-        X_scaled = scaler.transform(X)
+    scores = _model_rows(snapshot, X, timer)[0] if snapshot.models else None
+    if isinstance(scores, Exception):
+        raise scores
+
+    response = _build_response(request, features_dict, X[0], scores, timer)
+    timer.finish()
+    return response
+
+
+@router.post("/batch", response_model=BatchPredictResponse)
+async def predict_batch(requests: List[PredictRequest], http_request: Request):
+    """
+    Input: list of PredictRequest objects
+    Output: one PredictResponse per request, in input order.
+    A request that fails is returned as null and listed in `errors`;
+    it never aborts the rest of the batch. As Arrow, one row per request
+    with an `error` column instead.
+    """
+    result = await inference_executor.run(_predict_batch, requests)
+    return respond(http_request, result, _batch_rows)
+
+
+def _batch_rows(data: dict) -> List[dict]:
+    errors = {e["index"]: e for e in data["errors"]}
+    return [
+        {**row, "error": None} if row is not None
+        else {"wardId": errors[i]["wardId"], "error": errors[i]["error"]}
+        for i, row in enumerate(data["results"])
+    ]
+
+
+def _predict_batch(requests: List[PredictRequest]) -> BatchPredictResponse:
+    results: List = [None] * len(requests)
+    errors: List[BatchPredictError] = []
+    for i, result in enumerate(_score_requests(requests)):
+        if isinstance(result, Exception):
+            errors.append(BatchPredictError(index=i, wardId=requests[i].wardId, error=str(result)))
+        else:
+            results[i] = result
+    return BatchPredictResponse(results=results, errors=errors)
+
+
+def _score_requests(requests: List[PredictRequest]) -> List[Union[PredictResponse, Exception]]:
+    """
+    Score many requests with one vectorized model pass.
+    Returns one PredictResponse per request, in order, or the Exception that
+    request failed with.
+    """
+    results: List = [None] * len(requests)
+    timer = StageTimer("predict")
+
+    # ── Feature matrix (straight from the validated models) ───────────────────
+    X = features_matrix([req.features for req in requests])
+    finite = np.isfinite(X).all(axis=1)
+    timer.lap("features")
+
+    ok = []
+    for i, req in enumerate(requests):
+        if not finite[i]:
+            results[i] = ValueError("features contain NaN or infinite values")
+            continue
+        ok.append(i)
+
+    if not ok:
+        return results
+
+    if len(ok) < len(requests):
+        X = X[ok]
+    snapshot = get_snapshot()
 
-        # Risk score (0–1)
-        risk_score = float(np.clip(models["regressor"].predict(X_scaled)[0], 0, 1))
+    # ── ML Inference (one vectorized pass) ────────────────────────────────────
+    if snapshot.models:
+        per_row = _model_rows(snapshot, X, timer)
+    else:
+        per_row = _fallback_rows([requests[i].features for i in ok])
+        timer.lap("fallback")
+
+    # ── Outbreak reasons (every rule as one mask over the batch) ─────────────
+    # Reasons and the outbreak category read the models directly (no model_dump)
+    reasons = outbreak_reasons_batch([requests[i].features for i in ok])
+    timer.lap("reasons")
+
+    # ── Per-ward responses ────────────────────────────────────────────────────
+    for j, i in enumerate(ok):
+        try:
+            if isinstance(per_row[j], Exception):
+                raise per_row[j]
+            results[i] = _build_response(
+                requests[i], requests[i].features, X[j], per_row[j], timer, reasons[j]
+            )
+        except Exception as err:
+            results[i] = err
+
+    timer.finish()
+    return results
+
+
+def _model_rows(snapshot: ModelSnapshot, X: np.ndarray, timer: StageTimer) -> List[Union[dict, Exception]]:
+    """
+    Model outputs for every row of X, served from the prediction cache where
+    possible. Only the misses go through score_matrix; a row that breaks a
+    model call carries its exception. Everything comes from one snapshot, so
+    a concurrent reload never mixes model sets within a request.
+    """
+    models, explainer = snapshot.models, snapshot.explainer
+    rows: List = [None] * len(X)
+    keys, missing = [], []
+    if prediction_cache.enabled:
+        keys = [prediction_cache.key(x, snapshot.version) for x in X]
+        for j, key in enumerate(keys):
+            rows[j] = prediction_cache.get(key)
+            if rows[j] is None:
+                missing.append(j)
+    else:
+        missing = list(range(len(X)))
+    timer.lap("cache")
+
+    if not missing:
+        return rows
+
+    try:
+        scored = _split_scores(score_matrix(models, X[missing], explainer, timer))
+    except Exception:
+        # Something in the matrix broke a model call — score row by row so
+        # only the offending wards fail
+        scored = [_score_row(models, explainer, X[j]) for j in missing]
 
-        # Anomaly detection
-        iso_score = models["iso_forest"].decision_function(X_scaled)[0]
-        is_anomaly = bool(models["iso_forest"].predict(X_scaled)[0] == -1)
+    for j, row in zip(missing, scored):
+        rows[j] = row
+        if keys and not isinstance(row, Exception):
+            prediction_cache.put(keys[j], row)
+    timer.lap("cache")
+    return rows
 
-        # SHAP explainability
-        explainer = shap.TreeExplainer(models["classifier"])
-        shap_values = explainer.shap_values(X_scaled)
 
-        # For binary classifier shap_values may be list[2]; take class-1 values
-        sv = shap_values[1] if isinstance(shap_values, list) else shap_values
-        sv_flat = sv[0].tolist()
+def _fallback_rows(features: List[FeatureVector]) -> List[dict]:
+    """Rule-based scores for many wards in one vectorized pass (no models loaded)."""
+    from app.services.fallback import rule_based_scores
+    scores = rule_based_scores(features_matrix(features, dtype=np.float64))
+    return [
+        {"riskScore": round(risk, 3), "isAnomaly": anomaly, "confidence": scores["confidence"], "source": "fallback"}
+        for risk, anomaly in zip(scores["riskScore"].tolist(), scores["isAnomaly"].tolist())
+    ]
+
+
+def _split_scores(scores: dict) -> List[dict]:
+    """score_matrix output → one dict of Python scalars (+ SHAP row) per row."""
+    return [
+        {
+            "riskScore": float(scores["riskScore"][i]),
+            "confidence": float(scores["confidence"][i]),
+            "isAnomaly": bool(scores["isAnomaly"][i]),
+            "shap": scores["shap"][i].tolist(),
+            "top": scores["topFeatures"][i].tolist(),
+        }
+        for i in range(len(scores["riskScore"]))
+    ]
+
+
+def _score_row(models: dict, explainer, row: np.ndarray):
+    """Single-row fallback for score_matrix; a failed row returns its exception."""
+    try:
+        return _split_scores(score_matrix(models, row.reshape(1, -1), explainer))[0]
+    except Exception as err:
+        return err
+
+
+def _build_response(
+    request: PredictRequest, features: Union[dict, FeatureVector], x: np.ndarray, scores: Optional[dict],
+    timer: StageTimer, rule_reasons: Optional[List[str]] = None,
+) -> PredictResponse:
+    """
+    Turn one row of model output (None → rule-based fallback) into a
+    PredictResponse. `features` is the request's feature dict or its
+    FeatureVector itself; `scores` may also be a precomputed fallback row
+    (see _fallback_rows) and `rule_reasons` the ward's precomputed outbreak
+    reasons (see outbreak_reasons_batch).
+    """
+    if scores is not None and scores.get("source") != "fallback":
+        risk_score = scores["riskScore"]
+        is_anomaly = scores["isAnomaly"]
+        confidence = scores["confidence"]
+        sv_flat = scores["shap"]
+        top = scores["top"]     # feature indices ranked by |SHAP|
 
         # Build ShapReason objects
         shap_reasons = []
-        paired = sorted(zip(FEATURE_NAMES, sv_flat), key=lambda x: abs(x[1]), reverse=True)
-        for feat, impact in paired[:5]:
+        for idx in top[:5]:
+            impact = sv_flat[idx]
             shap_reasons.append(ShapReason(
-                feature=feat,
-                value=float(X[0][FEATURE_NAMES.index(feat)]),
+                feature=FEATURE_NAMES[idx],
+                value=float(x[idx]),
                 impact=round(impact, 4),
                 direction="increases" if impact > 0 else "decreases",
             ))
 
         # SHAP-derived text reasons (top 3)
-        shap_text = shap_to_reasons(sv_flat, FEATURE_NAMES, FEATURE_LABELS)
-        confidence = float(models["classifier"].predict_proba(X_scaled)[0][1])
+        shap_text = shap_to_reasons(sv_flat, FEATURE_NAMES, FEATURE_LABELS, top)
         source = "ml"
+        timer.lap("explanations")
 
     else:
-        # Fallback: rule-based scoring
-        from app.services.fallback import rule_based_predict
-        result = rule_based_predict(features_dict)
+        # Fallback: rule-based scoring (batches pass it in precomputed)
+        result = scores
+        if result is None:
+            from app.services.fallback import rule_based_predict
+            result = rule_based_predict(features if isinstance(features, dict) else features.model_dump())
         risk_score = result["riskScore"]
         is_anomaly = result["isAnomaly"]
         confidence = result["confidence"]
         shap_reasons = []
         shap_text = []
         source = "fallback"
+        timer.lap("fallback")
 
     # ── Outbreak Category from syndrome breakdown ─────────────────────────────
-    outbreak_category = get_outbreak_category(features_dict.get("syndromeBreakdown", {}))
+    breakdown = features.get("syndromeBreakdown", {}) if isinstance(features, dict) else features.syndromeBreakdown
+    outbreak_category = get_outbreak_category(breakdown)
 
     # ── Outbreak Reason Generator (AI Insight Box) ────────────────────────────
-    rule_reasons = generate_outbreak_reasons(features_dict)
+    if rule_reasons is None:
+        rule_reasons = generate_outbreak_reasons(features)
     all_reasons = rule_reasons + shap_text  # rule-based first, SHAP enriches
+    timer.lap("reasons")
 
-    return PredictResponse(
+    response = PredictResponse(
         wardId=request.wardId,
         riskScore=round(risk_score, 3),
         outbreakCategory=outbreak_category,
@@ -89,3 +284,12 @@ async def predict(request: PredictRequest):
         outbreakReasons=all_reasons,
         source=source,
     )
+    timer.lap("response")
+    return response
+
+
+predict_batcher = MicroBatcher(
+    "predict", _score_requests, inference_executor,
+    max_size=config.PREDICT_BATCH_MAX_SIZE,
+    max_wait_ms=config.PREDICT_BATCH_MAX_WAIT_MS,
+) if config.PREDICT_BATCH_MAX_WAIT_MS > 0 else None
@@ -0,0 +1,56 @@
+"""
+GET /admin/profiles
+Profiles captured by the request profiler, newest first.
+
+GET /admin/profiles/{profileId}
+A pstats text report of one profile (?sort=cumulative|tottime|ncalls,
+?limit=N), or the raw pstats file with ?format=raw for snakeviz / pstats.
+
+Only mounted when PROFILING_ENABLED and PROFILE_HEADER_TOKEN are both set;
+every request must carry `Authorization: Bearer <PROFILE_HEADER_TOKEN>`.
+"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app import config
+from app.services.profiler import SORT_KEYS, profile_store
+
+
+def require_admin_token(authorization: str = Header("")):
+    scheme, _, token = authorization.partition(" ")
+    expected = config.PROFILE_HEADER_TOKEN
+    if not expected or scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="admin token required",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.get("")
+async def list_profiles():
+    return {"profiles": profile_store.list()}
+
+
+@router.get("/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("text", pattern="^(text|raw)$"),
+    sort: str = Query("cumulative", pattern=f"^({'|'.join(SORT_KEYS)})$"),
+    limit: int = Query(40, ge=1, le=1000),
+):
+    if format == "raw":
+        path = profile_store.path(profile_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail=f"profile {profile_id} not found")
+        return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+    report = profile_store.report(profile_id, sort, limit)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"profile {profile_id} not found")
+    meta = profile_store.meta(profile_id) or {}
+    header = " ".join(f"{k}={meta[k]}" for k in ("method", "path", "status", "durationMs") if k in meta)
+    return PlainTextResponse(f"{header}\n{report}")
@@ -71,3 +71,14 @@ class AnomalyResponse(BaseModel):
     isAnomaly: bool
     anomalyScore: float
     anomalyFeatures: list[str]
+
+
+class BatchPredictError(BaseModel):
+    index: int
+    wardId: str
+    error: str
+
+
+class BatchPredictResponse(BaseModel):
+    results: list[Optional[PredictResponse]]  # input order; null where the item failed
+    errors: list[BatchPredictError] = []
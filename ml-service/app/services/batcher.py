@@ -0,0 +1,102 @@
+"""
+Dynamic micro-batching for single-item requests.
+
+Concurrent callers submit one item each; the batcher holds them for at most
+`max_wait_ms` (or until `max_size` items are waiting), runs one batch
+function over all of them on an executor, and hands each caller its own
+result. The batch function returns one result per item, in order; an
+Exception in that list is raised to that caller only. In-flight batches are
+tracked so `stop()` can wait for them at shutdown.
+"""
+
+import asyncio
+import time
+from typing import Callable, List
+
+from app.services.profiler import active_profile, use_profile
+
+
+class MicroBatcher:
+    def __init__(self, name: str, process_batch: Callable[[list], List], executor,
+                 max_size: int, max_wait_ms: float):
+        self.name = name
+        self.process_batch = process_batch
+        self.executor = executor
+        self.max_size = max(1, max_size)
+        self.max_wait_s = max_wait_ms / 1000
+        self._pending = []          # (item, future, enqueued_at, profile); event loop thread only
+        self._timer = None
+        self._tasks = set()         # running _run tasks, kept alive until done
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.queued_s_total = 0.0
+        self.queued_s_max = 0.0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter(), active_profile()))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def stop(self):
+        """Run whatever is still queued and wait for every in-flight batch."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, batch: list):
+        started = time.perf_counter()
+        for _, _, enqueued_at, _ in batch:
+            queued = started - enqueued_at
+            self.queued_s_total += queued
+            self.queued_s_max = max(self.queued_s_max, queued)
+        self.batches += 1
+        self.items += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+
+        # A profiled caller gets the profile of the whole batch it rode in
+        use_profile(next((p for _, _, _, p in batch if p is not None), None))
+        try:
+            results = await self.executor.run(self.process_batch, [item for item, _, _, _ in batch])
+        except Exception as err:
+            for _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, future, _, _), result in zip(batch, results):
+            if future.done():       # caller went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "maxSize": self.max_size,
+            "maxWaitMs": self.max_wait_s * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "avgBatchSize": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "maxBatchSize": self.max_batch_size,
+            "avgQueuedMs": round(self.queued_s_total / self.items * 1000, 3) if self.items else 0.0,
+            "maxQueuedMs": round(self.queued_s_max * 1000, 3),
+        }
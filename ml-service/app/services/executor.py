@@ -0,0 +1,105 @@
+"""
+Bounded executors for blocking model work.
+
+XGBoost, IsolationForest, SHAP and Prophet are synchronous and CPU-bound.
+Routes await them through an executor so the event loop keeps serving
+/health and other requests while they run. Each executor admits at most
+`workers + queue_limit` jobs; beyond that the request is rejected with a
+503 and a Retry-After hint instead of queueing without bound.
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException
+
+from app import config
+from app.services.profiler import profiled
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, workers: int, queue_limit: int):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"kavach-{name}")
+        self._in_flight = 0   # only touched from the event loop thread
+        self._rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool and await its result."""
+        if self._in_flight >= self.workers + self.queue_limit:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.name} queue is full, retry shortly",
+                headers={"Retry-After": str(config.EXECUTOR_RETRY_AFTER_S)},
+            )
+
+        # Carry context variables into the worker thread
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, profiled(fn), *args, **kwargs)
+
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queueLimit": self.queue_limit,
+            "inFlight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = BoundedExecutor(
+    "inference", config.INFERENCE_WORKERS, config.INFERENCE_QUEUE_LIMIT
+)
+forecast_executor = BoundedExecutor(
+    "forecast", config.FORECAST_WORKERS, config.FORECAST_QUEUE_LIMIT
+)
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def forecast_process_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for CPU-bound Prophet fits in /forecast/batch, created on
+    first use. Uses spawn so workers never inherit the server's threads.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=config.FORECAST_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def reset_forecast_process_pool():
+    """Drop a broken process pool (e.g. a worker was OOM-killed); the next call makes a new one."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    forecast_executor.shutdown()
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
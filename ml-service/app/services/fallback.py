@@ -1,26 +1,38 @@
-"""Rule-based fallback when ML models are not yet trained."""
+"""
+Rule-based fallback when ML models are not yet trained.
+Scores with the same weighted rules that label the training data
+(app/features/risk_score.py), one feature dict or a whole feature matrix.
+"""
+
+import numpy as np
 
 from app.features.engineering import get_outbreak_category
+from app.features.risk_score import (
+    ANOMALY_THRESHOLD, FALLBACK_CONFIDENCE, RISK_TERMS, weighted_risk, weighted_risk_matrix
+)
 
 
 def rule_based_predict(features: dict) -> dict:
-    chlorine_drop = features.get("chlorineDropRatio", 0)
-    syndrome_spike = features.get("syndromeSpike48h", 0)
-    lag_rainfall = features.get("lagRainfall1d", 0)
-    citizen_cluster = features.get("citizenClusterCount", 0)
-    turbidity = features.get("currentTurbidity", 0)
-
-    score = min(1.0,
-        chlorine_drop * 0.35 +
-        min(syndrome_spike / 5, 1) * 0.30 +
-        min(lag_rainfall / 50, 1) * 0.15 +
-        min(citizen_cluster / 20, 1) * 0.10 +
-        min(turbidity / 10, 1) * 0.10
-    )
+    score = min(1.0, float(weighted_risk({name: features.get(name, 0) for name, _, _ in RISK_TERMS})))
 
     return {
         "riskScore": round(score, 3),
         "outbreakCategory": get_outbreak_category(features.get("syndromeBreakdown", {})),
-        "confidence": 0.6,
-        "isAnomaly": score > 0.7,
+        "confidence": FALLBACK_CONFIDENCE,
+        "isAnomaly": score > ANOMALY_THRESHOLD,
+    }
+
+
+def rule_based_scores(X: np.ndarray) -> dict:
+    """
+    Vectorized rule_based_predict over an (N, 22) float64 feature matrix
+    (features_matrix(..., dtype=np.float64)): riskScore (unrounded — round
+    each with Python's round() to match rule_based_predict) and isAnomaly
+    arrays. Row i matches rule_based_predict on the same features.
+    """
+    score = np.fmin(weighted_risk_matrix(X), 1.0)       # fmin: NaN → 1.0, like min(1.0, nan)
+    return {
+        "riskScore": score,
+        "isAnomaly": score > ANOMALY_THRESHOLD,
+        "confidence": FALLBACK_CONFIDENCE,
     }
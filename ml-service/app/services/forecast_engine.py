@@ -0,0 +1,97 @@
+"""
+Forecast engine — the model side of /forecast, free of request handling.
+
+Every function works on plain NumPy arrays of hourly history (epoch hours +
+admission counts) and returns arrays, so Prophet fits can be shipped to a
+process pool and the seasonal model can forecast many wards in one pass.
+"""
+
+import warnings
+from typing import List, Optional
+
+import numpy as np
+
+# Prophet's default interval_width is 0.8 — match it for the seasonal bands
+_Z_80 = 1.2816
+
+
+def fit_prophet(hours: np.ndarray, y: np.ndarray, horizon: int,
+                init: Optional[dict] = None, keep_model: bool = False) -> dict:
+    """
+    Fit Prophet on one ward's history and forecast `horizon` hours ahead.
+    Top-level and array-in / array-out so it can run in a worker process.
+    Returns { hours, yhat, lower, upper, params, model (if keep_model) }.
+    """
+    import pandas as pd
+    from prophet import Prophet
+
+    df = pd.DataFrame({"ds": pd.to_datetime(hours * 3600, unit="s"), "y": y})
+    model = Prophet(
+        daily_seasonality=True,
+        weekly_seasonality=True,
+        changepoint_prior_scale=0.05,
+    )
+    if init:
+        model.fit(df, init=init)
+    else:
+        model.fit(df)
+
+    result = predict_prophet(model, int(hours[-1]), horizon)
+    result["params"] = warm_start_params(model)
+    result["model"] = model if keep_model else None
+    return result
+
+
+def predict_prophet(model, last_hour: int, horizon: int) -> dict:
+    """Forecast `horizon` hours after `last_hour` with an already fitted model."""
+    import pandas as pd
+
+    future_hours = last_hour + 1 + np.arange(horizon, dtype=np.int64)
+    future = pd.DataFrame({"ds": pd.to_datetime(future_hours * 3600, unit="s")})
+    forecast_df = model.predict(future)
+    return {
+        "hours": future_hours,
+        "yhat": forecast_df["yhat"].to_numpy(),
+        "lower": forecast_df["yhat_lower"].to_numpy(),
+        "upper": forecast_df["yhat_upper"].to_numpy(),
+    }
+
+
+def warm_start_params(model) -> Optional[dict]:
+    """Fitted Stan parameters in the shape Prophet.fit(init=...) expects."""
+    try:
+        params = {name: float(model.params[name][0][0]) for name in ("k", "m", "sigma_obs")}
+        for name in ("delta", "beta"):
+            params[name] = np.asarray(model.params[name][0])
+        return params
+    except (AttributeError, KeyError, IndexError, TypeError):
+        return None
+
+
+def seasonal_forecast(series: List[np.ndarray], horizon: int,
+                      season: int = 24, window_days: int = 7) -> dict:
+    """
+    Hour-of-day seasonal profile forecast for many wards at once.
+
+    Each ward's last `window_days` of history is right-aligned into one
+    (W, window_days * season) matrix; the forecast for every future hour is
+    the mean of past observations at the same phase, with an 80% band from
+    the residual spread. Missing phases fall back to the ward's mean.
+    Returns (W, horizon) arrays { yhat, lower, upper }.
+    """
+    length = window_days * season
+    Y = np.full((len(series), length), np.nan)
+    for i, y in enumerate(series):
+        tail = np.asarray(y, dtype=np.float64)[-length:]
+        Y[i, length - len(tail):] = tail
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)   # all-NaN slices
+        profile = np.nanmean(Y.reshape(len(series), window_days, season), axis=1)
+        level = np.nanmean(Y, axis=1, keepdims=True)
+        profile = np.nan_to_num(np.where(np.isnan(profile), level, profile))
+        sigma = np.nan_to_num(np.nanstd(Y - np.tile(profile, window_days), axis=1, keepdims=True))
+
+    # length is a whole number of seasons, so step h has phase h % season
+    yhat = profile[:, np.arange(horizon) % season]
+    return {"yhat": yhat, "lower": yhat - _Z_80 * sigma, "upper": yhat + _Z_80 * sigma}
@@ -0,0 +1,114 @@
+"""
+Forecast model store — fitted Prophet models and their predictions, per ward.
+
+A forecast only changes when new observations arrive, so each entry is keyed
+by a fingerprint of the ward's history. Repeat requests with the same
+fingerprint are served from the store; a changed fingerprint triggers a refit
+warm-started from the previous fit's parameters. Entries are LRU-bounded and
+expire after a TTL, and each keeps responses for at most `max_horizons`
+horizons (least recently used dropped first).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app import config
+
+
+class ForecastStore:
+    def __init__(self, max_entries: int, ttl_s: float, max_horizons: int):
+        self.max_entries = max_entries
+        self.max_horizons = max_horizons
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refits = 0
+
+    def get(self, ward_id: str, fingerprint) -> Tuple[Optional[dict], bool]:
+        """
+        Returns (entry, is_current). `entry` may be a stale fit (different
+        fingerprint) that is still useful as a warm start; only a current
+        entry counts as a hit.
+        """
+        with self._lock:
+            entry = self._entries.get(ward_id)
+            if entry is not None and time.monotonic() - entry["storedAt"] > self.ttl_s:
+                del self._entries[ward_id]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(ward_id)
+            if entry["fingerprint"] != fingerprint:
+                self.misses += 1
+                return entry, False
+            self.hits += 1
+            return entry, True
+
+    def put(self, ward_id: str, fingerprint, model, params: Optional[dict]) -> dict:
+        """Store a freshly fitted model; returns the new entry."""
+        entry = {
+            "fingerprint": fingerprint,
+            "model": model,
+            "params": params,         # warm-start init for the next refit
+            "responses": OrderedDict(),  # horizon -> ForecastResponse, LRU
+            "storedAt": time.monotonic(),
+        }
+        with self._lock:
+            if ward_id in self._entries:
+                self.refits += 1
+            self._entries[ward_id] = entry
+            self._entries.move_to_end(ward_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def response(self, entry: dict, horizon: int):
+        """The stored response for `horizon` on this entry, or None."""
+        with self._lock:
+            response = entry["responses"].get(horizon)
+            if response is not None:
+                entry["responses"].move_to_end(horizon)
+            return response
+
+    def keep_response(self, entry: dict, horizon: int, response):
+        """Store a response on the entry, dropping its least recently used horizons."""
+        with self._lock:
+            responses = entry["responses"]
+            responses[horizon] = response
+            responses.move_to_end(horizon)
+            while len(responses) > self.max_horizons:
+                responses.popitem(last=False)
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "maxEntries": self.max_entries,
+            "maxHorizons": self.max_horizons,
+            "ttlSeconds": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refits": self.refits,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+forecast_store = ForecastStore(
+    config.FORECAST_CACHE_MAX_WARDS, config.FORECAST_CACHE_TTL_S, config.FORECAST_CACHE_MAX_HORIZONS,
+)
@@ -0,0 +1,219 @@
+"""
+Admission history store — hourly admission counts per ward, for forecasting.
+
+Each ward is one dense float32 array of hourly counts plus the epoch hour of
+its first slot; missing hours are NaN (Prophet drops them). Writes are
+append-only: hours at or before a ward's last stored hour are dropped. Only
+the most recent `retention_hours` are kept.
+
+With a data directory configured, every ward is persisted as a raw float32
+file that is only ever appended to; index.json records each file's first
+epoch hour and its number of valid slots. A restart maps the last
+`retention_hours` slots read-only instead of re-ingesting. Once a file holds
+twice the retention window it is compacted to the window, written to a temp
+file and swapped in atomically, so ingest I/O stays proportional to the hours
+appended.
+
+Several worker processes can share one data directory: writers serialize on
+an flock()ed lock file and re-read index.json before applying their appends,
+the index is replaced atomically, and readers re-read it whenever it has
+changed on disk, so every worker forecasts from the latest hours.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app import config
+
+try:
+    import fcntl
+except ImportError:     # no flock: one process per data directory
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+
+class HistoryStore:
+    def __init__(self, data_dir: str, retention_hours: int):
+        self.data_dir = data_dir
+        self.retention_hours = retention_hours
+        self._series: Dict[str, Tuple[int, np.ndarray]] = {}   # wardId -> (start hour, counts)
+        self._files: Dict[str, dict] = {}   # wardId -> {file, start, length} on disk
+        self._index_stamp = None            # (inode, mtime, size) of the index last read
+        self._lock = threading.Lock()
+        if data_dir:
+            self._open_index()
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def get(self, ward_id: str) -> Optional[Tuple[int, np.ndarray]]:
+        """(first epoch hour, read-only float32 counts) for a ward, or None."""
+        with self._lock:
+            if self.data_dir:
+                self._refresh_index()
+            return self._load(ward_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            wards = set(self._series) | set(self._files)
+            hours = sum(len(v) for _, v in self._series.values())
+        return {"wards": len(wards), "hoursLoaded": hours, "retentionHours": self.retention_hours}
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append(self, ward_id: str, start_hour: int, counts) -> Tuple[int, int]:
+        """
+        Append hourly counts starting at epoch hour `start_hour`.
+        Returns (accepted, dropped); hours not after the stored tail are dropped.
+        """
+        return self.append_many([(ward_id, start_hour, counts)])
+
+    def append_many(self, series: Iterable[Tuple[str, int, object]]) -> Tuple[int, int]:
+        """Bulk append of (wardId, start hour, counts); the index is written once."""
+        accepted = dropped = 0
+        with self._lock, self._index_lock():
+            if self.data_dir:
+                # Another worker may have appended since this one last looked
+                self._refresh_index()
+            for ward_id, start_hour, counts in series:
+                a, d = self._append(ward_id, start_hour, np.asarray(counts, dtype=np.float32))
+                accepted += a
+                dropped += d
+            if self.data_dir:
+                self._write_index()
+        return accepted, dropped
+
+    def _append(self, ward_id: str, start_hour: int, counts: np.ndarray) -> Tuple[int, int]:
+        current = self._load(ward_id)
+        dropped = 0
+        tail = None     # hours to append to the ward's file; None rewrites it
+        if current is None:
+            if len(counts) == 0:
+                return 0, 0
+            start, values = start_hour, counts
+        else:
+            start, old = current
+            next_hour = start + len(old)
+            dropped = min(max(0, next_hour - start_hour), len(counts))
+            counts = counts[dropped:]
+            if len(counts) == 0:
+                return 0, dropped
+            gap = start_hour + dropped - next_hour
+            if gap >= self.retention_hours:
+                # Nothing stored survives the gap — start over from the new hours
+                start, values = start_hour + dropped, counts
+            else:
+                # Trim before concatenating, so the NaN gap is never larger
+                # than the retention window
+                keep = max(0, self.retention_hours - gap - len(counts))
+                old = old[len(old) - min(keep, len(old)):]
+                tail = np.concatenate([np.full(gap, np.nan, dtype=np.float32), counts])
+                start, values = next_hour - len(old), np.concatenate([old, tail])
+
+        # Bounded retention window
+        excess = len(values) - self.retention_hours
+        if excess > 0:
+            values = values[excess:]
+            start += excess
+
+        values = np.ascontiguousarray(values)
+        values.flags.writeable = False
+        self._series[ward_id] = (start, values)
+        if self.data_dir:
+            self._write_series(ward_id, start, values, tail)
+        return len(counts), dropped
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def _load(self, ward_id: str) -> Optional[Tuple[int, np.ndarray]]:
+        series = self._series.get(ward_id)
+        if series is None and ward_id in self._files:
+            meta = self._files[ward_id]
+            window = min(meta["length"], self.retention_hours)
+            skip = meta["length"] - window
+            values = np.memmap(os.path.join(self.data_dir, meta["file"]), dtype=np.float32,
+                               mode="r", offset=skip * 4, shape=(window,))
+            series = self._series[ward_id] = (meta["start"] + skip, values)
+        return series
+
+    def _open_index(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._refresh_index()
+        if self._files:
+            logger.info(f"📚 Admission history index loaded ({len(self._files)} wards)")
+
+    def _refresh_index(self):
+        """Re-read index.json if it changed on disk; wards whose entry changed are remapped."""
+        path = os.path.join(self.data_dir, INDEX_FILE)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stamp == self._index_stamp:
+            return
+        with open(path) as f:
+            files = json.load(f)
+        for ward_id, meta in files.items():
+            if self._files.get(ward_id) != meta:
+                self._series.pop(ward_id, None)
+        self._files = files
+        self._index_stamp = stamp
+
+    @contextmanager
+    def _index_lock(self):
+        """Exclusive across processes sharing the data directory (a no-op without one)."""
+        if not self.data_dir or fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.data_dir, LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write_series(self, ward_id: str, start: int, values: np.ndarray, tail: Optional[np.ndarray]):
+        """
+        Append `tail` to the ward's file, or rewrite the file as `values` (the
+        whole window) for a new ward, after a gap wider than the window, or
+        once the file holds twice the window.
+        """
+        meta = self._files.get(ward_id)
+        if meta is not None and tail is not None and meta["length"] + len(tail) <= 2 * self.retention_hours:
+            with open(os.path.join(self.data_dir, meta["file"]), "r+b") as f:
+                # Slots past the indexed length are left over from an
+                # interrupted write — overwrite them
+                f.seek(meta["length"] * 4)
+                f.write(tail.tobytes())
+                f.truncate()
+            meta["length"] += len(tail)
+            return
+
+        name = hashlib.sha1(ward_id.encode()).hexdigest()[:16] + ".f32"
+        path = os.path.join(self.data_dir, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(values.tobytes())
+        os.replace(path + ".tmp", path)   # existing mmaps keep the old inode
+        self._files[ward_id] = {"file": name, "start": int(start), "length": len(values)}
+
+    def _write_index(self):
+        path = os.path.join(self.data_dir, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self._files, f)
+        os.replace(path + ".tmp", path)
+        st = os.stat(path)
+        self._index_stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+history_store = HistoryStore(config.HISTORY_DIR, config.HISTORY_RETENTION_HOURS)
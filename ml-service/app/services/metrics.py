@@ -0,0 +1,151 @@
+"""
+Lightweight Prometheus metrics.
+
+No client library: histograms are fixed-bucket counters updated under a lock
+and rendered in the Prometheus text format by GET /metrics. Recording a
+stage costs one perf_counter() call and a dict update; a StageTimer flushes
+all of its stages to the histogram at once when the call finishes.
+
+Stage timings are per call of the instrumented function — a micro-batch for
+/predict, a whole request for /predict/batch and /forecast/batch.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+# Seconds; fine-grained at the low end, where most stages live
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}    # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def observe_many(self, items: Iterable[Tuple[tuple, float]]):
+        with self._lock:
+            for labels, value in items:
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+                series[bisect_left(self.buckets, value)] += 1
+                series[-2] += value
+                series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            braces = f"{{{base}}}" if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{braces} {series[-2]}")
+            lines.append(f"{self.name}_count{braces} {series[-1]}")
+        return lines
+
+
+class StageTimer:
+    """
+    Laps through the stages of one call:
+
+        timer = StageTimer("predict")
+        ...; timer.lap("features")
+        ...; timer.lap("scaler")
+        timer.finish()
+
+    Repeated laps of the same stage add up. finish() records every stage and
+    the call total.
+    """
+
+    __slots__ = ("endpoint", "start", "last", "stages")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.start = self.last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last
+        self.last = now
+
+    def finish(self):
+        total = time.perf_counter() - self.start
+        items = [((self.endpoint, stage), seconds) for stage, seconds in self.stages.items()]
+        items.append(((self.endpoint, "total"), total))
+        stage_seconds.observe_many(items)
+
+
+stage_seconds = Histogram(
+    "kavach_stage_seconds",
+    "Time spent in each stage of an instrumented call",
+    ("endpoint", "stage"),
+)
+request_seconds = Histogram(
+    "kavach_http_request_seconds",
+    "HTTP request latency including (de)serialization and validation",
+    ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request_seconds by route template (not raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            request_seconds.observe(
+                (scope["method"], getattr(route, "path", "unmatched"), str(status[0])),
+                time.perf_counter() - start,
+            )
+
+
+def metric_lines(name: str, kind: str, help: str, samples: Dict[tuple, float],
+                 labelnames: Tuple[str, ...] = ()) -> List[str]:
+    """Text-format lines for a gauge or counter with the given {labels: value} samples."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples.items():
+        base = ",".join(f'{k}="{v}"' for k, v in zip(labelnames, labels))
+        lines.append(f"{name}{{{base}}} {float(value)}" if base else f"{name} {float(value)}")
+    return lines
@@ -0,0 +1,170 @@
+"""
+Online per-ward anomaly detection.
+
+The IsolationForest behind POST /anomaly judges a feature vector against
+synthetic training data; it cannot tell that a ward has drifted from its own
+recent baseline. This detector keeps, for every ward and feature, an
+exponentially weighted location and mean absolute deviation, and scores each
+new observation by its robust z-score against them before folding it in.
+
+- O(1) per observation and feature; a bulk push is a handful of vectorized
+  NumPy ops over all wards in it.
+- Updates are winsorized at ±CLIP z, so one spike cannot drag the baseline.
+- State lives in (wards × features) arrays indexed by a wardId → row map,
+  grown by doubling up to `max_wards` rows. Past that the least recently
+  observed ward is evicted and its row reused, so clients sending ever-new
+  wardIds cannot grow memory without bound.
+- Scores are only reported after WARMUP observations of a ward.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+
+from app import config
+from app.features.engineering import FEATURE_NAMES
+
+MAD_TO_SIGMA = 1.2533   # σ / E|x - μ| for a normal distribution
+CLIP = 3.0              # winsorize updates at ±CLIP robust z
+# σ floor, so a feature that has been constant does not turn every later
+# change into an infinite z-score
+REL_SIGMA_FLOOR = 0.05
+ABS_SIGMA_FLOOR = 1e-3
+
+
+class OnlineAnomalyDetector:
+    def __init__(self, n_features: int, alpha: float, threshold: float, warmup: int, max_wards: int):
+        self.n_features = n_features
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.max_wards = max_wards
+        self._index: "OrderedDict[str, int]" = OrderedDict()    # wardId -> row, least recent first
+        self._mean = np.zeros((0, n_features))
+        self._mad = np.zeros((0, n_features))
+        self._count = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+        self.observations = 0
+        self.anomalies = 0
+        self.evictions = 0
+
+    def update(self, ward_ids: List[str], X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score each observation against its ward's baseline, then fold it in.
+        Observations of the same ward are applied in order.
+        Returns (score = max |z| over features, isAnomaly, z matrix).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.shape != (len(ward_ids), self.n_features):
+            raise ValueError(f"expected a ({len(ward_ids)}, {self.n_features}) observation matrix")
+        if len(ward_ids) > self.max_wards and len(set(ward_ids)) > self.max_wards:
+            raise ValueError(f"more than {self.max_wards} distinct wards in one update")
+        z = np.zeros_like(X)
+        warm = np.zeros(len(X), dtype=bool)
+
+        with self._lock:
+            rows = self._rows(ward_ids)
+            # Repeated wards are applied in rounds: round r holds every ward's
+            # r-th observation, so each round touches each ward at most once
+            order = np.argsort(rows, kind="stable")
+            sorted_rows = rows[order]
+            starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+            rank = np.empty(len(rows), dtype=np.int64)
+            rank[order] = np.arange(len(rows)) - np.repeat(starts, np.diff(np.r_[starts, len(rows)]))
+            for r in range(int(rank.max()) + 1 if len(rank) else 0):
+                sel = np.flatnonzero(rank == r)
+                z[sel], warm[sel] = self._step(rows[sel], X[sel])
+
+            score = np.where(warm, np.abs(z).max(axis=1, initial=0.0), 0.0)
+            is_anomaly = score > self.threshold
+            self.observations += len(X)
+            self.anomalies += int(is_anomaly.sum())
+        return score, is_anomaly, z
+
+    def _step(self, rows: np.ndarray, x: np.ndarray):
+        """One observation for each of `rows` (all distinct)."""
+        mean, mad, count = self._mean[rows], self._mad[rows], self._count[rows]
+        first = count == 0
+        sigma = np.maximum(np.maximum(mad * MAD_TO_SIGMA, REL_SIGMA_FLOOR * np.abs(mean)), ABS_SIGMA_FLOOR)
+        z = (x - mean) / sigma
+        warm = count >= self.warmup
+
+        # First observation seeds the baseline; later ones are winsorized
+        x_c = np.where(first[:, None], x, np.clip(x, mean - CLIP * sigma, mean + CLIP * sigma))
+        new_mean = np.where(first[:, None], x, mean + self.alpha * (x_c - mean))
+        new_mad = np.where(first[:, None], 0.0, mad + self.alpha * (np.abs(x_c - new_mean) - mad))
+        self._mean[rows], self._mad[rows], self._count[rows] = new_mean, new_mad, count + 1
+        return np.where(warm[:, None], z, 0.0), warm
+
+    def _rows(self, ward_ids: List[str]) -> np.ndarray:
+        """
+        Row of each ward, assigning rows to new wards. Every ward in the update
+        becomes most recently used, so with at most max_wards distinct wards
+        per update an eviction never hits one of them.
+        """
+        index = self._index
+        rows = np.empty(len(ward_ids), dtype=np.int64)
+        evicted = []
+        for i, ward in enumerate(ward_ids):
+            row = index.get(ward)
+            if row is not None:
+                index.move_to_end(ward)
+            elif len(index) < self.max_wards:
+                row = index[ward] = len(index)
+            else:
+                _, row = index.popitem(last=False)
+                index[ward] = row
+                evicted.append(row)
+            rows[i] = row
+        self._grow(len(index))
+        if evicted:
+            # The new ward starts from an empty baseline
+            self._mean[evicted] = 0.0
+            self._mad[evicted] = 0.0
+            self._count[evicted] = 0
+            self.evictions += len(evicted)
+        return rows
+
+    def _grow(self, n: int):
+        capacity = len(self._count)
+        if n <= capacity:
+            return
+        capacity = min(max(n, capacity * 2, 64), max(n, self.max_wards))
+        pad = capacity - len(self._count)
+        self._mean = np.vstack([self._mean, np.zeros((pad, self.n_features))])
+        self._mad = np.vstack([self._mad, np.zeros((pad, self.n_features))])
+        self._count = np.concatenate([self._count, np.zeros(pad, dtype=np.int64)])
+
+    def clear(self):
+        with self._lock:
+            self._index.clear()
+            self._mean = np.zeros((0, self.n_features))
+            self._mad = np.zeros((0, self.n_features))
+            self._count = np.zeros(0, dtype=np.int64)
+
+    def stats(self) -> dict:
+        with self._lock:
+            wards = len(self._index)
+            warm = int((self._count[:wards] >= self.warmup).sum())
+        return {
+            "wards": wards,
+            "warmWards": warm,
+            "observations": self.observations,
+            "anomalies": self.anomalies,
+            "maxWards": self.max_wards,
+            "evictions": self.evictions,
+            "alpha": self.alpha,
+            "threshold": self.threshold,
+            "warmup": self.warmup,
+        }
+
+
+online_detector = OnlineAnomalyDetector(
+    len(FEATURE_NAMES),
+    alpha=config.ANOMALY_STREAM_ALPHA,
+    threshold=config.ANOMALY_STREAM_THRESHOLD,
+    warmup=config.ANOMALY_STREAM_WARMUP,
+    max_wards=config.ANOMALY_STREAM_MAX_WARDS,
+)
@@ -0,0 +1,86 @@
+"""
+Prediction cache — model outputs per feature vector.
+
+A ward's features usually only change when the hourly aggregates do, so
+consecutive scheduler ticks keep sending the same vector. Each row of model
+output (risk, confidence, anomaly flag, SHAP values) is cached under a hash of
+the ordered FEATURE_NAMES vector plus the model version, so a reload never
+serves outputs from the previous models. Reasons and the outbreak category are
+still built per request — they read fields outside the model vector.
+Entries are LRU-bounded and expire after a TTL.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app import config
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int, ttl_s: float):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()   # key -> (row, storedAt)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(x: np.ndarray, version: int) -> bytes:
+        """Fingerprint of one feature row (float32, FEATURE_NAMES order) for a model version."""
+        h = hashlib.blake2b(np.ascontiguousarray(x, dtype=np.float32).tobytes(), digest_size=16)
+        h.update(version.to_bytes(8, "little"))
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_s:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, row: dict):
+        with self._lock:
+            self._entries[key] = (row, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "maxEntries": self.max_entries,
+            "ttlSeconds": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+prediction_cache = PredictionCache(config.PREDICT_CACHE_MAX_ENTRIES, config.PREDICT_CACHE_TTL_S)
@@ -0,0 +1,232 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it carries the profiling header (see
+PROFILE_HEADER_TOKEN) or is picked by PROFILE_SAMPLE_RATE. The slow parts of
+a request — XGBoost, SHAP, Prophet — run on the bounded executors, so the
+profile is taken there: the middleware marks the request's context, and
+BoundedExecutor.run wraps every call made from that context in a cProfile
+run on the worker thread. The event loop thread is not profiled, since it
+interleaves every other in-flight request. Prophet fits that /forecast/batch
+sends to the process pool are not captured either.
+
+Profiles are written as pstats files (readable with pstats or snakeviz) to
+a ring buffer of at most PROFILE_MAX_FILES files in PROFILE_DIR, with a JSON
+sidecar describing the request. Only one request is profiled at a time.
+
+With PROFILING_ENABLED off the middleware is not installed at all and the
+executor hook costs one ContextVar lookup per call.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-kavach-profile"
+PROFILE_ID_HEADER = b"x-kavach-profile-id"
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+_ID_RE = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+_active: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "kavach_profile", default=None
+)
+
+
+class RequestProfile:
+    """cProfile runs of every executor call made on behalf of one request."""
+
+    def __init__(self):
+        self.id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def runcall(self, fn, *args, **kwargs):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler owns this interpreter (3.12+ allows one at a time)
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.append(profile)
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+
+def profiled(fn):
+    """fn, wrapped to be profiled when the calling context is being profiled."""
+    profile = _active.get()
+    if profile is None:
+        return fn
+    return functools.partial(profile.runcall, fn)
+
+
+def active_profile() -> Optional[RequestProfile]:
+    return _active.get()
+
+
+def use_profile(profile: Optional[RequestProfile]):
+    """Profile executor calls made from the current context (e.g. a batch task) into `profile`."""
+    _active.set(profile)
+
+
+# ── Ring buffer ───────────────────────────────────────────────────────────────
+
+class ProfileStore:
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+
+    def save(self, profile: RequestProfile, meta: dict) -> bool:
+        stats = profile.stats()
+        if stats is None:
+            return False
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(self._path(profile.id, ".prof"))
+            with open(self._path(profile.id, ".json"), "w") as f:
+                json.dump({"id": profile.id, **meta}, f)
+            for old in self._ids()[:-self.max_files]:
+                for suffix in (".prof", ".json"):
+                    try:
+                        os.remove(self._path(old, suffix))
+                    except FileNotFoundError:
+                        pass
+        return True
+
+    def list(self) -> List[dict]:
+        """Stored profiles, newest first."""
+        entries = []
+        for profile_id in reversed(self._ids()):
+            meta = self.meta(profile_id)
+            if meta is not None:
+                entries.append(meta)
+        return entries
+
+    def meta(self, profile_id: str) -> Optional[dict]:
+        if not _ID_RE.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, ".json")) as f:
+                meta = json.load(f)
+            meta["sizeBytes"] = os.path.getsize(self._path(profile_id, ".prof"))
+        except (FileNotFoundError, ValueError):
+            return None
+        return meta
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """The .prof file for profile_id, or None if it is unknown (or has rotated out)."""
+        if not _ID_RE.match(profile_id):
+            return None
+        path = self._path(profile_id, ".prof")
+        return path if os.path.exists(path) else None
+
+    def report(self, profile_id: str, sort: str = "cumulative", limit: int = 40) -> Optional[str]:
+        """pstats text report of the top `limit` functions."""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        # Ids start with a millisecond timestamp, so name order is age order
+        return sorted(name[:-5] for name in names if name.endswith(".prof") and _ID_RE.match(name[:-5]))
+
+    def _path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, profile_id + suffix)
+
+
+profile_store = ProfileStore(config.PROFILE_DIR, config.PROFILE_MAX_FILES)
+
+
+# ── Middleware ────────────────────────────────────────────────────────────────
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests asking for it (header) or sampled
+    at `sample_rate`, and returns the profile id in X-Kavach-Profile-Id.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0, token: str = "", store: ProfileStore = profile_store):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token.encode()
+        self.store = store
+        self._busy = False      # event loop thread only
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy or not self._wanted(scope):
+            return await self.app(scope, receive, send)
+
+        self._busy = True
+        profile = RequestProfile()
+        reset = _active.set(profile)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, profile.id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active.reset(reset)
+            self._busy = False
+            route = scope.get("route")
+            meta = {
+                "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status[0],
+                "durationMs": round((time.perf_counter() - start) * 1000, 3),
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile, meta)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not save profile {profile.id}: {e}")
+
+    def _wanted(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return not self.token or value == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
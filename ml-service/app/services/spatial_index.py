@@ -0,0 +1,188 @@
+"""
+Ward spatial index for hotspot clustering.
+
+Ward coordinates rarely change, so the BallTree (haversine, on radians) and
+the eps-neighbour graph between wards are built once when wards are
+registered. Score updates then only decide which wards are high-risk:
+clusters are the connected components of the precomputed graph restricted
+to those wards — the same clusters DBSCAN(min_samples=1) finds, without
+re-running the neighbour search. Results are cached until a score changes,
+and labels are reused when the high-risk set itself is unchanged.
+"""
+
+import threading
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+EPS_RAD = 0.015        # DBSCAN eps on radians (haversine)
+HIGH_RISK = 0.6        # wards at or above this riskScore are clustered
+
+
+def cluster_labels(adjacency, mask: np.ndarray) -> np.ndarray:
+    """
+    Cluster labels for the wards selected by `mask`, from the full ward
+    adjacency matrix. Labels are numbered in order of each cluster's first
+    ward, matching DBSCAN's labelling.
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    idx = np.flatnonzero(mask)
+    sub = adjacency[idx][:, idx]
+    _, labels = connected_components(sub, directed=False)
+    return labels
+
+
+def summarize_clusters(labels: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+                       risk: np.ndarray) -> dict:
+    """
+    Per-cluster mean lat/lon, max risk and ward count as arrays, using
+    bincount-style grouping instead of per-cluster Python loops. `order`
+    sorts wards by cluster (stable) and `bounds` delimits each cluster in it.
+    """
+    counts = np.bincount(labels) if len(labels) else np.zeros(0, dtype=np.int64)
+    max_risk = np.full(len(counts), -np.inf)
+    np.maximum.at(max_risk, labels, risk)
+    return {
+        "count": counts,
+        "lat": np.bincount(labels, weights=lat, minlength=len(counts)) / np.maximum(counts, 1),
+        "lon": np.bincount(labels, weights=lon, minlength=len(counts)) / np.maximum(counts, 1),
+        "maxRisk": max_risk,
+        "order": np.argsort(labels, kind="stable"),
+        "bounds": np.concatenate([[0], np.cumsum(counts)]),
+    }
+
+
+def iter_cluster_features(summary: dict, names, start: int = 0, stop: Optional[int] = None,
+                          ward_names: bool = True) -> Iterator[dict]:
+    """
+    GeoJSON hotspot features for clusters [start, stop) of a summary, built
+    one at a time so large results can be streamed. `names` is indexed like
+    the clustered wards.
+    """
+    stop = len(summary["count"]) if stop is None else stop
+    order, bounds = summary["order"], summary["bounds"]
+    for label, count, la, lo, mr in zip(
+        range(start, stop),
+        summary["count"][start:stop].tolist(),
+        summary["lat"][start:stop].tolist(),
+        summary["lon"][start:stop].tolist(),
+        summary["maxRisk"][start:stop].tolist(),
+    ):
+        properties = {
+            "clusterId": label,
+            "wardCount": count,
+            "maxRiskScore": round(mr, 3),
+        }
+        if ward_names:
+            properties["wardNames"] = [names[i] for i in order[bounds[label]:bounds[label + 1]].tolist()]
+        properties["radius"] = 800 + count * 200  # meters for Mapbox circle
+        properties["severity"] = "CRITICAL" if mr >= 0.8 else "HIGH"
+        yield {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [lo, la],
+            },
+            "properties": properties,
+        }
+
+
+def aggregate_clusters(labels: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+                       risk: np.ndarray, names: List[str]) -> List[dict]:
+    """One GeoJSON hotspot feature per cluster label."""
+    return list(iter_cluster_features(summarize_clusters(labels, lat, lon, risk), names))
+
+
+class WardSpatialIndex:
+    def __init__(self, eps: float = EPS_RAD, threshold: float = HIGH_RISK):
+        self.eps = eps
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._risk = np.empty(0)
+        self._adjacency = None
+        self._mask: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._result: Optional[dict] = None
+
+    def register(self, wards: List[dict]) -> int:
+        """
+        (Re)build the index from { wardId, latitude, longitude, name? } records.
+        Scores of wards that were already registered are kept.
+        """
+        from sklearn.neighbors import BallTree
+        from scipy.sparse import csr_matrix
+
+        ids = [w["wardId"] for w in wards]
+        lat = np.array([w["latitude"] for w in wards], dtype=np.float64)
+        lon = np.array([w["longitude"] for w in wards], dtype=np.float64)
+        names = [w.get("name") or w["wardId"] for w in wards]
+
+        # eps-neighbour graph over all wards, computed once per registration
+        n = len(ids)
+        if n:
+            tree = BallTree(np.radians(np.column_stack([lat, lon])), metric="haversine")
+            neighbours = tree.query_radius(np.radians(np.column_stack([lat, lon])), r=self.eps)
+            rows = np.repeat(np.arange(n), [len(nb) for nb in neighbours])
+            cols = np.concatenate(neighbours)
+            adjacency = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        else:
+            adjacency = csr_matrix((0, 0), dtype=np.int8)
+
+        with self._lock:
+            old = dict(zip(self._ids, self._risk.tolist()))
+            self._ids, self._names = ids, names
+            self._pos = {ward_id: i for i, ward_id in enumerate(ids)}
+            self._lat, self._lon = lat, lon
+            self._risk = np.array([old.get(ward_id, 0.0) for ward_id in ids], dtype=np.float64)
+            self._adjacency = adjacency
+            self._mask = self._labels = self._result = None
+        return n
+
+    def update_scores(self, scores: Dict[str, float]) -> int:
+        """Apply wardId → riskScore updates; returns how many wards changed."""
+        with self._lock:
+            changed = 0
+            for ward_id, score in scores.items():
+                i = self._pos.get(ward_id)
+                if i is None:
+                    continue
+                score = float(score or 0)
+                if self._risk[i] != score:
+                    self._risk[i] = score
+                    changed += 1
+            if changed:
+                self._result = None
+            return changed
+
+    def hotspots(self) -> dict:
+        """Current hotspots as { features, clusterCount }, cached until scores change."""
+        with self._lock:
+            if self._result is not None:
+                return self._result
+
+            mask = self._risk >= self.threshold
+            if self._labels is None or self._mask is None or not np.array_equal(mask, self._mask):
+                # The high-risk set changed — re-label; otherwise reuse the clusters
+                self._labels = cluster_labels(self._adjacency, mask) if mask.any() else np.empty(0, dtype=np.int64)
+                self._mask = mask
+
+            idx = np.flatnonzero(mask)
+            features = aggregate_clusters(
+                self._labels, self._lat[idx], self._lon[idx], self._risk[idx],
+                [self._names[i] for i in idx],
+            )
+            self._result = {"features": features, "clusterCount": len(features)}
+            return self._result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"wards": len(self._ids), "highRisk": int((self._risk >= self.threshold).sum())}
+
+
+ward_index = WardSpatialIndex()
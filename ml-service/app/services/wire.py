@@ -0,0 +1,227 @@
+"""
+Wire formats for bulk scoring traffic.
+
+JSON stays the default. Routers built with `route_class=WireRoute` also
+accept MessagePack and Arrow IPC request bodies, picked by Content-Type:
+
+    application/json                        (default)
+    application/msgpack                     same structure as the JSON body
+    application/vnd.apache.arrow.stream     a table: one row per item for
+                                            list bodies, one column per
+                                            field for object bodies
+
+A binary body is decoded to the same Python structure FastAPI would get from
+JSON and handed to the route as if it had arrived as JSON, so validation,
+422 errors and the OpenAPI schema are exactly those of the JSON endpoint.
+JSON bodies on these routes are parsed with orjson where it can.
+Endpoints that pass their result through `respond()` answer in the format
+asked for by Accept (default: the request's format). msgpack and pyarrow are
+in requirements.txt but imported lazily; an install without them answers
+those content types with 415.
+"""
+
+from typing import Any, Callable, List, Optional, get_origin
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_MEDIA_TYPES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/vnd.apache.arrow.stream": ARROW,
+}
+_FORMAT_KEY = "kavach.wire_format"     # scope key: format the body arrived in
+
+
+# ── Negotiation ───────────────────────────────────────────────────────────────
+
+def _media_type(value: Optional[str]) -> str:
+    return (value or "").split(";", 1)[0].strip().lower()
+
+
+def request_format(request: Request) -> str:
+    """Format the body arrived in."""
+    return request.scope.get(_FORMAT_KEY) or _MEDIA_TYPES.get(_media_type(request.headers.get("content-type")), JSON)
+
+
+def response_format(request: Request) -> str:
+    """
+    Highest-q supported type in Accept. A missing Accept or a wildcard gets
+    the request's own format; a binary type whose library is missing falls
+    back to JSON.
+    """
+    default = request_format(request)
+    best, best_q = None, 0.0
+    for item in request.headers.get("accept", "").split(","):
+        media, *params = item.split(";")
+        media = media.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        fmt = default if media in ("*/*", "application/*") else _MEDIA_TYPES.get(media)
+        if fmt is not None and q > best_q:
+            best, best_q = fmt, q
+    fmt = best or default
+    return fmt if _available(fmt) else JSON
+
+
+def _available(fmt: str) -> bool:
+    try:
+        if fmt == MSGPACK:
+            import msgpack  # noqa: F401
+        elif fmt == ARROW:
+            import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ── Decoding ──────────────────────────────────────────────────────────────────
+
+def decode(body: bytes, fmt: str, rows: bool) -> Any:
+    """
+    Decode a MessagePack or Arrow IPC body. Arrow tables become a list of
+    row dicts when `rows` (list bodies) and a dict of columns otherwise;
+    Arrow nulls are dropped, so they take the field's default.
+    """
+    if not _available(fmt):
+        raise HTTPException(status_code=415, detail=f"{fmt} is not supported by this server")
+    try:
+        if fmt == MSGPACK:
+            import msgpack
+            return msgpack.unpackb(body, raw=False)
+
+        import pyarrow as pa
+        table = pa.ipc.open_stream(body).read_all()
+        if rows:
+            return [_drop_nulls(row) for row in table.to_pylist(maps_as_pydicts="strict")]
+        return {name: table.column(name).to_pylist(maps_as_pydicts="strict") for name in table.column_names}
+    except HTTPException:
+        raise
+    except Exception as err:
+        raise RequestValidationError([{
+            "type": "body_decode_error",
+            "loc": ("body",),
+            "msg": f"{fmt} decode error",
+            "input": {},
+            "ctx": {"error": str(err) or type(err).__name__},
+        }])
+
+
+def _drop_nulls(value):
+    if isinstance(value, dict):
+        return {k: _drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_nulls(v) for v in value]
+    return value
+
+
+class _DecodedRequest(Request):
+    """
+    The request with its binary body swapped for the decoded structure,
+    presented as JSON: body() returns the raw bytes, json() and
+    request.state.wire_payload the decoded payload.
+    """
+
+    def __init__(self, request: Request, body: bytes, payload: Any, fmt: str):
+        scope = dict(request.scope)
+        scope["headers"] = [(k, v) for k, v in request.scope["headers"] if k != b"content-type"]
+        scope["headers"].append((b"content-type", JSON.encode()))
+        scope[_FORMAT_KEY] = fmt
+        super().__init__(scope, request.receive)
+        self.wire_body = body
+        self.state.wire_payload = payload
+
+    async def body(self) -> bytes:
+        return self.wire_body
+
+    async def json(self) -> Any:
+        return self.state.wire_payload
+
+
+class WireRoute(APIRoute):
+    """APIRoute that also accepts MessagePack and Arrow IPC bodies."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        annotation = self.body_field.field_info.annotation if self.body_field else None
+        rows = get_origin(annotation) in (list, List)
+
+        async def wire_handler(request: Request) -> Response:
+            fmt = _MEDIA_TYPES.get(_media_type(request.headers.get("content-type")))
+            if fmt is None or (fmt == JSON and orjson is None):
+                return await handler(request)
+            body = await request.body()
+            if not body:
+                return await handler(request)
+            if fmt == JSON:
+                # orjson is several times faster than json.loads. Whatever it
+                # rejects (NaN/Infinity, lone surrogates, malformed bodies) goes
+                # to FastAPI's own parser, so results and errors are unchanged
+                try:
+                    payload = orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    return await handler(request)
+            else:
+                payload = decode(body, fmt, rows)
+            return await handler(_DecodedRequest(request, body, payload, fmt))
+
+        return wire_handler
+
+
+async def read_payload(request: Request, loads: Callable[[bytes], Any]) -> Any:
+    """For routes that parse their own body: the decoded structure of a binary body, else loads(body)."""
+    if _FORMAT_KEY in request.scope:
+        return request.state.wire_payload
+    return loads(await request.body())
+
+
+# ── Encoding ──────────────────────────────────────────────────────────────────
+
+def respond(request: Request, content: BaseModel, arrow_rows: Callable[[dict], list]):
+    """
+    `content` as-is for JSON (FastAPI serializes it through the route's
+    response_model), or encoded as MessagePack / an Arrow IPC stream of
+    `arrow_rows(content as dict)` when Accept asks for it.
+    """
+    fmt = response_format(request)
+    if fmt == JSON:
+        return content
+    data = content.model_dump()
+    if fmt == MSGPACK:
+        import msgpack
+        body = msgpack.packb(data, use_bin_type=True)
+    else:
+        body = arrow_stream(arrow_rows(data))
+    return Response(content=body, media_type=fmt, headers={"Vary": "Accept"})
+
+
+def arrow_stream(rows: List[dict]) -> bytes:
+    """Rows as one Arrow IPC stream; a key missing from a row is null there."""
+    import pyarrow as pa
+
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    table = pa.table({name: [row.get(name) for row in rows] for name in names})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,66 @@
+"""
+Benchmark: per-row latency of the sklearn backend vs the compiled backend
+(raw Booster inplace_predict, NumPy scaler, numba IsolationForest).
+
+Usage:
+    python -m benchmarks.bench_backends [--rows 500]
+
+Requires trained models (python -m app.models.train).
+"""
+
+import argparse
+import time
+import numpy as np
+
+from app.features.engineering import FEATURE_NAMES
+from app.models.compiled import compile_models
+from app.models.loader import get_models
+
+
+def _per_row_us(fn, rows: np.ndarray) -> float:
+    fn(rows[:1])  # warm-up (numba JIT, first-call allocations)
+    start = time.perf_counter()
+    for row in rows:
+        fn(row.reshape(1, -1))
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    reference = get_models()
+    if not reference:
+        raise SystemExit("Trained models not found. Run 'python -m app.models.train' first.")
+    if type(reference["regressor"]).__module__.startswith("app."):
+        raise SystemExit("Run with MODEL_FORMAT=pickle MODEL_BACKEND=sklearn so the reference models are loaded.")
+    compiled = compile_models(reference)
+
+    rng = np.random.default_rng(0)
+    scaler = reference["scaler"]
+    rows = np.abs(rng.normal(size=(args.rows, len(FEATURE_NAMES))) * scaler.scale_ + scaler.mean_)
+    rows = rows.astype(np.float32)
+    scaled = scaler.transform(rows)
+
+    stages = {
+        "scaler":     lambda m: (lambda X: m["scaler"].transform(X), rows),
+        "regressor":  lambda m: (lambda X: m["regressor"].predict(X), scaled),
+        "classifier": lambda m: (lambda X: m["classifier"].predict_proba(X), scaled),
+        "iso_forest": lambda m: (lambda X: m["iso_forest"].decision_function(X), scaled),
+    }
+
+    print(f"Per-row latency over {args.rows} single-row calls (µs)")
+    print(f"{'stage':<12} {'sklearn':>10} {'compiled':>10} {'speed-up':>9}")
+    total_ref = total_cmp = 0.0
+    for name, stage in stages.items():
+        ref = _per_row_us(*stage(reference))
+        cmp = _per_row_us(*stage(compiled))
+        total_ref += ref
+        total_cmp += cmp
+        print(f"{name:<12} {ref:>10.1f} {cmp:>10.1f} {ref / cmp:>8.1f}×")
+    print(f"{'total':<12} {total_ref:>10.1f} {total_cmp:>10.1f} {total_ref / total_cmp:>8.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: per-request /predict inference latency with a SHAP TreeExplainer
+rebuilt on every call (old behaviour) vs one built once and reused, as the
+loader caches it. Both rows use the shap backend whatever EXPLAINER_BACKEND
+says, so only the rebuild cost differs; bench_explainer_backends.py compares
+the shap and xgboost backends.
+
+Usage:
+    python -m benchmarks.bench_explainer [--requests 200]
+
+Requires trained models (python -m app.models.train).
+"""
+
+import argparse
+import time
+import numpy as np
+import shap
+
+from app.features.engineering import FEATURE_NAMES
+from app.models.explainers import build_explainer
+from app.models.loader import get_models
+from app.services.inference import score_matrix
+
+
+def _time_per_request(fn, rows: np.ndarray) -> np.ndarray:
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        fn(row.reshape(1, -1))
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def _report(name: str, ms: np.ndarray):
+    print(
+        f"{name:<22} mean {ms.mean():7.3f} ms   p50 {np.percentile(ms, 50):7.3f} ms   "
+        f"p99 {np.percentile(ms, 99):7.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    models = get_models()
+    if not models:
+        raise SystemExit("Trained models not found. Run 'python -m app.models.train' first.")
+
+    rng = np.random.default_rng(0)
+    rows = rng.normal(size=(args.requests, len(FEATURE_NAMES))).astype(np.float32)
+    rows = rows * models["scaler"].scale_ + models["scaler"].mean_
+
+    def rebuilt(X):
+        return score_matrix(models, X, explainer=shap.TreeExplainer(models["classifier"].get_booster()))
+
+    explainer = build_explainer(models["classifier"], "shap")
+
+    def cached(X):
+        return score_matrix(models, X, explainer=explainer)
+
+    # Warm both paths once so one-off import/JIT cost is not counted
+    rebuilt(rows[:1])
+    cached(rows[:1])
+
+    before = _time_per_request(rebuilt, rows)
+    after = _time_per_request(cached, rows)
+
+    print(f"Per-request inference latency over {args.requests} requests")
+    _report("rebuilt explainer", before)
+    _report("cached explainer", after)
+    print(f"speed-up (mean)        {before.mean() / after.mean():.1f}×")
+
+
+if __name__ == "__main__":
+    main()
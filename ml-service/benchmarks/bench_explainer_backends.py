@@ -0,0 +1,71 @@
+"""
+Benchmark + parity check: SHAP values from shap.TreeExplainer vs the
+booster's native pred_contribs (EXPLAINER_BACKEND=shap vs xgboost).
+
+Usage:
+    python -m benchmarks.bench_explainer_backends [--rows 2000] [--atol 1e-6]
+
+Exits non-zero if the backends disagree by more than --atol on any value or
+rank the top features differently. Requires trained models.
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+
+from app.features.engineering import FEATURE_NAMES
+from app.models.explainers import build_explainer
+from app.models.loader import get_models
+from app.services.inference import TOP_FEATURES, top_k_indices
+
+
+def _timed(fn, *args, repeat: int = 1):
+    fn(*args)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(*args)
+    return out, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--atol", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    models = get_models()
+    if not models:
+        raise SystemExit("Trained models not found. Run 'python -m app.models.train' first.")
+
+    scaler = models["scaler"]
+    rng = np.random.default_rng(0)
+    rows = rng.normal(size=(args.rows, len(FEATURE_NAMES))) * scaler.scale_ * 3 + scaler.mean_
+    X = scaler.transform(np.abs(rows).astype(np.float32))
+
+    reference = build_explainer(models["classifier"], "shap")
+    native = build_explainer(models["classifier"], "xgboost")
+
+    expected, ref_batch = _timed(reference.shap_values, X)
+    actual, nat_batch = _timed(native.shap_values, X)
+    _, ref_row = _timed(reference.shap_values, X[:1], repeat=200)
+    _, nat_row = _timed(native.shap_values, X[:1], repeat=200)
+
+    diff = float(np.abs(np.asarray(expected) - actual).max())
+    same_top = np.array_equal(
+        top_k_indices(np.asarray(expected), TOP_FEATURES), top_k_indices(actual, TOP_FEATURES)
+    )
+
+    print(f"{'backend':<10} {'batch of ' + str(args.rows):>16} {'single row':>12}")
+    print(f"{'shap':<10} {ref_batch * 1e3:>13.2f} ms {ref_row * 1e3:>9.3f} ms")
+    print(f"{'xgboost':<10} {nat_batch * 1e3:>13.2f} ms {nat_row * 1e3:>9.3f} ms")
+    print(f"max |Δ| {diff:.3g}   bit-identical {np.array_equal(expected, actual)}   same top-{TOP_FEATURES} {same_top}")
+
+    if diff > args.atol or not same_top:
+        print("❌ explainer backends disagree")
+        sys.exit(1)
+    print("✅ explainer backends agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark + parity check: rule_based_predict() per ward vs one
+rule_based_scores() call over a float64 feature matrix.
+
+Usage:
+    python -m benchmarks.bench_fallback [--rows 100000]
+
+Exits non-zero if any ward's riskScore or isAnomaly differs.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.features.engineering import features_matrix
+from app.services.fallback import rule_based_predict, rule_based_scores
+from benchmarks.loadtest import feature_vector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dicts = [feature_vector(rng) for _ in range(args.rows)]
+    # Caps and the 1.0 ceiling: exactly on, above and far above
+    for i, v in enumerate((0, 5, 10, 20, 50, 1e6, 2.5)):
+        dicts[i].update(chlorineDropRatio=v / 10, syndromeSpike48h=v, lagRainfall1d=v,
+                        citizenClusterCount=int(v), currentTurbidity=v)
+
+    start = time.perf_counter()
+    expected = [rule_based_predict(d) for d in dicts]
+    per_ward = time.perf_counter() - start
+
+    start = time.perf_counter()
+    X = features_matrix(dicts, dtype=np.float64)
+    gather = time.perf_counter() - start
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        scores = rule_based_scores(X)
+        best = min(best, time.perf_counter() - start)
+
+    n = len(dicts)
+    print(f"{n} wards")
+    print(f"{'path':<32} {'total':>10} {'per ward':>10}")
+    print(f"{'rule_based_predict per ward':<32} {per_ward * 1e3:>7.2f} ms {per_ward / n * 1e6:>7.3f} µs")
+    print(f"{'features_matrix (float64)':<32} {gather * 1e3:>7.2f} ms {gather / n * 1e6:>7.3f} µs")
+    print(f"{'rule_based_scores':<32} {best * 1e3:>7.2f} ms {best / n * 1e6:>7.3f} µs")
+
+    same = all(
+        e["riskScore"] == round(risk, 3) and e["isAnomaly"] == anomaly and e["confidence"] == scores["confidence"]
+        for e, risk, anomaly in zip(expected, scores["riskScore"].tolist(), scores["isAnomaly"].tolist())
+    )
+    if not same:
+        print("❌ rule_based_scores differs from rule_based_predict")
+        sys.exit(1)
+    print("✅ rule_based_scores matches rule_based_predict")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark + parity check: per-request model_dump() + features_to_array()
+vs one features_matrix() call over a batch of FeatureVector models.
+
+Usage:
+    python -m benchmarks.bench_features [--rows 5000]
+
+Exits non-zero if any row of the feature matrix differs bit for bit.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.features.engineering import features_matrix, features_to_array
+from app.schemas.schemas import FeatureVector
+from benchmarks.loadtest import feature_vector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dicts = [feature_vector(rng) for _ in range(args.rows)]
+    dicts[0]["syndromeBreakdown"] = {}                      # total falls back to 1
+    dicts[1]["syndromeBreakdown"]["HEADACHE"] = 4           # counted in the total only
+    models = [FeatureVector(**d) for d in dicts]
+
+    start = time.perf_counter()
+    expected = np.vstack([features_to_array(m.model_dump()) for m in models])
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = features_matrix(models)
+    batched = time.perf_counter() - start
+
+    from_dicts = features_matrix([m.model_dump() for m in models])
+
+    print(f"{'path':<32} {'total':>10} {'per row':>10}")
+    print(f"{'model_dump + features_to_array':<32} {per_row * 1e3:>7.2f} ms {per_row / args.rows * 1e6:>7.2f} µs")
+    print(f"{'features_matrix':<32} {batched * 1e3:>7.2f} ms {batched / args.rows * 1e6:>7.2f} µs")
+
+    same = expected.tobytes() == actual.tobytes() == from_dicts.tobytes()
+    if not same:
+        print("❌ features_matrix differs from features_to_array")
+        sys.exit(1)
+    print("✅ features_matrix is bit-identical to features_to_array")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark + parity check: the masked reason table vs the hand-written
+if/elif generator it replaced — one outbreak_reasons_batch call over a batch
+of dicts or FeatureVector models vs one call per ward.
+
+Usage:
+    python -m benchmarks.bench_reasons [--rows 5000]
+
+Rows follow the load-test distributions, plus edge cases on every rule
+threshold. The reference is the frozen generator in
+tests/test_reason_generator.py. Exits non-zero if any ward's reasons differ
+from it.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.features.reason_generator import generate_outbreak_reasons, outbreak_reasons_batch
+from app.schemas.schemas import FeatureVector
+from benchmarks.loadtest import feature_vector
+from tests.test_reason_generator import EDGES, reference_reasons
+
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    models = [FeatureVector(**d) for d in EDGES] + [FeatureVector(**feature_vector(rng)) for _ in range(args.rows)]
+    dicts = [m.model_dump() for m in models]
+    raw = EDGES + [feature_vector(rng) for _ in range(1000)]     # missing keys → the generator's defaults
+    n = len(models)
+
+    timings = [
+        ("reference (dict)", _best(lambda: [reference_reasons(d) for d in dicts])),
+        ("model_dump + reference", _best(lambda: [reference_reasons(m.model_dump()) for m in models])),
+        ("batch (dict)", _best(lambda: outbreak_reasons_batch(dicts))),
+        ("batch (FeatureVector)", _best(lambda: outbreak_reasons_batch(models))),
+        ("per ward (FeatureVector)", _best(lambda: [generate_outbreak_reasons(m) for m in models[:500]]) * n / 500),
+    ]
+    print(f"{n} wards, {sum(len(reference_reasons(d)) for d in dicts) / n:.2f} reasons per ward")
+    print(f"{'path':<28} {'total':>10} {'per ward':>10}")
+    for name, seconds in timings:
+        print(f"{name:<28} {seconds * 1e3:>7.2f} ms {seconds / n * 1e6:>7.2f} µs")
+
+    expected = [reference_reasons(d) for d in dicts]
+    same = (
+        outbreak_reasons_batch(dicts) == expected
+        and outbreak_reasons_batch(models) == expected
+        and [generate_outbreak_reasons(m) for m in models[:500]] == expected[:500]
+        and outbreak_reasons_batch(raw) == [reference_reasons(d) for d in raw]
+    )
+    if not same:
+        print("❌ rule table differs from the reference generator")
+        sys.exit(1)
+    print("✅ rule table matches the reference generator")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: cold-start time of the ML service — `import main` in a fresh
+interpreter, then a real uvicorn process timed until /health/live answers,
+/health/ready flips and the first /predict succeeds.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 3] [--port 8765]
+
+Set WARMUP_ON_STARTUP=false to compare against lazy loading on first request.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOAD = {
+    "wardId": "bench",
+    "features": {
+        "totalAdmissions7d": 120, "totalAdmissions48h": 40, "dailyAvg7d": 17,
+        "syndromeSpike48h": 2.4, "syndromeBreakdown": {"DIARRHEA": 18, "FEVER": 9},
+        "chlorineDropRatio": 0.6, "currentChlorine": 0.2, "currentTurbidity": 6.5,
+        "lagRainfall1d": 45, "avgRainfall7d": 12, "rainfallSpike": True,
+        "citizenClusterCount": 7, "citizenSeverityScore": 3.5,
+    },
+}
+
+
+def _import_seconds() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def _serve_timings(port: int, timeout_s: float = 120.0) -> dict:
+    """Seconds from process start to live / ready / first successful /predict."""
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    timings = {}
+    try:
+        with httpx.Client(timeout=timeout_s) as client:
+            checks = [
+                ("live", lambda: client.get(f"{base}/health/live")),
+                ("ready", lambda: client.get(f"{base}/health/ready")),
+                ("firstPredict", lambda: client.post(f"{base}/predict", json=PAYLOAD)),
+            ]
+            for name, call in checks:
+                while name not in timings:
+                    if time.perf_counter() - start > timeout_s:
+                        raise TimeoutError(f"{name} not reached within {timeout_s}s")
+                    try:
+                        if call().status_code == 200:
+                            timings[name] = time.perf_counter() - start
+                            continue
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    imports = [_import_seconds() for _ in range(args.runs)]
+    serves = [_serve_timings(args.port) for _ in range(args.runs)]
+
+    print(f"Cold start over {args.runs} runs (seconds, median / max)")
+    rows = [("import main", imports)] + [
+        (f"→ {name}", [s[name] for s in serves]) for name in ("live", "ready", "firstPredict")
+    ]
+    for name, values in rows:
+        print(f"{name:<16} {np.median(values):7.3f} {max(values):7.3f}")
+
+
+if __name__ == "__main__":
+    main()
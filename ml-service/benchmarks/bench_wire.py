@@ -0,0 +1,141 @@
+"""
+Benchmark + parity check: POST /predict/batch, /anomaly/stream and /hotspots
+over JSON, MessagePack and Arrow IPC.
+
+Usage:
+    python -m benchmarks.bench_wire [--wards 1000] [--repeat 5]
+
+Runs in-process through the full ASGI stack (httpx ASGI transport) and
+reports the best of --repeat runs. For /predict/batch the wire cost per ward
+is the request time minus a direct _predict_batch call on the same (cached)
+input. Exits non-zero if a binary response decodes to anything other than
+the JSON response. Requires msgpack and pyarrow.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+import msgpack
+import numpy as np
+import pyarrow as pa
+
+from main import app
+from app.features.engineering import FEATURE_NAMES
+from app.routes.predict import _predict_batch
+from app.schemas.schemas import PredictRequest
+from app.services.wire import ARROW, JSON, MSGPACK, arrow_stream
+from benchmarks.loadtest import hotspot_wards, predict_request
+
+FORMATS = (JSON, MSGPACK, ARROW)
+
+
+def _encode(payload, fmt: str) -> bytes:
+    if fmt == JSON:
+        return json.dumps(payload).encode()
+    if fmt == MSGPACK:
+        return msgpack.packb(payload)
+    if isinstance(payload, dict):       # object body → one column per field
+        return arrow_stream([dict(zip(payload, values)) for values in zip(*payload.values())])
+    return arrow_stream(payload)
+
+
+def _decode(body: bytes, fmt: str):
+    if fmt == JSON:
+        return json.loads(body)
+    if fmt == MSGPACK:
+        return msgpack.unpackb(body)
+    return pa.ipc.open_stream(body).read_all().to_pylist()
+
+
+def _best(fn, repeat: int) -> float:
+    fn()    # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def _timed_post(client: httpx.AsyncClient, path: str, body: bytes, fmt: str, repeat: int):
+    headers = {"content-type": fmt, "accept": fmt}
+    response = await client.post(path, content=body, headers=headers)     # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.post(path, content=body, headers=headers)
+        best = min(best, time.perf_counter() - start)
+    response.raise_for_status()
+    return response.content, best
+
+
+def _same_rows(reference: list, result, fmt: str, rows_of) -> bool:
+    if fmt != ARROW:
+        return rows_of(result) == reference
+    # Arrow: one row per item, every column present; failed items are rows
+    # with an error and nulls
+    expected = [r if r is not None else {} for r in reference]
+    got = [{k: v for k, v in row.items() if k in e} for row, e in zip(result, expected)]
+    return len(result) == len(reference) and got == expected
+
+
+async def run(args) -> bool:
+    rng = np.random.default_rng(0)
+    # Plain floats, as a JSON client would send them
+    predict = json.loads(json.dumps([predict_request(rng) for _ in range(args.wards)]))
+    observations = {
+        "wardIds": [f"ward-{i}" for i in range(args.wards)],
+        "values": rng.random((args.wards, len(FEATURE_NAMES))).tolist(),
+    }
+    endpoints = [
+        ("/predict/batch", predict, lambda d: d["results"]),
+        ("/anomaly/stream", observations, lambda d: d["results"]),
+        ("/hotspots", hotspot_wards(rng, args.wards), lambda d: d["features"]),
+    ]
+
+    ok = True
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        while (await client.get("/health/ready")).status_code != 200:
+            await asyncio.sleep(0.05)
+
+        direct = [PredictRequest(**r) for r in predict]
+        scoring = _best(lambda: _predict_batch(direct), args.repeat)
+
+        print(f"{'endpoint':<16} {'format':<8} {'request':>9} {'response':>9} {'per ward':>10} {'wire/ward':>10}")
+        for path, payload, rows_of in endpoints:
+            reference = None
+            for fmt in FORMATS:
+                body = _encode(payload, fmt)
+                content, seconds = await _timed_post(client, path, body, fmt, args.repeat)
+                wire = f"{(seconds - scoring) / args.wards * 1e6:7.2f} µs" if path == "/predict/batch" else ""
+                print(f"{path:<16} {fmt.rsplit('/', 1)[-1].rsplit('.', 1)[-1]:<8} "
+                      f"{len(body) / 1024:>6.0f} kB {len(content) / 1024:>6.0f} kB "
+                      f"{seconds / args.wards * 1e6:>7.2f} µs {wire:>10}")
+
+                result = _decode(content, fmt)
+                if fmt == JSON:
+                    reference = rows_of(result)
+                elif not _same_rows(reference, result, fmt, rows_of):
+                    print(f"❌ {path}: {fmt} response differs from JSON")
+                    ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+    print("✅ binary responses match JSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Load test: throughput, latency percentiles and peak memory of /predict,
+/anomaly, /forecast/{ward_id} and /hotspots at fixed concurrency levels.
+
+Usage:
+    python -m benchmarks.loadtest [--mode inprocess|http] [--url URL]
+                                  [--endpoints predict,anomaly,forecast,hotspots]
+                                  [--concurrency 1,8,32] [--requests 400]
+                                  [--output results.json] [--compare baseline.json]
+
+The harness stands in for the Node backend: it generates the payloads
+backend/src/services/mlService.js sends (FeatureVector bodies, hotspot ward
+dicts) from a seeded RNG, so it runs offline and every run sends the same
+requests.
+
+    inprocess   drives main.app through httpx's ASGI transport, including
+                middleware, validation and serialization (default)
+    http        drives a real server: --url, or a uvicorn process started
+                on --port when no --url is given
+
+Each level runs `concurrency` closed-loop clients until --requests requests
+have completed. Peak memory is the server process's high-water RSS after the
+level (n/a / null with --url, where the server's PID is not known). Results are written as JSON (default benchmarks/results/) with the
+commit they were measured on; --compare prints the change against an earlier
+result file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+ENDPOINTS = ("predict", "anomaly", "forecast", "hotspots")
+SYNDROMES = ("DIARRHEA", "FEVER", "VOMITING", "COUGH", "RESPIRATORY_DISTRESS", "SKIN_RASH", "JAUNDICE")
+N_WARDS = 500
+HOTSPOT_WARDS = 200
+HISTORY_HOURS = 21 * 24
+CITY = (18.52, 73.86)       # ward centroids are scattered around this point
+
+
+# ── Payloads (what the Node backend sends) ────────────────────────────────────
+
+def feature_vector(rng: np.random.Generator) -> dict:
+    """A FeatureVector body with the same distributions as the training data."""
+    chlorine_drop = rng.beta(2, 5)
+    rainfall = rng.exponential(10)
+    admissions_7d = int(rng.poisson(50))
+    turbidity = rng.exponential(2)
+    ph_dev = rng.exponential(0.3)
+    weights = rng.dirichlet([3, 2, 2, 1, 1, 1, 1])
+    cases = int(rng.poisson(30))
+    return {
+        "totalAdmissions7d": admissions_7d,
+        "totalAdmissions48h": int(rng.poisson(15)),
+        "dailyAvg7d": round(admissions_7d / 7, 2),
+        "syndromeSpike48h": round(rng.exponential(0.8), 3),
+        "syndromeBreakdown": {s: int(round(w * cases)) for s, w in zip(SYNDROMES, weights)},
+        "avgChlorine7d": 0.8,
+        "currentChlorine": round(max(0.0, 0.8 - chlorine_drop * 0.8), 3),
+        "chlorineDropRatio": round(chlorine_drop, 3),
+        "avgTurbidity7d": 2.0,
+        "currentTurbidity": round(turbidity, 2),
+        "avgPh7d": 7.0,
+        "currentPh": round(7.0 + ph_dev * rng.choice([-1, 1]), 2),
+        "phDeviation": round(ph_dev, 3),
+        "avgRainfall7d": round(rainfall * 0.6, 2),
+        "lagRainfall1d": round(rainfall, 2),
+        "rainfallSpike": bool(rainfall > 30),
+        "p90Rainfall": 30.0,
+        "avgTemp7d": round(rng.uniform(20, 38), 1),
+        "avgHumidity7d": round(rng.uniform(50, 95), 1),
+        "citizenClusterCount": int(rng.poisson(3)),
+        "citizenSeverityScore": round(rng.uniform(1, 5), 2),
+    }
+
+
+def predict_request(rng: np.random.Generator) -> dict:
+    ward = int(rng.integers(N_WARDS))
+    return {"wardId": f"ward-{ward}", "features": feature_vector(rng)}
+
+
+def hotspot_wards(rng: np.random.Generator, n: int = HOTSPOT_WARDS) -> List[dict]:
+    """Ward dicts for POST /hotspots; a few wards cluster around high-risk centres."""
+    lat = CITY[0] + rng.normal(0, 0.05, n)
+    lng = CITY[1] + rng.normal(0, 0.05, n)
+    risk = rng.beta(2, 5, n)
+    centres = rng.choice(n, size=max(1, n // 40), replace=False)
+    for c in centres:
+        near = np.hypot(lat - lat[c], lng - lng[c]) < 0.01
+        risk[near] = np.maximum(risk[near], rng.uniform(0.7, 0.95))
+    return [
+        {"wardId": f"ward-{i}", "name": f"Ward {i}", "latitude": round(float(lat[i]), 6),
+         "longitude": round(float(lng[i]), 6), "riskScore": round(float(risk[i]), 3)}
+        for i in range(n)
+    ]
+
+
+def history_series(rng: np.random.Generator) -> dict:
+    """POST /forecast/history body: HISTORY_HOURS of hourly counts for every ward."""
+    start = int(time.time() // 3600) - HISTORY_HOURS
+    hour = np.arange(HISTORY_HOURS)
+    base = 2 + 1.5 * np.sin(2 * np.pi * hour / 24)
+    return {"series": [
+        {"wardId": f"ward-{w}", "start": time.strftime("%Y-%m-%dT%H:00:00", time.gmtime(start * 3600)),
+         "counts": rng.poisson(base * rng.uniform(0.5, 2)).tolist()}
+        for w in range(N_WARDS)
+    ]}
+
+
+def request_factory(endpoint: str, rng: np.random.Generator) -> Callable[[], Tuple[str, str, Optional[object]]]:
+    """Returns a function producing (method, path, json body) for one request."""
+    if endpoint in ("predict", "anomaly"):
+        return lambda: ("POST", f"/{endpoint}", predict_request(rng))
+    if endpoint == "forecast":
+        return lambda: ("GET", f"/forecast/ward-{int(rng.integers(N_WARDS))}", None)
+    if endpoint == "hotspots":
+        return lambda: ("POST", "/hotspots", hotspot_wards(rng))
+    raise ValueError(f"unknown endpoint {endpoint!r} (expected one of {ENDPOINTS})")
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+
+async def run_level(client: httpx.AsyncClient, make_request, concurrency: int, total: int) -> dict:
+    # Payloads are built up front so generation is not part of the latency
+    requests = [make_request() for _ in range(total)]
+    latencies = np.empty(total)
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            method, path, body = requests[i]
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies[i] = time.perf_counter() - start
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    ms = latencies * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput": round(total / seconds, 1),
+        "latencyMs": {
+            "mean": round(float(ms.mean()), 3),
+            "p50": round(float(np.percentile(ms, 50)), 3),
+            "p95": round(float(np.percentile(ms, 95)), 3),
+            "p99": round(float(np.percentile(ms, 99)), 3),
+            "max": round(float(ms.max()), 3),
+        },
+    }
+
+
+def peak_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """High-water RSS of the server process, or None when it is not known."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid == os.getpid():
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return None
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout_s: float = 120.0):
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"service not ready within {timeout_s}s")
+
+
+async def run(args, client: httpx.AsyncClient, server_pid: Optional[int]) -> List[dict]:
+    await wait_ready(client)
+    rng = np.random.default_rng(args.seed)
+    if "forecast" in args.endpoints:
+        response = await client.post("/forecast/history", json=history_series(rng))
+        response.raise_for_status()
+
+    results = []
+    for endpoint in args.endpoints:
+        make_request = request_factory(endpoint, np.random.default_rng([args.seed, ENDPOINTS.index(endpoint)]))
+        # Warm-up: first calls pay for lazy imports and JIT compilation
+        await run_level(client, make_request, 1, min(20, args.requests))
+        for concurrency in args.concurrency:
+            level = await run_level(client, make_request, concurrency, args.requests)
+            level = {"endpoint": endpoint, **level, "peakRssMb": peak_rss_mb(server_pid)}
+            results.append(level)
+            lat = level["latencyMs"]
+            rss = "n/a" if level["peakRssMb"] is None else f"{level['peakRssMb']:.0f} MB"
+            print(f"{endpoint:<10} c={concurrency:<4} {level['throughput']:>9.1f} req/s   "
+                  f"p50 {lat['p50']:>8.2f}  p95 {lat['p95']:>8.2f}  p99 {lat['p99']:>8.2f} ms   "
+                  f"errors {level['errors']:<4} peak RSS {rss}")
+    return results
+
+
+async def run_inprocess(args) -> List[dict]:
+    sys.path.insert(0, ROOT)
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            # The server runs in this process
+            return await run(args, client, os.getpid())
+
+
+async def run_http(args) -> List[dict]:
+    proc = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=ROOT,
+        )
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+            # An external --url server's memory cannot be read from here
+            return await run(args, client, proc.pid if proc else None)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before: Dict[tuple, dict] = {(r["endpoint"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} (commit {baseline['meta'].get('commit')})")
+    for r in results:
+        old = before.get((r["endpoint"], r["concurrency"]))
+        if old is None:
+            continue
+        throughput = r["throughput"] / old["throughput"] - 1
+        p95 = r["latencyMs"]["p95"] / old["latencyMs"]["p95"] - 1
+        print(f"{r['endpoint']:<10} c={r['concurrency']:<4} throughput {throughput:+7.1%}   p95 {p95:+7.1%}")
+
+
+def _csv_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=("inprocess", "http"), default="inprocess")
+    parser.add_argument("--url", help="server to drive in http mode (default: start one on --port)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--concurrency", type=_csv_ints, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=400, help="requests per endpoint and level")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/loadtest-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    for endpoint in args.endpoints:
+        if endpoint not in ENDPOINTS:
+            parser.error(f"unknown endpoint {endpoint!r} (expected one of {', '.join(ENDPOINTS)})")
+
+    runner = run_inprocess if args.mode == "inprocess" else run_http
+    results = asyncio.run(runner(args))
+
+    commit = _commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "mode": args.mode,
+            "url": args.url,
+            "requestsPerLevel": args.requests,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"loadtest-{commit or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
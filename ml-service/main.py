@@ -1,11 +1,37 @@
+from contextlib import asynccontextmanager
+import logging
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import predict, anomaly, health, forecast, hotspots
+from fastapi.responses import ORJSONResponse
+from app import config
+from app.models.loader import model_registry, warm_up
+from app.routes import predict, anomaly, health, forecast, hotspots, metrics, profiles
+from app.services.executor import shutdown_executors
+from app.services.metrics import MetricsMiddleware
+from app.services.profiler import ProfilingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models and heavy libraries load in the background so the server starts
+    # answering liveness checks immediately
+    if config.WARMUP_ON_STARTUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    model_registry.start_watching(config.MODEL_WATCH_INTERVAL_S)
+    yield
+    model_registry.stop_watching()
+    if predict.predict_batcher is not None:
+        await predict.predict_batcher.stop()
+    shutdown_executors()
+
 
 app = FastAPI(
     title="Kavach ML Service",
     description="AI-powered disease outbreak prediction microservice",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -14,9 +40,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+# Installed only when enabled, so a disabled profiler costs nothing per request
+if config.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=config.PROFILE_SAMPLE_RATE,
+        token=config.PROFILE_HEADER_TOKEN,
+    )
 
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Metrics"])
 app.include_router(predict.router, prefix="/predict", tags=["Prediction"])
 app.include_router(anomaly.router, prefix="/anomaly", tags=["Anomaly"])
 app.include_router(forecast.router, prefix="/forecast", tags=["Forecast"])
 app.include_router(hotspots.router, prefix="/hotspots", tags=["Hotspots"])
+if config.PROFILING_ENABLED and config.PROFILE_HEADER_TOKEN:
+    app.include_router(profiles.router, prefix="/admin/profiles", tags=["Admin"])
+elif config.PROFILING_ENABLED:
+    logging.getLogger(__name__).warning("ℹ️  PROFILE_HEADER_TOKEN not set — /admin/profiles is not mounted")
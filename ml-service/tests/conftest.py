@@ -0,0 +1,41 @@
+"""Shared fixtures: small models trained on the synthetic training data."""
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from app.models.train import generate_chunk
+
+
+@pytest.fixture(scope="session")
+def scaler():
+    X, _, _ = generate_chunk(2000, np.random.default_rng(0))
+    return StandardScaler().fit(X)
+
+
+@pytest.fixture(scope="session")
+def training_data(scaler):
+    X, risk, label = generate_chunk(2000, np.random.default_rng(0))
+    return scaler.transform(X), risk, label
+
+
+@pytest.fixture(scope="session")
+def classifier(training_data):
+    xgb = pytest.importorskip("xgboost")
+    X, _, label = training_data
+    return xgb.XGBClassifier(n_estimators=50, max_depth=4, random_state=0).fit(X, label)
+
+
+@pytest.fixture(scope="session")
+def models(training_data, classifier, scaler):
+    """The served model set: {classifier, regressor, iso_forest, scaler}."""
+    xgb = pytest.importorskip("xgboost")
+    from sklearn.ensemble import IsolationForest
+
+    X, risk, _ = training_data
+    return {
+        "classifier": classifier,
+        "regressor": xgb.XGBRegressor(n_estimators=50, max_depth=4, random_state=0).fit(X, risk),
+        "iso_forest": IsolationForest(n_estimators=50, random_state=0).fit(X),
+        "scaler": scaler,
+    }
@@ -0,0 +1,20 @@
+"""Model bundles: distinct versions per save and a verified round trip."""
+
+import os
+
+from app.models.artifacts import current_bundle_path, load_bundle, save_bundle
+from app.models.compiled import compare_outputs, model_outputs, parity_probe
+
+
+def test_back_to_back_saves_get_distinct_versions(models, tmp_path):
+    first = save_bundle(models, root=str(tmp_path))
+    second = save_bundle(models, root=str(tmp_path))
+    assert first != second
+    assert current_bundle_path(str(tmp_path)) == second
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(second), "CURRENT"])
+
+
+def test_loaded_bundle_reproduces_the_trained_models(models, tmp_path):
+    loaded = load_bundle(save_bundle(models, root=str(tmp_path)))
+    probe = parity_probe(models["scaler"])
+    assert not compare_outputs(model_outputs(models, probe), model_outputs(loaded, probe))
@@ -0,0 +1,62 @@
+"""Micro-batcher: concurrent submissions share one batch; stop() drains in-flight work."""
+
+import asyncio
+
+from app.services.batcher import MicroBatcher
+from app.services.executor import BoundedExecutor
+
+
+def _batcher(calls, max_size=64, max_wait_ms=20):
+    def process(items):
+        calls.append(list(items))
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+    return MicroBatcher("test", process, BoundedExecutor("test", 1, 8), max_size, max_wait_ms)
+
+
+def test_concurrent_items_are_coalesced():
+    calls = []
+    batcher = _batcher(calls)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert calls == [list(range(10))]
+    assert batcher.stats()["maxBatchSize"] == 10
+
+
+def test_full_batch_flushes_without_waiting():
+    calls = []
+    batcher = _batcher(calls, max_size=4, max_wait_ms=10_000)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 5)
+
+    assert asyncio.run(main()) == [i * 2 for i in range(8)]
+    assert calls == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+def test_per_item_exception_reaches_only_its_caller():
+    batcher = _batcher([])
+
+    async def main():
+        return await asyncio.gather(batcher.submit(1), batcher.submit(-1), return_exceptions=True)
+
+    ok, err = asyncio.run(main())
+    assert ok == 2 and isinstance(err, ValueError)
+
+
+def test_stop_waits_for_in_flight_batches():
+    calls = []
+    batcher = _batcher(calls, max_wait_ms=10_000)
+
+    async def main():
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        await batcher.stop()
+        assert not batcher._tasks
+        return await asyncio.gather(*pending)
+
+    assert asyncio.run(main()) == [0, 2, 4]
+    assert calls == [[0, 1, 2]]
@@ -0,0 +1,21 @@
+"""The compiled IsolationForest scores like sklearn's, including with feature subsampling."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+
+from app.models.compiled import CompiledIsolationForest
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"max_samples": 64},
+    {"max_features": 0.5},
+    {"max_features": 3},
+])
+def test_isolation_forest_matches_sklearn(training_data, params):
+    X, _, _ = training_data
+    iso = IsolationForest(n_estimators=30, random_state=0, **params).fit(X)
+    compiled = CompiledIsolationForest.from_sklearn(iso)
+    np.testing.assert_allclose(compiled.score_samples(X), iso.score_samples(X), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X), iso.predict(X))
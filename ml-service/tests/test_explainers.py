@@ -0,0 +1,41 @@
+"""The xgboost explainer backend against shap.TreeExplainer, and top-k ranking."""
+
+import numpy as np
+import pytest
+
+from app.models.explainers import build_explainer
+from app.services.inference import TOP_FEATURES, top_k_indices
+
+ATOL = 1e-6
+
+
+def _stable_top_k(values: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-np.abs(values), axis=1, kind="stable")[:, :k]
+
+
+def test_pred_contribs_match_tree_explainer(classifier, training_data):
+    pytest.importorskip("shap")
+    X = training_data[0][:500]
+
+    expected = np.asarray(build_explainer(classifier, "shap").shap_values(X))
+    actual = build_explainer(classifier, "xgboost").shap_values(X)
+
+    assert actual.shape == expected.shape == X.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=ATOL)
+    np.testing.assert_array_equal(top_k_indices(actual, TOP_FEATURES), top_k_indices(expected, TOP_FEATURES))
+
+
+def test_unknown_backend_is_rejected(classifier):
+    with pytest.raises(ValueError):
+        build_explainer(classifier, "lime")
+
+
+@pytest.mark.parametrize("k", [0, 1, TOP_FEATURES, 22, 30])
+def test_top_k_indices_matches_stable_sort(k):
+    rng = np.random.default_rng(k)
+    values = rng.normal(size=(1000, 22))
+    # Small integers: plenty of ties in |values|, including across signs
+    ties = rng.integers(-3, 4, size=(1000, 22)).astype(np.float64)
+
+    for v in (values, ties, np.zeros((3, 22))):
+        np.testing.assert_array_equal(top_k_indices(v, k), _stable_top_k(v, k))
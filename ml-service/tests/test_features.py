@@ -0,0 +1,77 @@
+"""features_to_array / features_matrix: one column layout, identical values."""
+
+import numpy as np
+import pytest
+
+from app.features.engineering import (
+    FEATURE_NAMES, SCALAR_FEATURES, SYNDROME_KEYS, columns_matrix, features_matrix, features_to_array,
+)
+from app.schemas.schemas import FeatureVector
+
+
+def _fuzzed_features(rng: np.random.Generator) -> dict:
+    """A feature dict with random values, random missing keys and odd syndrome breakdowns."""
+    features = {}
+    for name, _ in SCALAR_FEATURES:
+        if rng.random() < 0.2:
+            continue
+        if name == "rainfallSpike":
+            features[name] = bool(rng.random() < 0.5)
+        elif name == "citizenClusterCount":
+            features[name] = int(rng.integers(0, 40))
+        else:
+            features[name] = float(rng.choice([0.0, rng.exponential(20), rng.normal(0, 1e6)]))
+    keys = list(SYNDROME_KEYS) + ["HEADACHE", "UNKNOWN"]       # extras only count in the total
+    picked = rng.choice(keys, size=rng.integers(0, len(keys)), replace=False)
+    features["syndromeBreakdown"] = {str(k): float(rng.choice([0, rng.integers(1, 50), rng.random()])) for k in picked}
+    return features
+
+
+@pytest.fixture(scope="module")
+def fuzzed():
+    rng = np.random.default_rng(0)
+    return [_fuzzed_features(rng) for _ in range(3000)] + [{}, {"syndromeBreakdown": {}}]
+
+
+def test_scalar_features_follow_feature_names():
+    names = [name for name, _ in SCALAR_FEATURES] + [f"syndrome_{k}" for k in SYNDROME_KEYS]
+    assert names == FEATURE_NAMES
+
+
+def test_scalar_defaults_match_feature_vector():
+    defaults = FeatureVector()
+    for name, default in SCALAR_FEATURES:
+        assert getattr(defaults, name) == default, name
+
+
+def test_matrix_matches_per_row_for_dicts(fuzzed):
+    expected = np.vstack([features_to_array(f) for f in fuzzed])
+    actual = features_matrix(fuzzed)
+    assert actual.dtype == np.float32
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_matrix_matches_per_row_for_feature_vectors(fuzzed):
+    models = [FeatureVector(**f) for f in fuzzed[:2000]]
+    expected = np.vstack([features_to_array(m.model_dump()) for m in models])
+    assert features_matrix(models).tobytes() == expected.tobytes()
+    assert features_matrix([m.model_dump() for m in models]).tobytes() == expected.tobytes()
+
+
+def test_float64_matrix_casts_to_the_float32_one(fuzzed):
+    np.testing.assert_array_equal(
+        features_matrix(fuzzed, dtype=np.float64).astype(np.float32), features_matrix(fuzzed)
+    )
+
+
+def test_empty_batch():
+    assert features_matrix([]).shape == (0, len(FEATURE_NAMES))
+    assert features_matrix([], dtype=np.float64).dtype == np.float64
+
+
+def test_columns_matrix_fills_defaults(fuzzed):
+    columns = [("currentPh", 7.0), ("p90Rainfall", 20), ("rainfallSpike", False)]
+    M = columns_matrix(fuzzed, columns)
+    assert M.shape == (len(fuzzed), 3) and M.dtype == np.float64
+    for row, features in zip(M, fuzzed[:500]):
+        assert row.tolist() == [float(features.get(name, default)) for name, default in columns]
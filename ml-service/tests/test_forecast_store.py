@@ -0,0 +1,30 @@
+"""Forecast store: per-ward LRU entries with a bounded set of cached horizons."""
+
+from app.services.forecast_store import ForecastStore
+
+
+def test_horizons_per_entry_are_capped():
+    store = ForecastStore(max_entries=4, ttl_s=3600, max_horizons=3)
+    entry = store.put("w1", (10, 10), None, None)
+    for horizon in range(1, 6):
+        store.keep_response(entry, horizon, f"r{horizon}")
+    assert list(entry["responses"]) == [3, 4, 5]
+
+
+def test_recently_read_horizon_is_kept():
+    store = ForecastStore(max_entries=4, ttl_s=3600, max_horizons=2)
+    entry = store.put("w1", (10, 10), None, None)
+    store.keep_response(entry, 24, "a")
+    store.keep_response(entry, 48, "b")
+    assert store.response(entry, 24) == "a"
+    store.keep_response(entry, 72, "c")
+    assert store.response(entry, 48) is None
+    assert store.response(entry, 24) == "a"
+
+
+def test_changed_fingerprint_is_a_miss_but_returns_warm_start():
+    store = ForecastStore(max_entries=4, ttl_s=3600, max_horizons=2)
+    store.put("w1", (10, 10), "model", {"k": 1})
+    entry, current = store.get("w1", (11, 11))
+    assert not current and entry["params"] == {"k": 1}
+    assert store.get("w1", (10, 10))[1]
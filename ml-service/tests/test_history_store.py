@@ -0,0 +1,51 @@
+"""Admission history store: append-only semantics, retention, shared data directories."""
+
+import numpy as np
+
+from app.services.history_store import HistoryStore
+
+
+def test_append_drops_hours_at_or_before_the_tail(tmp_path):
+    store = HistoryStore(str(tmp_path), retention_hours=100)
+    assert store.append("w", 0, np.arange(10)) == (10, 0)
+    assert store.append("w", 5, np.arange(10)) == (5, 5)
+    start, counts = store.get("w")
+    assert start == 0 and counts.tolist() == list(range(10)) + list(range(5, 10))
+
+
+def test_gaps_are_nan_and_retention_is_bounded(tmp_path):
+    store = HistoryStore(str(tmp_path), retention_hours=10)
+    store.append("w", 0, np.ones(8))
+    store.append("w", 12, np.ones(3))          # 4-hour gap
+    start, counts = store.get("w")
+    assert start == 5 and len(counts) == 10
+    assert np.isnan(counts).sum() == 4
+
+
+def test_gap_wider_than_retention_restarts_the_series(tmp_path):
+    store = HistoryStore(str(tmp_path), retention_hours=2160)
+    store.append("w", 0, np.ones(5))
+    store.append("w", 50_000_000, np.full(3, 2.0))
+    start, counts = store.get("w")
+    assert start == 50_000_000 and counts.tolist() == [2.0, 2.0, 2.0]
+
+
+def test_file_size_stays_within_twice_the_window(tmp_path):
+    store = HistoryStore(str(tmp_path), retention_hours=100)
+    for i in range(500):
+        store.append("w", i * 7, np.ones(7))
+    assert (tmp_path / store._files["w"]["file"]).stat().st_size <= 2 * 100 * 4
+    start, counts = HistoryStore(str(tmp_path), retention_hours=100).get("w")
+    assert start == 500 * 7 - 100 and len(counts) == 100
+
+
+def test_stores_sharing_a_directory_see_each_others_appends(tmp_path):
+    a = HistoryStore(str(tmp_path), retention_hours=100)
+    b = HistoryStore(str(tmp_path), retention_hours=100)
+    a.append("w", 0, np.arange(10))
+    assert len(b.get("w")[1]) == 10
+    b.append("w", 10, np.arange(5))
+    b.append("x", 0, [1.0])
+    a.append("y", 0, [2.0])                     # must not drop b's index entries
+    assert len(a.get("w")[1]) == 15
+    assert sorted(HistoryStore(str(tmp_path), retention_hours=100)._files) == ["w", "x", "y"]
@@ -0,0 +1,66 @@
+"""Hotspots: the spatial index and the streamed output agree with per-request DBSCAN."""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.routes.hotspots import _compute_hotspots
+from app.services.spatial_index import WardSpatialIndex
+
+
+def _wards(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform([18.0, 72.0], [20.0, 74.0], size=(8, 2))
+    points = centres[rng.integers(0, len(centres), n)] + rng.normal(0, 0.3, (n, 2))
+    risk = rng.uniform(0, 1, n)
+    return [
+        {"wardId": f"w{i}", "name": f"Ward {i}", "latitude": lat, "longitude": lon, "riskScore": r}
+        for i, ((lat, lon), r) in enumerate(zip(points.tolist(), risk.tolist()))
+    ]
+
+
+def _features(result) -> list:
+    return [f.model_dump() for f in result.features]
+
+
+def test_index_matches_dbscan_after_score_updates():
+    wards = _wards(400)
+    index = WardSpatialIndex()
+    index.register([{k: w[k] for k in ("wardId", "name", "latitude", "longitude")} for w in wards])
+    index.update_scores({w["wardId"]: w["riskScore"] for w in wards})
+    assert index.hotspots()["features"] == _features(_compute_hotspots(wards))
+
+    rng = np.random.default_rng(1)
+    for w in rng.choice(wards, 50, replace=False):
+        w["riskScore"] = float(rng.uniform(0, 1))
+    assert index.update_scores({w["wardId"]: w["riskScore"] for w in wards}) > 0
+    assert index.hotspots()["features"] == _features(_compute_hotspots(wards))
+
+
+def test_unchanged_scores_are_served_from_cache():
+    wards = _wards(50)
+    index = WardSpatialIndex()
+    index.register(wards)
+    index.update_scores({w["wardId"]: w["riskScore"] for w in wards})
+    first = index.hotspots()
+    assert index.update_scores({wards[0]["wardId"]: wards[0]["riskScore"]}) == 0
+    assert index.hotspots() is first
+
+
+def test_stream_matches_post_hotspots():
+    pytest.importorskip("sklearn")
+    wards = _wards(300, seed=3)
+    client = TestClient(main.app)
+    expected = client.post("/hotspots", json=wards).json()
+    streamed = client.post("/hotspots/stream", json={
+        "wardIds": [w["wardId"] for w in wards],
+        "names": [w["name"] for w in wards],
+        "latitude": [w["latitude"] for w in wards],
+        "longitude": [w["longitude"] for w in wards],
+        "riskScore": [w["riskScore"] for w in wards],
+    })
+    assert streamed.status_code == 200
+    assert json.loads(streamed.content) == expected
@@ -0,0 +1,74 @@
+"""Model registry: negative caching of missing models and hot reload by fingerprint."""
+
+import pytest
+
+from app.models import loader
+from app.models.loader import ModelRegistry
+
+
+@pytest.fixture
+def disk(monkeypatch):
+    """Fake on-disk model state: set `models` (or an exception) and `fingerprint`."""
+    state = {"models": FileNotFoundError(), "fingerprint": ("pickle", None, ()), "reads": 0}
+
+    def read_models():
+        state["reads"] += 1
+        if isinstance(state["models"], Exception):
+            raise state["models"]
+        return state["models"], None, "pickle"
+
+    monkeypatch.setattr(loader, "_read_models", read_models)
+    monkeypatch.setattr(loader, "_source_fingerprint", lambda: state["fingerprint"])
+    return state
+
+
+def test_missing_models_are_not_retried_until_the_backoff_expires(disk):
+    registry = ModelRegistry(retry_base_s=60, retry_max_s=600)
+    assert registry.get().models == {}
+    assert registry.get().models == {}
+    assert disk["reads"] == 1
+    assert registry.state == "missing" and registry.stats()["retryInSeconds"] > 0
+
+    registry._next_retry_at = 0.0
+    disk["models"] = {"classifier": "m1"}
+    snapshot = registry.get()
+    assert snapshot.models == {"classifier": "m1"} and snapshot.version == 1
+    assert registry.state == "loaded" and registry.failures == 0
+
+
+def test_backoff_doubles_up_to_the_cap(disk):
+    registry = ModelRegistry(retry_base_s=1, retry_max_s=3)
+    waits = []
+    for _ in range(4):
+        registry.reload()
+        waits.append(registry.stats()["retryInSeconds"])
+    assert waits == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_reload_only_when_the_fingerprint_changes(disk):
+    registry = ModelRegistry(retry_base_s=60, retry_max_s=600)
+    disk["models"] = {"classifier": "m1"}
+    registry.get()
+    registry._reload_if_changed()
+    assert disk["reads"] == 1
+
+    disk["fingerprint"] = ("pickle", "v2", ())
+    disk["models"] = {"classifier": "m2"}
+    registry._reload_if_changed()
+    assert registry.snapshot.models == {"classifier": "m2"} and registry.snapshot.version == 2
+
+
+def test_failed_reload_keeps_the_previous_models(disk):
+    registry = ModelRegistry(retry_base_s=60, retry_max_s=600)
+    disk["models"] = {"classifier": "m1"}
+    registry.get()
+
+    disk["fingerprint"] = ("pickle", "broken", ())
+    disk["models"] = ValueError("checksum mismatch")
+    registry._reload_if_changed()
+    assert registry.snapshot.models == {"classifier": "m1"}
+    assert registry.state == "loaded" and registry.last_error == "checksum mismatch"
+
+    # The same broken state is not re-read while its backoff runs
+    registry._reload_if_changed()
+    assert disk["reads"] == 2
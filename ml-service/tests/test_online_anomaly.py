@@ -0,0 +1,55 @@
+"""Per-ward streaming baselines: bounded ward state with LRU eviction."""
+
+import numpy as np
+import pytest
+
+from app.services.online_anomaly import OnlineAnomalyDetector
+
+N_FEATURES = 22
+
+
+def _detector(max_wards: int, warmup: int = 0) -> OnlineAnomalyDetector:
+    return OnlineAnomalyDetector(N_FEATURES, alpha=0.05, threshold=4.0, warmup=warmup, max_wards=max_wards)
+
+
+def _obs(n: int, value: float = 0.0) -> np.ndarray:
+    return np.full((n, N_FEATURES), value)
+
+
+def test_ward_state_is_capped():
+    detector = _detector(max_wards=10)
+    for i in range(100):
+        detector.update([f"w{i}"], _obs(1, i))
+    stats = detector.stats()
+    assert stats["wards"] == 10 and stats["maxWards"] == 10
+    assert stats["evictions"] == 90
+    assert len(detector._count) == 10
+
+
+def test_least_recently_observed_ward_is_evicted():
+    detector = _detector(max_wards=3)
+    detector.update(["a", "b", "c"], _obs(3))
+    detector.update(["a"], _obs(1))             # b is now the least recent
+    detector.update(["d"], _obs(1))
+    assert set(detector._index) == {"a", "c", "d"}
+
+
+def test_evicted_ward_restarts_from_an_empty_baseline():
+    detector = _detector(max_wards=2)
+    detector.update(["a", "a", "b"], np.vstack([_obs(1, 1.0), _obs(1, 50.0), _obs(1, 3.0)]))
+    detector.update(["c"], _obs(1))             # evicts a
+    x = _obs(1, 5.0)
+    _, _, z = detector.update(["a"], x)
+    _, _, expected = _detector(max_wards=2).update(["a"], x)
+    np.testing.assert_array_equal(z, expected)
+
+
+def test_repeated_wards_within_the_cap_are_accepted():
+    detector = _detector(max_wards=4)
+    score, _, _ = detector.update([f"w{i % 4}" for i in range(40)], _obs(40))
+    assert len(score) == 40 and detector.stats()["evictions"] == 0
+
+
+def test_too_many_distinct_wards_in_one_update():
+    with pytest.raises(ValueError):
+        _detector(max_wards=4).update([f"w{i}" for i in range(5)], _obs(5))
@@ -0,0 +1,74 @@
+"""/predict/batch: one vectorized pass that answers exactly like per-ward /predict."""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.features.engineering import FEATURE_NAMES
+from app.models.explainers import build_explainer
+from app.models.loader import ModelSnapshot
+from app.models.train import generate_chunk
+from app.routes import predict
+from app.schemas.schemas import FeatureVector, PredictRequest
+from app.services.prediction_cache import PredictionCache
+
+SYNDROMES = [name[len("syndrome_"):] for name in FEATURE_NAMES if name.startswith("syndrome_")]
+
+
+def _requests(n: int):
+    X, _, _ = generate_chunk(n, np.random.default_rng(2))
+    fields = set(FeatureVector.model_fields)
+    requests = []
+    for i, row in enumerate(X.tolist()):
+        values = dict(zip(FEATURE_NAMES, row))
+        features = {k: v for k, v in values.items() if k in fields}
+        features["syndromeBreakdown"] = {s: values[f"syndrome_{s}"] for s in SYNDROMES}
+        requests.append(PredictRequest(wardId=f"ward-{i}", features=FeatureVector(**features)))
+    return requests
+
+
+@pytest.fixture(params=["models", "fallback"])
+def snapshot(request, monkeypatch):
+    if request.param == "models":
+        models = request.getfixturevalue("models")
+        snap = ModelSnapshot(models, build_explainer(models["classifier"], "xgboost"), 1, "test")
+    else:
+        snap = ModelSnapshot({}, None, 0, None)
+    monkeypatch.setattr(predict, "get_snapshot", lambda: snap)
+    monkeypatch.setattr(predict, "prediction_cache", PredictionCache(0, 60))
+    return snap
+
+
+def test_batch_matches_single_requests(snapshot):
+    requests = _requests(40)
+    batch = predict._predict_batch(requests)
+    assert batch.errors == []
+    for request, result in zip(requests, batch.results):
+        assert result.model_dump() == predict._predict(request).model_dump()
+
+
+def test_bad_ward_does_not_abort_the_batch(snapshot):
+    msgpack = pytest.importorskip("msgpack")
+    body = [r.model_dump() for r in _requests(3)]
+    body[1]["features"]["currentTurbidity"] = float("nan")
+    response = TestClient(main.app).post(
+        "/predict/batch", content=msgpack.packb(body),
+        headers={"content-type": "application/msgpack", "accept": "application/json"},
+    )
+    data = response.json()
+    assert response.status_code == 200
+    assert data["results"][1] is None and data["results"][0] and data["results"][2]
+    assert data["errors"] == [{"index": 1, "wardId": "ward-1", "error": "features contain NaN or infinite values"}]
+
+
+def test_cached_rows_answer_like_fresh_ones(models, monkeypatch):
+    snap = ModelSnapshot(models, build_explainer(models["classifier"], "xgboost"), 1, "test")
+    cache = PredictionCache(100, 60)
+    monkeypatch.setattr(predict, "get_snapshot", lambda: snap)
+    monkeypatch.setattr(predict, "prediction_cache", cache)
+    requests = _requests(5)
+    fresh = predict._predict_batch(requests)
+    cached = predict._predict_batch(requests)
+    assert cache.hits == 5
+    assert [r.model_dump() for r in cached.results] == [r.model_dump() for r in fresh.results]
@@ -0,0 +1,43 @@
+"""Prediction cache: keyed by feature row and model version, LRU- and TTL-bounded."""
+
+import numpy as np
+
+from app.services import prediction_cache as cache_module
+from app.services.prediction_cache import PredictionCache
+
+
+def test_key_depends_on_row_and_model_version():
+    x = np.arange(22, dtype=np.float64)
+    key = PredictionCache.key(x, 1)
+    assert key == PredictionCache.key(x.astype(np.float32), 1)
+    assert key != PredictionCache.key(x, 2)
+    y = x.copy()
+    y[5] += 1
+    assert key != PredictionCache.key(y, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2, ttl_s=60)
+    cache.put(b"a", {"v": 1})
+    cache.put(b"b", {"v": 2})
+    assert cache.get(b"a") == {"v": 1}
+    cache.put(b"c", {"v": 3})
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == {"v": 1} and cache.get(b"c") == {"v": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=4, ttl_s=10)
+    cache.put(b"a", {"v": 1})
+    now[0] += 5
+    assert cache.get(b"a") == {"v": 1}
+    now[0] += 6
+    assert cache.get(b"a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_disabled_when_max_entries_is_zero():
+    assert not PredictionCache(max_entries=0, ttl_s=60).enabled
@@ -0,0 +1,25 @@
+"""The /admin/profiles routes require the admin bearer token."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import config
+from app.routes import profiles
+
+app = FastAPI()
+app.include_router(profiles.router, prefix="/admin/profiles")
+client = TestClient(app)
+
+
+def test_profiles_require_the_token(monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_HEADER_TOKEN", "s3cret")
+    assert client.get("/admin/profiles").status_code == 401
+    assert client.get("/admin/profiles", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/admin/profiles/abc", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/admin/profiles", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200 and "profiles" in response.json()
+
+
+def test_profiles_refused_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_HEADER_TOKEN", "")
+    assert client.get("/admin/profiles", headers={"Authorization": "Bearer "}).status_code == 401
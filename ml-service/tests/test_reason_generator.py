@@ -0,0 +1,157 @@
+"""The compiled reason table against a frozen copy of the hand-written generator it replaced."""
+
+import numpy as np
+import pytest
+
+from app.features.reason_generator import REASON_INPUTS, generate_outbreak_reasons, outbreak_reasons_batch
+from app.schemas.schemas import FeatureVector
+
+# Every rule threshold, just below, on and just above
+EDGES = [
+    {"chlorineDropRatio": v} for v in (0.29999, 0.3, 0.5, 0.50001)
+] + [
+    {"currentTurbidity": v} for v in (5, 5.00001, 10, 10.00001)
+] + [
+    {"currentPh": v} for v in (5.999, 6.0, 6.4999, 6.5, 8.5, 8.5001, 9.0, 9.0001)
+] + [
+    {"syndromeSpike48h": v, "syndromeBreakdown": b}
+    for v in (1.4999, 1.5, 2.0, 3.0) for b in ({}, {"SKIN_RASH": 2, "FEVER": 2}, {"": 3})
+] + [
+    {"totalAdmissions48h": v} for v in (50, 50.5, 51)
+] + [
+    {"lagRainfall1d": v, "p90Rainfall": p} for v in (0.5, 20, 30.5, 45.5) for p in (0, 0.4, 20, 30)
+] + [
+    {"avgHumidity7d": h, "avgTemp7d": t} for h in (85, 85.1) for t in (30, 30.1)
+] + [
+    {"citizenClusterCount": v} for v in (4, 5, 10, 20)
+] + [
+    {"citizenSeverityScore": v} for v in (2.999, 3.0, 4.0)
+]
+
+
+def reference_reasons(features: dict) -> list:
+    """The hand-written generator the rule table replaced, kept verbatim as the parity reference."""
+    reasons = []
+
+    chlorine_drop = features.get("chlorineDropRatio", 0)
+    if chlorine_drop >= 0.5:
+        reasons.append(f"🔵 Chlorine dropped {round(chlorine_drop * 100)}% vs 7-day average (critical)")
+    elif chlorine_drop >= 0.3:
+        reasons.append(f"🔵 Chlorine dropped {round(chlorine_drop * 100)}% vs 7-day average")
+
+    turbidity = features.get("currentTurbidity", 0)
+    if turbidity > 10:
+        reasons.append(f"⚠️ Turbidity critically high ({turbidity:.1f} NTU — safe limit: 5)")
+    elif turbidity > 5:
+        reasons.append(f"⚠️ Turbidity above safe threshold ({turbidity:.1f} NTU)")
+
+    ph = features.get("currentPh", 7.0)
+    if ph < 6.0 or ph > 9.0:
+        reasons.append(f"🧪 pH level unsafe ({ph:.1f} — safe range: 6.5–8.5)")
+    elif ph < 6.5 or ph > 8.5:
+        reasons.append(f"🧪 pH level borderline ({ph:.1f})")
+
+    spike = features.get("syndromeSpike48h", 0)
+    syndrome_breakdown = features.get("syndromeBreakdown", {})
+    dominant = max(syndrome_breakdown, key=syndrome_breakdown.get) if syndrome_breakdown else None
+
+    if spike >= 3.0 and dominant:
+        reasons.append(f"🔴 {dominant.replace('_', ' ').title()} cases ↑ {spike:.1f}× in last 48h (severe spike)")
+    elif spike >= 2.0 and dominant:
+        reasons.append(f"🔴 {dominant.replace('_', ' ').title()} cases ↑ {spike:.1f}× vs baseline")
+    elif spike >= 1.5 and dominant:
+        reasons.append(f"🟠 {dominant.replace('_', ' ').title()} cases elevated ({spike:.1f}× baseline)")
+
+    admissions_48h = features.get("totalAdmissions48h", 0)
+    if admissions_48h > 50:
+        reasons.append(f"🏥 {int(admissions_48h)} hospital admissions in last 48h")
+
+    lag_rainfall = features.get("lagRainfall1d", 0)
+    p90 = features.get("p90Rainfall", 20)
+    if lag_rainfall > p90 * 1.5:
+        reasons.append(f"🌧️ Extreme rainfall yesterday ({lag_rainfall:.0f}mm — {lag_rainfall/max(p90,1):.1f}× 90th percentile)")
+    elif lag_rainfall > p90:
+        reasons.append(f"🌧️ Rainfall spike yesterday ({lag_rainfall:.0f}mm above 90th percentile)")
+
+    humidity = features.get("avgHumidity7d", 0)
+    temp = features.get("avgTemp7d", 0)
+    if humidity > 85 and temp > 30:
+        reasons.append(f"🌡️ High heat-humidity index (temp {temp:.0f}°C, humidity {humidity:.0f}%) — vector breeding conditions")
+
+    cluster_count = features.get("citizenClusterCount", 0)
+    severity_score = features.get("citizenSeverityScore", 1)
+
+    if cluster_count >= 20:
+        reasons.append(f"📍 {cluster_count} citizen complaints clustered in last 24h (high density)")
+    elif cluster_count >= 10:
+        reasons.append(f"📍 {cluster_count} citizen complaints in last 24h")
+    elif cluster_count >= 5:
+        reasons.append(f"📍 {cluster_count} citizen reports in last 24h")
+
+    if severity_score >= 4.0:
+        reasons.append(f"🚨 Citizen-reported severity critical (avg {severity_score:.1f}/5)")
+    elif severity_score >= 3.0:
+        reasons.append(f"🟠 Citizen-reported severity high (avg {severity_score:.1f}/5)")
+
+    if not reasons:
+        reasons.append("ℹ️ Elevated risk based on combined environmental and epidemiological signals")
+
+    return reasons
+
+
+def _fuzzed_features(rng: np.random.Generator) -> dict:
+    """Values drawn around every rule threshold, with random missing keys."""
+    pools = {
+        "chlorineDropRatio": [0, 0.29999, 0.3, 0.45, 0.5, 0.9],
+        "currentTurbidity": [0, 4.99, 5, 5.01, 10, 10.01, 30],
+        "currentPh": [5.5, 5.999, 6.0, 6.4999, 6.5, 7.0, 8.5, 8.5001, 9.0, 9.5],
+        "syndromeSpike48h": [0, 1.4999, 1.5, 2.0, 2.9, 3.0, 7.5],
+        "totalAdmissions48h": [0, 50, 50.5, 51, 300],
+        "lagRainfall1d": [0, 0.5, 20, 30, 30.5, 45.5, 120],
+        "p90Rainfall": [0, 0.4, 1, 20, 30],
+        "avgHumidity7d": [60, 85, 85.1, 99],
+        "avgTemp7d": [25, 30, 30.1, 38],
+        "citizenClusterCount": [0, 4, 5, 9, 10, 19, 20, 45],
+        "citizenSeverityScore": [1, 2.999, 3.0, 3.99, 4.0, 5],
+    }
+    features = {name: float(rng.choice(pool)) for name, pool in pools.items() if rng.random() < 0.85}
+    if "citizenClusterCount" in features:
+        features["citizenClusterCount"] = int(features["citizenClusterCount"])
+    if rng.random() < 0.85:
+        keys = ["DIARRHEA", "FEVER", "SKIN_RASH", "RESPIRATORY_DISTRESS", ""]
+        picked = rng.choice(keys, size=rng.integers(0, len(keys)), replace=False)
+        features["syndromeBreakdown"] = {str(k): float(rng.integers(0, 4)) for k in picked}
+    return features
+
+
+@pytest.fixture(scope="module")
+def fuzzed():
+    rng = np.random.default_rng(0)
+    return EDGES + [{}] + [_fuzzed_features(rng) for _ in range(20000)]
+
+
+def test_reason_inputs_cover_reference_reads():
+    names = {name for name, _ in REASON_INPUTS}
+    assert names == {
+        "chlorineDropRatio", "currentTurbidity", "currentPh", "syndromeSpike48h", "syndromeBreakdown",
+        "totalAdmissions48h", "lagRainfall1d", "p90Rainfall", "avgHumidity7d", "avgTemp7d",
+        "citizenClusterCount", "citizenSeverityScore",
+    }
+
+
+def test_dicts_match_reference(fuzzed):
+    for features in fuzzed:
+        assert generate_outbreak_reasons(features) == reference_reasons(features), features
+
+
+def test_feature_vectors_match_reference(fuzzed):
+    for features in fuzzed[:5000]:
+        model = FeatureVector(**features)
+        assert generate_outbreak_reasons(model) == reference_reasons(model.model_dump()), features
+
+
+def test_batch_matches_reference(fuzzed):
+    assert outbreak_reasons_batch(fuzzed) == [reference_reasons(f) for f in fuzzed]
+    models = [FeatureVector(**f) for f in fuzzed[:5000]]
+    assert outbreak_reasons_batch(models) == [reference_reasons(m.model_dump()) for m in models]
+    assert outbreak_reasons_batch([]) == []
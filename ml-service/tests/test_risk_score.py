@@ -0,0 +1,49 @@
+"""Rule-based risk score: the matrix paths agree with the per-row ones."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.features.engineering import FEATURE_NAMES
+from app.features.risk_score import RISK_TERMS, load_weights, weighted_risk, weighted_risk_matrix
+from app.models.train import generate_chunk
+from app.services.fallback import rule_based_predict, rule_based_scores
+
+
+@pytest.fixture(scope="module")
+def raw_features():
+    X, _, _ = generate_chunk(500, np.random.default_rng(1))
+    X = X.astype(np.float64)
+    X[0, FEATURE_NAMES.index(RISK_TERMS[0][0])] = np.nan
+    return X
+
+
+def _row(X, i):
+    return {name: float(X[i, j]) for j, name in enumerate(FEATURE_NAMES)}
+
+
+def test_weighted_risk_matrix_matches_weighted_risk(raw_features):
+    matrix = weighted_risk_matrix(raw_features)
+    rows = [weighted_risk(_row(raw_features, i)) for i in range(len(raw_features))]
+    np.testing.assert_array_equal(matrix, np.array(rows))
+
+
+def test_rule_based_scores_match_rule_based_predict(raw_features):
+    scores = rule_based_scores(raw_features)
+    for i in range(len(raw_features)):
+        expected = rule_based_predict(_row(raw_features, i))
+        assert round(float(scores["riskScore"][i]), 3) == expected["riskScore"]
+        assert bool(scores["isAnomaly"][i]) == expected["isAnomaly"]
+        assert scores["confidence"] == expected["confidence"]
+
+
+@pytest.mark.parametrize("term, message", [
+    ({"feature": "notAFeature", "weight": 0.1}, "unknown feature"),
+    ({"feature": FEATURE_NAMES[0], "weight": 0.1, "cap": 0}, "must be positive"),
+])
+def test_load_weights_rejects_bad_terms(tmp_path, term, message):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"terms": [term], "anomalyThreshold": 0.7, "fallbackConfidence": 0.5}))
+    with pytest.raises(ValueError, match=message):
+        load_weights(str(path))
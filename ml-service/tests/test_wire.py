@@ -0,0 +1,81 @@
+"""Wire formats: binary bodies reach routes as the JSON structure, responses follow Accept."""
+
+import json
+from typing import List
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.services.wire import ARROW, JSON, MSGPACK, WireRoute, arrow_stream, read_payload, respond
+
+
+class Item(BaseModel):
+    wardId: str
+    value: float = 0.0
+
+
+class Items(BaseModel):
+    items: List[Item]
+
+
+router = APIRouter(route_class=WireRoute)
+
+
+@router.post("/items", response_model=Items)
+async def items(body: List[Item], request: Request):
+    return respond(request, Items(items=body), lambda data: data["items"])
+
+
+@router.post("/raw")
+async def raw(request: Request):
+    return {"payload": await read_payload(request, json.loads)}
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.include_router(router)
+client = TestClient(app)
+
+BODY = [{"wardId": "a", "value": 1.5}, {"wardId": "b"}]
+EXPECTED = [{"wardId": "a", "value": 1.5}, {"wardId": "b", "value": 0.0}]
+
+
+def _encode(fmt: str, payload) -> bytes:
+    if fmt == MSGPACK:
+        return pytest.importorskip("msgpack").packb(payload)
+    if fmt == ARROW:
+        pytest.importorskip("pyarrow")
+        return arrow_stream(payload)
+    return json.dumps(payload).encode()
+
+
+@pytest.mark.parametrize("fmt", [JSON, MSGPACK, ARROW])
+def test_binary_bodies_validate_like_json(fmt):
+    response = client.post("/items", content=_encode(fmt, BODY), headers={"content-type": fmt, "accept": JSON})
+    assert response.status_code == 200
+    assert response.json() == {"items": EXPECTED}
+
+
+def test_msgpack_response_follows_accept():
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post("/items", content=_encode(MSGPACK, BODY), headers={"content-type": MSGPACK})
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == {"items": EXPECTED}
+
+
+def test_binary_body_validation_errors_are_422():
+    response = client.post("/items", content=_encode(MSGPACK, [{"value": 1}]), headers={"content-type": MSGPACK})
+    assert response.status_code == 422
+
+
+def test_read_payload_gets_the_decoded_body():
+    for fmt in (JSON, MSGPACK):
+        response = client.post("/raw", content=_encode(fmt, {"a": [1, 2]}), headers={"content-type": fmt})
+        assert response.json() == {"payload": {"a": [1, 2]}}
+
+
+def test_non_finite_floats_render_as_null():
+    # orjson writes null where the stdlib JSONResponse would write NaN / Infinity
+    assert ORJSONResponse({"x": float("nan"), "y": float("inf")}).body == b'{"x":null,"y":null}'